@@ -0,0 +1,201 @@
+# benchmarks/kodilog.py
+"""
+Synthetic Kodi log generator.
+
+Produces reproducible logs (same seed, same bytes) with the shapes that
+matter to the parsing and display code:
+
+    - "YYYY-MM-DD HH:MM:SS.mmm T:<thread> <level> <component>: message"
+      lines, levels weighted like a real debug-enabled log;
+    - the <general> dash header Kodi prints at each start (and a restart,
+      i.e. a new header block, every _RESTART_LINES lines);
+    - multi-line messages: Python tracebacks after an error line and
+      indented dumps after some debug lines (continuation lines);
+    - NUL padding, on its own line or in front of the next timestamp, as
+      Kodi writes after some curl errors;
+    - huge CCurlFile response lines (tens of KB).
+
+Run from src/ to write a log file:
+
+    python -m benchmarks.kodilog kodi.log --mb 200 --seed 1
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+# Level of each generated message line (weights of a debug-enabled log).
+_LEVELS = ("debug",) * 12 + ("info",) * 5 + ("warning",) * 2 + ("error",)
+
+_COMPONENTS = (
+    "<general>", "<general>", "<CSettingsManager>", "<CCurlFile>",
+    "<CVideoDatabase>", "<CPythonInvoker>", "<CAddonMgr>", "<CGUIWindowManager>",
+)
+
+_WORDS = (
+    "skin", "addon", "plugin.video.youtube", "request", "timeout", "buffer",
+    "stream", "database", "loaded", "failed", "thread", "window", "playlist",
+    "service", "settings", "texture", "cache", "json", "rpc", "player",
+)
+
+_DASHES = "-" * 74
+
+# Lines between two simulated Kodi starts (new dash header block).
+_RESTART_LINES = 250_000
+
+# One error in _TRACEBACK_EVERY is a Python traceback, one debug line in
+# _DUMP_EVERY is followed by an indented dump; one message in _NUL_EVERY is a
+# curl failure followed by NUL padding, one in _HUGE_EVERY a huge curl line.
+_TRACEBACK_EVERY = 20
+_DUMP_EVERY = 60
+_NUL_EVERY = 3_000
+_HUGE_EVERY = 5_000
+
+# Size range of a huge CCurlFile line (characters).
+_HUGE_CHARS = (20_000, 120_000)
+
+# Gap between two lines (ms), drawn uniformly; bursts use the short range.
+_GAP_MS = (0, 40)
+_BURST_GAP_MS = (0, 2)
+_BURST_EVERY = 20_000
+_BURST_LINES = 5_000
+
+_START = datetime(2024, 5, 1, 8, 0, 0)
+
+
+def _header(stamp, thread):
+    """Lines of the dash header block of a Kodi start."""
+    body = (
+        "Starting Kodi (21.0 (21.0.0) Git:20240406-b5f7a18). Platform: Linux x86 64-bit",
+        "Using Release Kodi x64",
+        "Kodi compiled 2024-04-06 by GCC 13.2.0 for Linux x86 64-bit version 6.5.0 (394496)",
+        "Running on Ubuntu 24.04 LTS, kernel: Linux x86 64-bit version 6.8.0-31-generic",
+        "The special://home/ is mapped to: /home/user/.kodi",
+    )
+    lines = [f"{stamp} T:{thread}    info <general>: {_DASHES}\n"]
+    lines.extend(f"{stamp} T:{thread}    info <general>: {text}\n" for text in body)
+    lines.append(f"{stamp} T:{thread}    info <general>: {_DASHES}\n")
+    return lines
+
+
+def _traceback(rnd, indent):
+    pad = " " * indent
+    depth = rnd.randrange(2, 6)
+    lines = [
+        f"{pad}- NOTE: IGNORING THIS CAN LEAD TO MEMORY LEAKS!\n",
+        f"{pad}Error Type: <class 'TypeError'>\n",
+        f"{pad}Error Contents: 'NoneType' object is not subscriptable\n",
+        f"{pad}Traceback (most recent call last):\n",
+    ]
+    for level in range(depth):
+        lines.append(f"{pad}  File \"/home/user/.kodi/addons/plugin.video.demo/lib/module{level}.py\","
+                     f" line {rnd.randrange(10, 900)}, in handler{level}\n")
+        lines.append(f"{pad}    result = data['items'][{level}]\n")
+    lines.append(f"{pad}-->End of Python script error report<--\n")
+    return lines
+
+
+def generate_lines(size_bytes, seed=0):
+    """
+    Yields the lines of a synthetic log of about *size_bytes* bytes (UTF-8),
+    deterministically for a given *seed*.
+    """
+    rnd = random.Random(seed)
+    choice, randrange, randint = rnd.choice, rnd.randrange, rnd.randint
+    ms = 0
+    written = 0
+    count = 0
+    burst_left = 0
+    second = -1
+    prefix = ""
+    thread = 0
+    pending_nul = ""
+    next_start = 0
+
+    while written < size_bytes:
+        if count >= next_start:
+            next_start = count + _RESTART_LINES
+            thread = randrange(1000, 99999)
+            stamp = (_START + timedelta(milliseconds=ms)).strftime("%Y-%m-%d %H:%M:%S.%f")[:23]
+            for line in _header(stamp, thread):
+                written += len(line)
+                count += 1
+                yield line
+
+        if burst_left:
+            burst_left -= 1
+            ms += randint(*_BURST_GAP_MS)
+        else:
+            if randrange(_BURST_EVERY) == 0:
+                burst_left = _BURST_LINES
+            ms += randint(*_GAP_MS)
+        if ms // 1000 != second:
+            second = ms // 1000
+            prefix = (_START + timedelta(seconds=second)).strftime("%Y-%m-%d %H:%M:%S.")
+        stamp = f"{prefix}{ms % 1000:03d}"
+
+        level = choice(_LEVELS)
+        component = choice(_COMPONENTS)
+        words = " ".join(choice(_WORDS) for _ in range(randrange(3, 14)))
+        lines = []
+        if randrange(_HUGE_EVERY) == 0:
+            body = "".join(choice(_WORDS) + "," for _ in range(randint(*_HUGE_CHARS) // 8))
+            lines.append(f"{stamp} T:{thread}   debug <CCurlFile>: CCurlFile::Open - response:"
+                         f" {{\"items\":[{body}]}}\n")
+        elif level == "error" and randrange(_TRACEBACK_EVERY) == 0:
+            head = (f"{stamp} T:{thread}   error <general>: EXCEPTION Thrown (PythonToCppException) :"
+                    f" -->Python callback/script returned the following error<--\n")
+            lines.append(head)
+            lines.extend(_traceback(rnd, 51))
+        else:
+            lines.append(f"{pending_nul}{stamp} T:{thread} {level:>7} {component}: {words}\n")
+            pending_nul = ""
+            if level == "debug" and randrange(_DUMP_EVERY) == 0:
+                lines.extend(f"                                            {choice(_WORDS)}: {randrange(10**6)}\n"
+                             for _ in range(randrange(1, 8)))
+
+        if randrange(_NUL_EVERY) == 0:
+            lines.append(f"{stamp} T:{thread}   error <CCurlFile>: CCurlFile::Stat - Failed: Timeout was reached(28)\n")
+            if randrange(2):
+                lines.append("\x00" * randrange(8, 400) + "\n")      # NUL-only line
+            else:
+                pending_nul = "\x00" * randrange(8, 400)              # NULs before the next stamp
+
+        for line in lines:
+            written += len(line)
+            count += 1
+            yield line
+
+
+def write_log(path, size_bytes, seed=0):
+    """Writes a synthetic log of about *size_bytes* to *path*; returns (lines, bytes)."""
+    count = 0
+    size = 0
+    chunk = []
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for line in generate_lines(size_bytes, seed):
+            chunk.append(line)
+            if len(chunk) >= 10_000:
+                data = "".join(chunk)
+                f.write(data)
+                count += len(chunk)
+                size += len(data)
+                chunk = []
+        data = "".join(chunk)
+        f.write(data)
+        count += len(chunk)
+        size += len(data)
+    return count, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path")
+    parser.add_argument("--mb", type=float, default=50.0, help="approximate size in MB")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    count, size = write_log(args.path, int(args.mb * 2**20), args.seed)
+    print(f"{args.path}: {count:,} lines, {size / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
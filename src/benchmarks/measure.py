@@ -0,0 +1,34 @@
+# benchmarks/measure.py
+"""Measurement helpers shared by the benchmarks: peak RSS and latency percentiles."""
+import sys
+
+# Percentiles reported for every latency distribution.
+PERCENTILES = (50, 90, 99)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def latency_summary(samples):
+    """
+    {"count", "p50_ms", "p90_ms", "p99_ms", "max_ms"} of a list of durations
+    in seconds (nearest-rank percentiles), or None for an empty list.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    count = len(ordered)
+    summary = {"count": count}
+    for p in PERCENTILES:
+        rank = max(1, -(-p * count // 100))
+        summary[f"p{p}_ms"] = round(ordered[rank - 1] * 1000, 3)
+    summary["max_ms"] = round(ordered[-1] * 1000, 3)
+    return summary
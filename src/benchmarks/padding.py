@@ -0,0 +1,130 @@
+# benchmarks/padding.py
+"""
+Text widget cost of the horizontal-scroll padding.
+
+Compares, on the same synthetic lines, the two ways of keeping the
+horizontal scroll region stable:
+
+    padded  - historical behaviour: every line ljust()-ed to
+              LOG_MIN_LINE_WIDTH characters
+    tab     - current behaviour: one trailing tab whose stop sits at
+              LOG_MIN_LINE_WIDTH characters (see LogDisplayMixin._pad_line)
+
+Each variant runs in its own process (so peak RSS is not shared) and inserts
+the lines into an offscreen tk.Text with the same tag batching as the
+bulk_insert() fast path.  Results are printed as JSON.
+
+Run from src/ (needs a display, or Xvfb on a headless box):
+
+    python -m benchmarks.padding --lines 100000
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tkinter as tk
+import tkinter.font as tkfont
+
+from benchmarks.measure import peak_rss_bytes
+from config import LOG_MIN_LINE_WIDTH
+
+_LEVELS = ("info", "info", "info", "debug", "debug", "warning", "error")
+_COMPONENTS = ("<general>", "<CSettingsManager>", "<CCurlFile>", "<CVideoDatabase>")
+
+
+def make_lines(count, seed=0):
+    """Returns *count* (text, tag) rows shaped like Kodi log lines."""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(count):
+        level = rnd.choice(_LEVELS)
+        words = " ".join(f"word{rnd.randrange(1000)}" for _ in range(rnd.randrange(3, 15)))
+        ts = f"2024-01-01 {i // 3_600_000 % 24:02d}:{i // 60_000 % 60:02d}:{i // 1000 % 60:02d}.{i % 1000:03d}"
+        rows.append((f"{ts} T:{1000 + i % 7} {level:>7} {rnd.choice(_COMPONENTS)}: {words}\n", level))
+    return rows
+
+
+def _prepare(mode, text):
+    content = text[:-1]
+    if mode == "padded":
+        return content.ljust(LOG_MIN_LINE_WIDTH) + "\n"
+    return content + "\t\n"
+
+
+def run_variant(mode, count):
+    """Inserts *count* lines prepared with *mode*; returns the measurements."""
+    rows = make_lines(count)
+    root = tk.Tk()
+    root.withdraw()
+    txt = tk.Text(root, wrap=tk.NONE)
+    txt.pack()
+    char_w = tkfont.nametofont(txt.cget("font")).measure("0")
+    for tag in set(_LEVELS):
+        txt.tag_configure(tag, tabs=(LOG_MIN_LINE_WIDTH * char_w, (LOG_MIN_LINE_WIDTH + 1) * char_w))
+
+    rss_before = peak_rss_bytes()
+    t0 = time.perf_counter()
+    prev_tag = None
+    batch = []
+    for text, tag in rows:
+        line = _prepare(mode, text)
+        if tag == prev_tag:
+            batch.append(line)
+        else:
+            if batch:
+                txt.insert(tk.END, "".join(batch), prev_tag)
+            prev_tag = tag
+            batch = [line]
+    if batch:
+        txt.insert(tk.END, "".join(batch), prev_tag)
+    insert_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    txt.see(tk.END)
+    root.update_idletasks()
+    layout_s = time.perf_counter() - t0
+    rss_after = peak_rss_bytes()
+
+    stored = txt.count("1.0", tk.END, "chars")
+    stored_chars = int(stored[0] if isinstance(stored, tuple) else stored)
+    root.destroy()
+    return {
+        "mode": mode,
+        "lines": count,
+        "insert_s": round(insert_s, 3),
+        "layout_s": round(layout_s, 3),
+        "stored_chars": stored_chars,
+        "peak_rss_mb": round(rss_after / 2**20, 1) if rss_after else None,
+        "rss_growth_mb": (round((rss_after - rss_before) / 2**20, 1)
+                          if rss_after and rss_before else None),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--mode", choices=("padded", "tab"),
+                        help="run a single variant in this process")
+    args = parser.parse_args(argv)
+
+    if args.mode:
+        print(json.dumps(run_variant(args.mode, args.lines)))
+        return
+
+    results = []
+    for mode in ("padded", "tab"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.padding", "--mode", mode,
+             "--lines", str(args.lines)],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        results.append(json.loads(out.stdout))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+# benchmarks/suite.py
+"""
+Regression benchmarks of the load, filter, search, tail and display paths.
+
+Generates a synthetic Kodi log (benchmarks/kodilog.py) once, then runs each
+scenario in its own process, so that every peak RSS figure belongs to one
+scenario only:
+
+    parse     - monitor_loop initial load: LineIndex.sync(collect=True), then
+                the shared LineClassifier over the whole file, per filter
+    search    - the full-file search of _search_worker (engine.search.scan_file),
+                with time to first streamed chunk
+    tail      - live tail: lines appended to the log in batches, each batch
+                indexed, read and classified as in the monitor loop
+    insert    - LogDisplayMixin.bulk_insert into an offscreen Tk text widget
+    timeline  - timeline rebuild + draw, then incremental appends + redraws
+
+Every result holds lines/s, latency percentiles of the scenario's unit of
+work (batch, chunk, insert or redraw) and the peak RSS of its process.  The
+JSON output (stdout, or --output) is meant to be kept and compared between
+commits.
+
+Run from src/ (insert and timeline need a display, or Xvfb on a headless box):
+
+    python -m benchmarks.suite --mb 100
+    python -m benchmarks.suite --log /path/to/kodi.log --scenarios parse,search
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.kodilog import generate_lines, write_log
+from benchmarks.measure import latency_summary, peak_rss_bytes
+from engine.classifier import FilterSnapshot, get_classifier
+from engine.line_index import LineIndex
+
+SCENARIOS = ("parse", "search", "tail", "insert", "timeline")
+
+# Filter sets applied by the parse scenario (name -> FilterSnapshot).
+_FILTERS = {
+    "none": FilterSnapshot(),
+    "levels": FilterSnapshot(filter_all=False, active_tags=frozenset({"error", "warning"})),
+    "query": FilterSnapshot(query="timeout"),
+    "expr": FilterSnapshot(expr="level:error OR component:curl"),
+    "keywords": FilterSnapshot(keywords=("plugin.video.youtube", "database", "failed to")),
+}
+
+# Search-bar text of the search scenario.
+_SEARCH_QUERY = "playlist"
+
+# Lines classified per batch by the parse scenario (latency unit).
+_PARSE_BATCH = 20_000
+
+# Live tail: lines appended per batch, and number of batches.
+_TAIL_BATCH = 500
+_TAIL_BATCHES = 400
+
+# Timeline: lines per incremental append, and number of appends.
+_TIMELINE_APPEND = 100
+_TIMELINE_APPENDS = 300
+
+# Strip size of the offscreen timeline (pixels).
+_TIMELINE_HEIGHT = 1000
+
+# Insert scenario: repetitions of bulk_insert.
+_INSERT_REPEAT = 5
+
+
+def _result(scenario, lines, seconds, latencies, **extra):
+    peak = peak_rss_bytes()
+    result = {
+        "scenario": scenario,
+        "lines": lines,
+        "seconds": round(seconds, 4),
+        "lines_per_s": round(lines / seconds) if seconds > 0 else None,
+        "latency": latency_summary(latencies),
+        "peak_rss_mb": round(peak / 2**20, 1) if peak else None,
+    }
+    result.update(extra)
+    return result
+
+
+# ── Engine scenarios ─────────────────────────────────────────────────────────
+
+def bench_parse(path):
+    """Initial full load followed by one classification pass per filter set."""
+    t0 = time.perf_counter()
+    lines = LineIndex(path).sync(collect=True)
+    read_s = time.perf_counter() - t0
+
+    results = []
+    for name, snapshot in _FILTERS.items():
+        get_classifier.cache_clear()
+        classifier = get_classifier(snapshot)
+        latencies = []
+        kept = 0
+        state = False
+        t0 = time.perf_counter()
+        for first in range(0, len(lines), _PARSE_BATCH):
+            t1 = time.perf_counter()
+            rows, state = classifier.run(lines[first:first + _PARSE_BATCH], state)
+            latencies.append(time.perf_counter() - t1)
+            kept += len(rows)
+        seconds = time.perf_counter() - t0
+        results.append(_result("parse", len(lines), seconds, latencies,
+                               filter=name, kept=kept, read_s=round(read_s, 4)))
+    return results
+
+
+def bench_search(path):
+    """Full-file search as run by _search_worker in full-file mode."""
+    from engine.search import scan_file, shutdown_pool
+
+    snapshot = FilterSnapshot(query=_SEARCH_QUERY)
+    line_count = len(_index(path))
+    chunk_times = []
+    t0 = time.perf_counter()
+    last = [t0]
+
+    def on_chunk(rows, done, total):
+        now = time.perf_counter()
+        chunk_times.append(now - last[0])
+        last[0] = now
+
+    try:
+        found = scan_file(path, snapshot, on_chunk=on_chunk)
+        seconds = time.perf_counter() - t0
+    finally:
+        shutdown_pool()
+    return [_result("search", line_count, seconds, chunk_times,
+                    query=_SEARCH_QUERY, kept=len(found.rows),
+                    first_chunk_ms=round(chunk_times[0] * 1000, 3) if chunk_times else None)]
+
+
+def bench_tail(path):
+    """Batches appended to a copy of the log, each one processed like the monitor loop."""
+    from engine.record_store import RecordStore
+
+    workdir = tempfile.mkdtemp(prefix="kodi_bench_")
+    try:
+        tail_path = os.path.join(workdir, "kodi.log")
+        shutil.copyfile(path, tail_path)
+        index = _index(tail_path)
+        store = RecordStore(index)
+        classifier = get_classifier(_FILTERS["levels"])
+        tail_line = len(index)
+        state = False
+        source = generate_lines(1 << 62, seed=1)
+        latencies = []
+        processed = 0
+        with open(tail_path, "a", encoding="utf-8", newline="\n") as log:
+            for _ in range(_TAIL_BATCHES):
+                log.write("".join(next(source) for _ in range(_TAIL_BATCH)))
+                log.flush()
+                t0 = time.perf_counter()
+                index.sync()
+                new_lines = index.read_lines(tail_line)
+                store.ingest(new_lines, tail_line)
+                tail_line += len(new_lines)
+                _, state = classifier.run(new_lines, state)
+                latencies.append(time.perf_counter() - t0)
+                processed += len(new_lines)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return [_result("tail", processed, sum(latencies), latencies, batch_lines=_TAIL_BATCH)]
+
+
+def _index(path):
+    index = LineIndex(path)
+    index.sync()
+    return index
+
+
+# ── Display scenarios (offscreen Tk) ─────────────────────────────────────────
+
+def _make_view(path):
+    """Offscreen text area + timeline strip driven by the real display mixins."""
+    import tkinter as tk
+
+    from languages import LANGS
+    from ui.log_display import LogDisplayMixin
+    from ui.timeline import TimelineMixin
+    from ui.virtual_view import VirtualViewMixin
+
+    class BenchView(LogDisplayMixin, VirtualViewMixin, TimelineMixin):
+        """The attributes bulk_insert and the timeline read, nothing else."""
+
+        def __init__(self):
+            self.root = tk.Tk()
+            self.root.geometry(f"1200x{_TIMELINE_HEIGHT}+0+0")
+            self.scale = 1.0
+            self.font_size = 10
+            self.mono_font_family = self._mono_font = "TkFixedFont"
+            self.current_lang = tk.StringVar(self.root, "EN")
+            self.search_query = tk.StringVar(self.root, "")
+            self.selected_list = tk.StringVar(self.root, LANGS["EN"]["none"])
+            self.is_paused = tk.BooleanVar(self.root, False)
+            self.wrap_mode = tk.BooleanVar(self.root, False)
+            self.log_file_path = path
+            self.running = True
+            self.pending_jump_timestamp = None
+
+            self.main_container = tk.Frame(self.root)
+            self.main_container.pack(fill=tk.BOTH, expand=True)
+            self.main_container.grid_rowconfigure(0, weight=1)
+            self.main_container.grid_columnconfigure(1, weight=1)
+            self.txt_area = tk.Text(self.main_container, wrap=tk.NONE)
+            self.timeline_setup()
+            self.timeline_canvas.grid(row=0, column=0, sticky="ns")
+            self.txt_area.grid(row=0, column=1, sticky="nsew")
+            self._update_line_tabs()
+            self.root.update()
+
+        def sc(self, val):
+            return int(val * self.scale)
+
+        def update_stats(self):
+            pass
+
+        def show_loading(self, state):
+            pass
+
+    return BenchView()
+
+
+def _view_rows(path):
+    return get_classifier(FilterSnapshot()).run(LineIndex(path).sync(collect=True))[0]
+
+
+def bench_insert(path):
+    """bulk_insert of the whole (unfiltered) view, repeated."""
+    rows = _view_rows(path)
+    view = _make_view(path)
+    latencies = []
+    for _ in range(_INSERT_REPEAT):
+        t0 = time.perf_counter()
+        view.bulk_insert(rows)
+        view.root.update_idletasks()
+        latencies.append(time.perf_counter() - t0)
+    view.root.destroy()
+    return [_result("insert", len(rows) * _INSERT_REPEAT, sum(latencies), latencies,
+                    view_lines=len(rows))]
+
+
+def bench_timeline(path):
+    """Full rebuild + draw, then live-tail appends each followed by a redraw."""
+    rows = _view_rows(path)
+    split = max(0, len(rows) - _TIMELINE_APPEND * _TIMELINE_APPENDS)
+    view = _make_view(path)
+
+    t0 = time.perf_counter()
+    view.timeline_rebuild(rows[:split])
+    view._timeline_draw()
+    rebuild_s = time.perf_counter() - t0
+
+    latencies = []
+    for first in range(split, len(rows), _TIMELINE_APPEND):
+        t0 = time.perf_counter()
+        view.timeline_append(rows[first:first + _TIMELINE_APPEND])
+        view._timeline_draw()
+        latencies.append(time.perf_counter() - t0)
+    view.root.destroy()
+    return [_result("timeline", len(rows) - split, sum(latencies), latencies,
+                    rebuild_lines=split, rebuild_s=round(rebuild_s, 4))]
+
+
+_BENCHES = {
+    "parse": bench_parse,
+    "search": bench_search,
+    "tail": bench_tail,
+    "insert": bench_insert,
+    "timeline": bench_timeline,
+}
+
+
+# ── Driver ───────────────────────────────────────────────────────────────────
+
+def _run_isolated(scenario, path):
+    """Runs *scenario* in a child process; returns its results (or an error entry)."""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--scenario", scenario, "--log", path],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if out.returncode != 0:
+        error = (out.stderr.strip().splitlines() or ["exit code %d" % out.returncode])[-1]
+        return [{"scenario": scenario, "error": error}]
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--log", help="benchmark this log instead of generating one")
+    parser.add_argument("--mb", type=float, default=50.0, help="size of the generated log")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated log")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if args.scenario:
+        # Child process: one scenario, results only.
+        print(json.dumps(_BENCHES[args.scenario](args.log)))
+        return
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    workdir = None
+    path = args.log
+    try:
+        if path is None:
+            workdir = tempfile.mkdtemp(prefix="kodi_bench_")
+            path = os.path.join(workdir, "kodi.log")
+            write_log(path, int(args.mb * 2**20), args.seed)
+        report = {
+            "log": {
+                "path": args.log,
+                "generated_mb": None if args.log else args.mb,
+                "seed": None if args.log else args.seed,
+                "bytes": os.path.getsize(path),
+            },
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": [r for s in scenarios for r in _run_isolated(s, path)],
+        }
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
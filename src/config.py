@@ -30,21 +30,52 @@ SEARCH_HISTORY_MAX_SIZE = 50
 EXCLUDE_LIST_FILE = ".kodi_show_exclude"
 # Output file for shutdown debug logging (activated via Ctrl+Shift+D in the UI).
 DEBUG_LOG_FILE = "kodi_monitor_debug.log"
+# Default name of the performance statistics export (Ctrl+I overlay).
+PERF_EXPORT_FILE = "kodi_monitor_perf.json"
 # User-editable file for customising log-type colors (generated on first launch).
 COLORS_FILE = "kodi_monitor_colors.ini"
-# Maximum number of exclusion patterns. Keeps substring-search overhead negligible
-# (each check is O(pattern_count * line_len); 20 patterns on 1 000 lines ≈ 1 ms).
-EXCLUDE_LIST_MAX_SIZE = 20
+# Maximum number of exclusion patterns. The list is compiled into a single
+# matcher (engine/matcher.py), so its length barely affects filtering speed;
+# the cap only keeps the exclusion manager dialog usable.
+EXCLUDE_LIST_MAX_SIZE = 1000
 SINGLE_INSTANCE_HOST = "127.0.0.1"
 SINGLE_INSTANCE_PORT = 65432
 ENABLE_SINGLE_INSTANCE = False
 
-# Every log line is padded to at least this many characters before display.
+# Every log line is displayed at least this many characters wide.
 # This keeps the horizontal scroll region stable: the scrollbar thumb never
 # shrinks and the user's horizontal position is preserved even when only
-# short lines are visible. Trailing spaces have no impact on performance.
+# short lines are visible. Lines end with a single tab whose stop sits at this
+# width, so no padding is stored in the text widget.
 LOG_MIN_LINE_WIDTH = 500
 
+# Maximum number of lines kept in the log view while live tailing (0 = no cap).
+# When new lines push the view past this count, the oldest lines are trimmed
+# from the top in one block (and from the timeline strip). The log file itself
+# is untouched and stays fully reachable through search and jumps. A view
+# loaded with more lines than this keeps its initial size as the cap.
+# Overridable in the config file.
+DEFAULT_DISPLAY_MAX_LINES = 100000
+
+# Lines tolerated above the cap before trimming, so the widget is trimmed in
+# bulk every few thousand lines rather than on every appended batch.
+DISPLAY_TRIM_SLACK = 2000
+
+# Views with at least this many lines are virtualized: the text widget only
+# holds a window of VIRTUAL_WINDOW_LINES lines around the visible area, and
+# the window is re-rendered when the view comes within VIRTUAL_EDGE_LINES of
+# one of its edges. Scrollbar, timeline, jumps and export still see the whole
+# view.
+VIRTUAL_VIEW_MIN_LINES = 20000
+VIRTUAL_WINDOW_LINES = 3000
+VIRTUAL_EDGE_LINES = 500
+
+# Logs of at least this size get a trigram search index, built in the
+# background after loading and extended as the file grows, so that full-file
+# searches only scan the parts of the file that may match (engine/trigram.py).
+# Set to 0 to disable the index.
+TRIGRAM_INDEX_MIN_BYTES = 64 * 1024 * 1024
+
 # Maximum number of characters displayed per log line.
 # Lines exceeding this limit are truncated in the UI and a suffix indicating
 # the number of hidden characters is appended. The source log file is never
@@ -187,7 +218,7 @@ def _generate_default_colors_file():
     Only the 5 user-facing log-type colors are included (info, warning, error,
     debug, summary). Highlight colors are intentionally omitted as they are
     more technical and less likely to need customisation.
-    Called once on first launch if the file does not exist.
+    Called once on first launch if the file does not exist (init_user_files).
     """
     dark  = _DARK_PALETTE["LOG_COLORS"]
     light = _LIGHT_PALETTE["LOG_COLORS"]
@@ -223,7 +254,7 @@ def _repair_colors_file():
     If any key is absent or contains an invalid hex value in either section,
     the file is rewritten completely: existing valid values are preserved and
     gaps are filled with palette defaults.
-    Called at startup after _apply_color_overrides().
+    Called at GUI startup by init_user_files().
     """
     if not os.path.exists(COLORS_FILE):
         return
@@ -375,14 +406,25 @@ COLOR_TIMELINE_VIEWPORT    = _palette["COLOR_TIMELINE_VIEWPORT"]
 # Independent copy so overrides do not mutate the original palette dict.
 LOG_COLORS                 = dict(_palette["LOG_COLORS"])
 
-# Generate the color customization file on first launch, then apply any overrides.
-if not os.path.exists(COLORS_FILE):
-    try:
-        _generate_default_colors_file()
-    except Exception:
-        pass
+# Apply the user's color overrides, if the customization file exists.
 _apply_color_overrides(LOG_COLORS, APP_THEME)
-_repair_colors_file()
 
-if not os.path.exists(KEYWORD_DIR):
-    os.makedirs(KEYWORD_DIR)
+
+def init_user_files():
+    """
+    Creates the files the GUI lets the user edit, in the working directory:
+    the color customization file (generated on first launch, repaired when
+    keys are missing or invalid) and the keyword list folder.
+    Called by main.py before the window is built - never at import time, so
+    that the headless mode, the benchmarks and the search workers do not
+    create files wherever they are run.
+    """
+    if not os.path.exists(COLORS_FILE):
+        try:
+            _generate_default_colors_file()
+        except Exception:
+            pass
+    _repair_colors_file()
+
+    if not os.path.exists(KEYWORD_DIR):
+        os.makedirs(KEYWORD_DIR)
@@ -0,0 +1,229 @@
+# engine/classifier.py
+"""
+Shared line classifier: decides, for each raw log line, whether it is shown
+and with which level tag.
+
+Every code path that turns file lines into display rows (initial load, live
+tail, natural-order refresh, sorted refresh, background search) goes through
+LineClassifier.run(), so there is exactly one hot loop to optimise.
+
+The filter state is passed in as an immutable FilterSnapshot captured on the
+main thread; the classifier itself never touches Tkinter and can run on any
+thread.
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Tuple
+
+from engine.matcher import get_matcher
+from engine.query import get_query
+
+# Kodi log lines start with YYYY-MM-DD; lines without this prefix are
+# orphan continuations that belong to the preceding timestamped line.
+TS_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# Characters treated as "blank" when deciding whether to skip a line.
+# str.strip() removes whitespace but NOT NUL bytes (\x00), which Kodi
+# occasionally writes as padding after certain log entries (e.g. curl errors).
+BLANK_CHARS = " \t\r\n\x00"
+
+# Marker of the dash separator Kodi prints at startup; never displayed.
+DASH_MARKER = "info <general>: --------"
+
+# Log levels that can be filtered, in filter-button order.
+LEVELS = ("info", "warning", "error", "debug")
+
+# Compact per-line codes used by the record store (one byte per line).
+# 0 is a timestamped line without a recognised level.
+LEVEL_CODES = {None: 0, "info": 1, "warning": 2, "error": 3, "debug": 4}
+LEVEL_TAGS = (None, "info", "warning", "error", "debug")
+CODE_CONT = 5     # Continuation line (no timestamp)
+CODE_SKIP = 6     # Blank line or startup dash line, never displayed
+
+# Lines processed between two should_stop() checks in run().
+_STOP_CHECK_EVERY = 2048
+
+
+class FilterSnapshot(NamedTuple):
+    """
+    Immutable copy of every filter setting, captured on the main thread.
+    All strings are lowercase, except `expr`.  Hashable, so compiled
+    classifiers can be cached per snapshot.
+    """
+    filter_all: bool = True                # "ALL" button active
+    active_tags: FrozenSet[str] = frozenset()
+    query: str = ""                        # search bar text (plain substring)
+    keywords: Tuple[str, ...] = ()         # selected keyword list
+    excludes: Tuple[str, ...] = ()         # exclusion list
+    expr: str = ""                         # search bar text using query syntax
+                                           # (engine/query.py); query is "" then
+
+
+def detect_level(low):
+    """Returns the level tag of a lowercased line, or None."""
+    if " error " in low or " critical " in low:
+        return "error"
+    if " warning " in low:
+        return "warning"
+    if " info " in low:
+        return "info"
+    if " debug " in low:
+        return "debug"
+    return None
+
+
+class LineClassifier:
+    """Filter logic compiled from one FilterSnapshot."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self._query = snapshot.query
+        # Compiled query-language predicate (None for a plain search).
+        self._expr = get_query(snapshot.expr).match if snapshot.expr else None
+        # Keyword and exclusion lists are tested through one compiled
+        # matcher each (None when the list is empty).
+        self._keywords = get_matcher(snapshot.keywords).matches if snapshot.keywords else None
+        self._excludes = get_matcher(snapshot.excludes).matches if snapshot.excludes else None
+        # None means "every level passes", which also lets untagged lines through.
+        self._levels = None if snapshot.filter_all else snapshot.active_tags
+        self.has_text_filters = bool(self._query or self._expr or self._keywords
+                                     or self._excludes)
+
+        # bytes.translate() table turning a column of level codes into a 0/1
+        # mask of the lines that pass the level filter (continuations always
+        # pass here; they follow their parent).
+        table = bytearray(256)
+        for tag, code in LEVEL_CODES.items():
+            if self._levels is None or tag in self._levels:
+                table[code] = 1
+        table[CODE_CONT] = 1
+        self.level_table = bytes(table)
+
+    def is_excluded(self, low):
+        """True if the lowercased line matches the exclusion list."""
+        excludes = self._excludes
+        return excludes is not None and excludes(low)
+
+    def match_text(self, low):
+        """
+        Text filters of a timestamped line whose level already passed:
+        exclusion list, search query and keyword list.
+        """
+        excludes = self._excludes
+        if excludes is not None and excludes(low):
+            return False
+        if self._query and self._query not in low:
+            return False
+        if self._expr is not None and not self._expr(low):
+            return False
+        keywords = self._keywords
+        if keywords is not None and not keywords(low):
+            return False
+        return True
+
+    def classify(self, line):
+        """
+        Classifies a single timestamped line.
+        Returns (line, tag) if it passes every filter, otherwise None.
+        """
+        if not line.strip(BLANK_CHARS) or DASH_MARKER in line:
+            return None
+        low = line.lower()
+        tag = detect_level(low)
+        if self._levels is not None and tag not in self._levels:
+            return None
+        if not self.match_text(low):
+            return None
+        return (line, tag)
+
+    def run(self, lines, parent_visible=False, is_duplicate=None, should_stop=None):
+        """
+        Filters a batch of raw lines in file order.
+
+        Continuation lines (no timestamp) are kept only when their parent
+        line was kept, unless they match the exclusion list.  Blank lines and
+        the startup dash line hide the continuations that follow them.
+
+        Args:
+            lines: Iterable of raw lines.
+            parent_visible (bool): Whether the line preceding this batch was
+                shown - lets the live tail continue across batches.
+            is_duplicate (callable): Optional text -> bool check applied to
+                every kept timestamped line.
+            should_stop (callable): Optional; polled every few thousand
+                lines, run() returns None as soon as it returns True.
+
+        Returns:
+            (rows, parent_visible): list of (line, tag) tuples - tag is None
+            for continuations - and the visibility state after the batch.
+        """
+        rows = []
+        append = rows.append
+        ts_match = TS_RE.match
+        blank = BLANK_CHARS
+        dash = DASH_MARKER
+        excludes = self._excludes
+        levels = self._levels
+        query = self._query
+        expr = self._expr
+        keywords = self._keywords
+
+        countdown = _STOP_CHECK_EVERY
+        for line in lines:
+            if should_stop is not None:
+                countdown -= 1
+                if not countdown:
+                    if should_stop():
+                        return None
+                    countdown = _STOP_CHECK_EVERY
+
+            stripped = line.strip(blank)
+            if not stripped or dash in line:
+                parent_visible = False
+                continue
+
+            if not ts_match(stripped):
+                # Orphan continuation: inherit parent visibility.
+                if parent_visible:
+                    if excludes is not None and excludes(line.lower()):
+                        continue
+                    append((line, None))
+                continue
+
+            parent_visible = False
+            low = line.lower()
+            if excludes is not None and excludes(low):
+                continue
+
+            if " error " in low or " critical " in low:
+                tag = "error"
+            elif " warning " in low:
+                tag = "warning"
+            elif " info " in low:
+                tag = "info"
+            elif " debug " in low:
+                tag = "debug"
+            else:
+                tag = None
+
+            if levels is not None and tag not in levels:
+                continue
+            if query and query not in low:
+                continue
+            if expr is not None and not expr(low):
+                continue
+            if keywords is not None and not keywords(low):
+                continue
+            if is_duplicate is not None and is_duplicate(line):
+                continue
+
+            append((line, tag))
+            parent_visible = True
+
+        return rows, parent_visible
+
+
+@lru_cache(maxsize=8)
+def get_classifier(snapshot):
+    """Returns the (cached) LineClassifier for *snapshot*."""
+    return LineClassifier(snapshot)
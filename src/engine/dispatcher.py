@@ -0,0 +1,174 @@
+# engine/dispatcher.py
+"""
+Back-pressure between the live tail (monitor thread) and the UI thread.
+
+The monitor thread used to post one root.after() callback per batch of 150
+lines and sleep 50 ms, whatever the UI could actually absorb.  Under a log
+storm the Tk event queue grew without bound and the display fell minutes
+behind the file.
+
+TailDispatcher replaces that with a single hand-off buffer:
+  - push() adds rows to the buffer and schedules ONE drain callback; while
+    that callback is still pending, further pushes are coalesced into it
+    instead of queueing more callbacks;
+  - the drain (UI thread) delivers everything buffered in one call and
+    measures how long it took;
+  - from that measurement the dispatcher derives how many lines the monitor
+    should read per iteration (batch_size) so one drain fits in a frame
+    budget, and the monitor waits for the drain (wait_drained) instead of
+    sleeping a fixed time.  Unread lines simply stay in the file.
+
+No Tkinter dependency: the UI side is injected as two callables.
+"""
+import threading
+import time
+
+from engine import perf
+
+# Lines read per monitor iteration: adaptive between these bounds.
+BATCH_MIN = 50
+BATCH_MAX = 5000
+
+# Target duration of one UI drain (ms) used to size the batches.
+FRAME_BUDGET_MS = 40.0
+
+# Weight of the newest measurement in the per-row cost moving average.
+_EWMA_ALPHA = 0.3
+
+# Initial per-row cost guess (ms) before the first measurement.
+_INITIAL_ROW_MS = 0.25
+
+
+class TailDispatcher:
+    """
+    Hand-off buffer from the monitor thread to the UI thread.
+
+    Args:
+        schedule: callable(fn) that runs fn on the UI thread
+            (e.g. lambda fn: root.after(0, fn)).
+        deliver: callable(rows) run on the UI thread; returns the number
+            of rows actually displayed (the rest counts as dropped, e.g.
+            while paused).
+    """
+
+    def __init__(self, schedule, deliver):
+        self._schedule = schedule
+        self._deliver = deliver
+        self._lock = threading.Lock()
+        self._pending = []
+        self._scheduled = False
+        self._scheduled_at = 0.0        # perf_counter() when the drain was scheduled
+        self._closed = False
+        self._drained = threading.Event()
+        self._drained.set()
+        self._row_ms = _INITIAL_ROW_MS
+
+        # Counters (read with stats()).
+        self.pushes = 0            # push() calls with at least one row
+        self.coalesced = 0         # pushes merged into an already pending drain
+        self.drains = 0            # drain callbacks executed
+        self.rows_delivered = 0
+        self.rows_dropped = 0      # paused, discarded by a refresh, or closed
+        self.last_drain_ms = 0.0
+        self.max_drain_ms = 0.0
+        self.max_backlog = 0       # largest number of rows waiting at a drain
+
+    @property
+    def batch_size(self):
+        """Number of lines the monitor should read for its next iteration."""
+        size = int(FRAME_BUDGET_MS / self._row_ms) if self._row_ms > 0 else BATCH_MAX
+        return max(BATCH_MIN, min(BATCH_MAX, size))
+
+    @property
+    def backlog(self):
+        """Rows buffered and not yet delivered."""
+        with self._lock:
+            return len(self._pending)
+
+    def push(self, rows):
+        """Buffers *rows* for the UI (monitor thread)."""
+        if not rows:
+            return
+        with self._lock:
+            if self._closed:
+                self.rows_dropped += len(rows)
+                return
+            self._pending.extend(rows)
+            self.pushes += 1
+            if self._scheduled:
+                self.coalesced += 1
+                return
+            self._scheduled = True
+            self._scheduled_at = time.perf_counter()
+            self._drained.clear()
+        try:
+            self._schedule(self._drain)
+        except Exception:
+            # UI is gone: nothing will ever drain the buffer.
+            with self._lock:
+                self._scheduled = False
+                self._closed = True
+            self._drained.set()
+
+    def _drain(self):
+        """Delivers every buffered row in one call (UI thread)."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            self._scheduled = False
+            closed = self._closed
+        perf.record("after_queue", self._scheduled_at)
+        try:
+            if closed or not rows:
+                self.rows_dropped += len(rows)
+                return
+            self.max_backlog = max(self.max_backlog, len(rows))
+            t0 = time.perf_counter()
+            shown = self._deliver(rows) or 0
+            elapsed = (time.perf_counter() - t0) * 1000
+            self.drains += 1
+            self.rows_delivered += shown
+            self.rows_dropped += len(rows) - shown
+            self.last_drain_ms = elapsed
+            self.max_drain_ms = max(self.max_drain_ms, elapsed)
+            if shown:
+                self._row_ms += _EWMA_ALPHA * (elapsed / shown - self._row_ms)
+        finally:
+            self._drained.set()
+
+    def wait_drained(self, timeout):
+        """
+        Blocks the monitor thread until the UI has consumed the buffer (or
+        *timeout* seconds elapse).  Returns at once when nothing is pending,
+        so a fast UI is never throttled.
+        """
+        return self._drained.wait(timeout)
+
+    def discard(self):
+        """Drops buffered rows, e.g. when a refresh reloads the view."""
+        with self._lock:
+            self.rows_dropped += len(self._pending)
+            self._pending = []
+
+    def close(self):
+        """Stops delivering: pending and future rows are dropped."""
+        with self._lock:
+            self._closed = True
+            self.rows_dropped += len(self._pending)
+            self._pending = []
+        self._drained.set()
+
+    def stats(self):
+        """Snapshot of the counters as a plain dict."""
+        return {
+            "batch_size": self.batch_size,
+            "row_cost_ms": round(self._row_ms, 4),
+            "pushes": self.pushes,
+            "coalesced": self.coalesced,
+            "drains": self.drains,
+            "rows_delivered": self.rows_delivered,
+            "rows_dropped": self.rows_dropped,
+            "backlog": self.backlog,
+            "max_backlog": self.max_backlog,
+            "last_drain_ms": round(self.last_drain_ms, 2),
+            "max_drain_ms": round(self.max_drain_ms, 2),
+        }
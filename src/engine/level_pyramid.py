@@ -0,0 +1,173 @@
+# engine/level_pyramid.py
+"""
+Compact per-line severity codes with a max-severity pyramid, for the
+timeline strip.
+
+The timeline colours each pixel row with the highest severity of the lines
+it covers.  Taking that maximum over a Python list of tags costs one Python
+step per line, on every redraw.  LevelPyramid keeps one signed byte per
+line (array('b'): 0 = no level / continuation, 1 = debug, 2 = info,
+3 = warning, 4 = error) and, above it, levels of maxima over blocks of 2, 4,
+8... lines.  The maximum of any range of lines is then read from O(log n)
+pyramid cells, so a redraw of h pixel rows costs O(h log n) whatever the
+number of lines.  When NumPy is installed, bucket_max() uses
+numpy.maximum.reduceat over the codes instead (one C pass per redraw).
+
+The number of lines of each level in a range (the timeline tooltip and
+density heatmap) comes from cumulative counts per block of _COUNT_BLOCK
+lines plus at most two partial blocks counted in C: O(1) per range.
+
+Appends update the pyramid and count tails only (amortised O(1) per line).
+Trimming the oldest lines only moves a start offset; the arrays are
+compacted once the dropped prefix outgrows the live part.  The module has
+no Tkinter dependency.
+"""
+from array import array
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+# Severity code of each line tag (higher wins); other tags count as 0.
+SEVERITY = {"debug": 1, "info": 2, "warning": 3, "error": 4}
+SEVERITY_TAGS = (None, "debug", "info", "warning", "error")
+
+# Highest code: a range holding it needs no further look-up.
+_MAX_CODE = 4
+_CODES = range(_MAX_CODE + 1)
+
+# Lines per block of the cumulative level counts.
+_COUNT_BLOCK = 256
+
+
+class LevelPyramid:
+    """Severity codes of the displayed lines, with range-maximum and count queries."""
+
+    def __init__(self, tags=()):
+        self._start = 0                 # Physical index of logical line 0
+        self._levels = [array("b")]     # _levels[k][j] = max of codes [j << k, (j + 1) << k)
+        self._cum = array("q", bytes(8 * len(_CODES)))  # Per code, lines before each block
+        self.extend(tags)
+
+    def __len__(self):
+        return len(self._levels[0]) - self._start
+
+    def code_at(self, i):
+        """Severity code of line *i*."""
+        return self._levels[0][self._start + i]
+
+    def tag_at(self, i):
+        """Level tag of line *i* (None for continuations and untagged lines)."""
+        return SEVERITY_TAGS[self._levels[0][self._start + i]]
+
+    def extend(self, tags):
+        """Appends the lines whose tags are *tags*."""
+        get = SEVERITY.get
+        codes = array("b", [get(tag, 0) for tag in tags])
+        if codes:
+            self._append_codes(codes)
+
+    def _append_codes(self, codes):
+        levels = self._levels
+        base = levels[0]
+        first = len(base)
+        base.extend(codes)
+
+        # Cumulative counts of the blocks completed by this append.
+        cum = self._cum
+        width = len(_CODES)
+        for block in range(len(cum) // width - 1, len(base) // _COUNT_BLOCK):
+            chunk = base[block * _COUNT_BLOCK:(block + 1) * _COUNT_BLOCK]
+            prev = cum[-width:]
+            cum.extend(prev[c] + chunk.count(c) for c in _CODES)
+
+        k = 0
+        while len(levels[k]) > 1:
+            below = levels[k]
+            if k + 1 == len(levels):
+                levels.append(array("b"))
+            above = levels[k + 1]
+            # Cells of level k+1 covering the changed part of level k.
+            first //= 2
+            del above[first:]
+            pairs = below[2 * first:]
+            above.extend(map(max, pairs[0::2], pairs[1::2]))
+            if len(pairs) % 2:
+                above.append(pairs[-1])
+            k += 1
+
+    def trim(self, count):
+        """Drops the *count* oldest lines."""
+        self._start += min(count, len(self))
+        if self._start > len(self):
+            codes = self._levels[0][self._start:]
+            self.clear()
+            self._append_codes(codes)
+
+    def clear(self):
+        self._start = 0
+        self._levels = [array("b")]
+        self._cum = array("q", bytes(8 * len(_CODES)))
+
+    def counts(self, first, last):
+        """Number of lines of each code (tuple indexed by code) in lines [first, last)."""
+        first += self._start
+        last += self._start
+        base = self._levels[0]
+        block_first = -(-first // _COUNT_BLOCK)
+        block_last = last // _COUNT_BLOCK
+        if block_first >= block_last:
+            chunk = base[first:last]
+            return tuple(chunk.count(c) for c in _CODES)
+        cum = self._cum
+        width = len(_CODES)
+        head = base[first:block_first * _COUNT_BLOCK]
+        tail = base[block_last * _COUNT_BLOCK:last]
+        return tuple(
+            cum[block_last * width + c] - cum[block_first * width + c]
+            + head.count(c) + tail.count(c)
+            for c in _CODES
+        )
+
+    def range_max(self, first, last):
+        """Highest code of lines [first, last) (0 for an empty range)."""
+        first += self._start
+        last += self._start
+        best = 0
+        levels = self._levels
+        k = 0
+        while first < last:
+            level = levels[k]
+            if first & 1:
+                if level[first] > best:
+                    best = level[first]
+                first += 1
+            if last & 1:
+                last -= 1
+                if level[last] > best:
+                    best = level[last]
+            if best == _MAX_CODE:
+                break
+            first >>= 1
+            last >>= 1
+            k += 1
+        return best
+
+    def bucket_max(self, starts):
+        """
+        Highest code of each bucket of lines [starts[i], starts[i + 1]), the
+        last bucket running to the end.  *starts* must be non-decreasing;
+        a bucket whose next start is not greater holds line starts[i] only
+        (numpy.maximum.reduceat semantics).
+        """
+        n = len(self)
+        if not n or not starts:
+            return []
+        if _np is not None:
+            codes = _np.frombuffer(self._levels[0], dtype=_np.int8)[self._start:]
+            return _np.maximum.reduceat(codes, _np.asarray(starts, dtype=_np.intp)).tolist()
+        ends = list(starts[1:])
+        ends.append(n)
+        range_max = self.range_max
+        return [range_max(s, e if e > s else s + 1) for s, e in zip(starts, ends)]
@@ -0,0 +1,272 @@
+# engine/line_index.py
+"""
+Byte-offset line index for the active log file.
+
+The index stores the start offset of every complete line in a compact
+array('q') (8 bytes per line).  It is built once with a single binary scan
+and then extended incrementally as the file grows, so that:
+
+  - the "last N lines" window is one seek + one read,
+  - the total line count is a len() call,
+  - random access to line N is a single seek.
+
+Only lines terminated by a newline are indexed.  A partially written last
+line is picked up on the next sync(), once Kodi has finished writing it.
+
+The module has no Tkinter dependency and is safe to use from any thread.
+"""
+import io
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+# Size of each binary read while scanning for newlines.
+_SCAN_CHUNK = 4 * 1024 * 1024
+
+# Size of each backward read used by read_tail_lines().
+_TAIL_BLOCK = 64 * 1024
+
+# Selected lines closer than this are fetched with one read by read_rows().
+_ROW_GAP = 64 * 1024
+
+# Offset of the character that follows each newline: used with accumulate()
+# so the whole offset computation runs in C (no Python loop per line).
+_PLUS_ONE = (1).__add__
+
+
+def decode_lines(block):
+    """
+    Decode a block of complete lines like text-mode readlines() does (UTF-8,
+    undecodable bytes ignored, CRLF folded to LF), but splitting on "\\n" only
+    so that decoded lines always match the indexed lines one to one.
+    """
+    lines = io.TextIOWrapper(
+        io.BytesIO(block), encoding="utf-8", errors="ignore", newline="\n"
+    ).readlines()
+    if b"\r" in block:
+        lines = [l[:-2] + "\n" if l.endswith("\r\n") else l for l in lines]
+    return lines
+
+
+def read_tail_lines(path, count):
+    """
+    Return (lines, end_offset) for the last *count* complete lines of *path*,
+    reading the file backwards block by block - O(window) regardless of size.
+    end_offset is the byte position just after the last returned line.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        blocks = []
+        newlines = 0
+        while pos > 0 and newlines <= count:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            newlines += block.count(b"\n")
+            blocks.append(block)
+
+    data = b"".join(reversed(blocks))
+    end = data.rfind(b"\n") + 1
+    if end == 0:
+        return [], pos
+    data = data[:end]
+
+    # When the scan stopped mid-file the first line is truncated: skip it.
+    start = 0 if pos == 0 else data.find(b"\n") + 1
+    # Keep only the last *count* lines.
+    extra = data.count(b"\n", start) - count
+    while extra > 0:
+        start = data.find(b"\n", start) + 1
+        extra -= 1
+    return decode_lines(data[start:]), pos + end
+
+
+class LineIndex:
+    """
+    Start offsets of every complete line of one log file.
+
+    Thread model: the monitor thread builds and extends the index; the main
+    thread and search workers read from it.  The internal lock only guards
+    the offsets themselves and is held for lookups and appends, never
+    across file I/O: sync() scans the new bytes unlocked (syncs are
+    serialized by a second lock) and read_lines() / read_rows() resolve
+    their offsets under the lock, then read the file after releasing it.
+    A long read on a worker thread therefore never blocks the UI thread.
+    `ready` is set by the owner once the initial build is complete; until
+    then, readers on the UI thread should use a fallback instead of waiting
+    for the (possibly multi-second) first scan.
+    """
+
+    def __init__(self, path=None):
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.path = path
+        self.ready = False
+        self.generation = 0           # Bumped whenever the index is reset
+        self._starts = array("q")     # Start offset of each complete line
+        self._end = 0                 # Offset just after the last indexed newline
+        self._identity = None         # (st_dev, st_ino) of the indexed file
+
+    def __len__(self):
+        with self._lock:
+            return len(self._starts)
+
+    @property
+    def indexed_bytes(self):
+        """Byte offset up to which the file has been indexed."""
+        return self._end
+
+    def _reset(self, identity):
+        self._starts = array("q")
+        self._end = 0
+        self._identity = identity
+        self.generation += 1
+
+    def sync(self, collect=False):
+        """
+        Index the bytes appended since the previous call.
+
+        Resets the index first when the file was replaced (different inode)
+        or truncated below the indexed size, e.g. after a Kodi restart.
+        With collect=True, returns the decoded text of the newly indexed
+        lines (single pass - used for the initial full-file load);
+        otherwise returns None.  OSError propagates to the caller.
+        """
+        with self._sync_lock:
+            st = os.stat(self.path)
+            identity = (st.st_dev, st.st_ino)
+            with self._lock:
+                if identity != self._identity or st.st_size < self._end:
+                    self._reset(identity)
+            # Only sync() moves _end, and syncs are serialized: it can be
+            # read here without the lock.
+            end = self._end
+
+            lines = [] if collect else None
+            if st.st_size <= end:
+                return lines
+
+            with open(self.path, "rb") as f:
+                f.seek(end)
+                carry = b""
+                while True:
+                    chunk = f.read(_SCAN_CHUNK)
+                    if not chunk:
+                        break
+                    data = carry + chunk if carry else chunk
+                    cut = data.rfind(b"\n") + 1
+                    if cut == 0:
+                        carry = data          # Very long line: keep reading
+                        continue
+                    complete, carry = data[:cut], data[cut:]
+
+                    # Offsets: running sum of (line length + 1) from the
+                    # current end; the last value is the new indexed end.
+                    offsets = array("q", accumulate(
+                        map(_PLUS_ONE, map(len, complete.split(b"\n")[:-1])),
+                        initial=end,
+                    ))
+                    end = offsets.pop()
+                    with self._lock:
+                        self._starts.extend(offsets)
+                        self._end = end
+
+                    if collect:
+                        lines.extend(decode_lines(complete))
+            return lines
+
+    def line_count(self, size=None):
+        """
+        Number of lines in the file, counting a partially written last line
+        (same result as iterating the file in binary mode), as of the last
+        sync().  Lock-free: cheap enough for the footer on the UI thread.
+        """
+        count = len(self._starts)
+        if size is not None and size > self._end:
+            count += 1
+        return count
+
+    def offset_of(self, line_no):
+        """Start offset of *line_no*, or the indexed end when line_no == len."""
+        with self._lock:
+            if line_no >= len(self._starts):
+                return self._end
+            return self._starts[line_no]
+
+    def line_at_offset(self, offset):
+        """Number of the first line starting at or after *offset*."""
+        with self._lock:
+            return bisect_left(self._starts, offset)
+
+    def read_lines(self, first, last=None):
+        """
+        Return the decoded text of lines [first, last): one seek, then reads
+        of roughly _SCAN_CHUNK bytes each, always cut on line boundaries.
+        """
+        with self._lock:
+            starts = self._starts
+            n = len(starts)
+            last = n if last is None else min(last, n)
+            if first >= last:
+                return []
+            # Sizes of consecutive blocks of lines [i, j) whose start falls
+            # within the next chunk (at least one line, however long it is).
+            begin = starts[first]
+            sizes = []
+            i = first
+            while i < last:
+                j = bisect_right(starts, starts[i] + _SCAN_CHUNK, i + 1, last)
+                block_end = starts[j] if j < n else self._end
+                sizes.append(block_end - starts[i])
+                i = j
+
+        lines = []
+        with open(self.path, "rb") as f:
+            f.seek(begin)
+            for size in sizes:
+                lines.extend(decode_lines(f.read(size)))
+        return lines
+
+    def read_rows(self, line_numbers):
+        """
+        Return the decoded text of the given lines (ascending line numbers),
+        in the same order.  Nearby lines are fetched with a single read, so
+        a dense selection costs about as much as read_lines().
+        """
+        if not line_numbers:
+            return []
+        with self._lock:
+            starts = self._starts
+            n = len(starts)
+            spans = []      # (offset, size, first line, [line numbers])
+            count = len(line_numbers)
+            k = 0
+            while k < count:
+                # Grow the span [first, last) while the next wanted line
+                # is close to its end and the span stays reasonably small.
+                first = line_numbers[k]
+                end = k + 1
+                last = first + 1
+                while end < count:
+                    nxt = line_numbers[end]
+                    if (starts[nxt] - (starts[last] if last < n else self._end) > _ROW_GAP
+                            or starts[nxt] - starts[first] > _SCAN_CHUNK):
+                        break
+                    last = nxt + 1
+                    end += 1
+                block_end = starts[last] if last < n else self._end
+                spans.append((starts[first], block_end - starts[first], first,
+                              line_numbers[k:end]))
+                k = end
+
+        rows = []
+        with open(self.path, "rb") as f:
+            for offset, size, first, wanted in spans:
+                f.seek(offset)
+                lines = decode_lines(f.read(size))
+                rows.extend(lines[line - first] for line in wanted)
+        return rows
@@ -0,0 +1,85 @@
+# engine/matcher.py
+"""
+Multi-keyword matcher for keyword lists and exclusion lists.
+
+Testing a line against a list with any(k in low for k in keywords) costs one
+substring scan per entry, which is why the exclusion list used to be capped
+at 20 entries and why long keyword lists (e.g. "Banned add-ons") slowed
+every filter down.
+
+KeywordMatcher compiles the list once into a single regular expression whose
+alternation is factored as a prefix trie ("abc|abd|ab" -> "ab(?:c|d)?"), so
+the regex engine walks the line once and follows a single trie branch at
+each position - the same idea as an Aho-Corasick automaton, executed by the
+C regex engine instead of a Python loop.  Its cost grows with the number of
+distinct branches at each trie level rather than with the list length.
+Short lists keep the plain substring loop, which is faster below a few
+dozen entries.
+
+Matchers are cached per pattern tuple (get_matcher), and the UI warms the
+cache whenever it reloads a list, so filters only ever pay for a lookup.
+"""
+import re
+from functools import lru_cache
+
+# Up to this many patterns, a loop of `in` checks is as fast as the regex
+# (measured crossover: 40-80 patterns with mostly distinct first letters).
+_LINEAR_MAX = 32
+
+
+def trie_pattern(patterns):
+    """Regex source matching any of *patterns*, factored as a prefix trie."""
+    trie = {}
+    for pattern in patterns:
+        node = trie
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        terminal = "" in node
+        if len(branches) == 1:
+            return f"(?:{branches[0]})?" if terminal else branches[0]
+        return "(?:" + "|".join(branches) + (")?" if terminal else ")")
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """
+    Tests lowercased lines against a fixed set of lowercase substrings.
+    Longer patterns win when several start at the same position, so
+    finditer() is also usable for highlighting.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(dict.fromkeys(p for p in patterns if p))
+        self.regex = re.compile(trie_pattern(self.patterns)) if self.patterns else None
+        if len(self.patterns) <= _LINEAR_MAX:
+            patterns = self.patterns
+            self.matches = lambda low: any(p in low for p in patterns)
+        else:
+            search = self.regex.search
+            self.matches = lambda low: search(low) is not None
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def finditer(self, low):
+        """Non-overlapping matches in *low*, longest pattern first at each position."""
+        if self.regex is None:
+            return iter(())
+        return self.regex.finditer(low)
+
+
+@lru_cache(maxsize=16)
+def get_matcher(patterns):
+    """Returns the (cached) KeywordMatcher for the tuple *patterns*."""
+    return KeywordMatcher(patterns)
@@ -0,0 +1,156 @@
+# engine/perf.py
+"""
+Always-on performance counters for the statistics overlay and bug reports.
+
+The hot paths call record(metric, start, amount) once per unit of work (a
+batch read or classified, a drain, an insert, a timeline redraw, a search
+scan) with the perf_counter() value taken before it.  Each call costs one
+lock, one ring-buffer append and a few integer additions, so recording is
+never switched off.
+
+For every metric the recorder keeps:
+
+    - all-time totals: samples, summed duration, summed amount (lines or
+      bytes) and a histogram of durations over power-of-two millisecond
+      buckets (_BUCKETS_MS);
+    - the last _RING_SIZE samples (time, duration, amount) in a ring
+      buffer, from which snapshot() derives the recent percentiles and the
+      throughput (amount per second of wall-clock time) over the last
+      _RATE_WINDOW seconds.
+
+snapshot() returns plain dicts, ready for json.dumps (export) or for the
+overlay text.  The module has no Tkinter dependency and is thread-safe.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# Metric name -> unit of its amount (None: durations only).
+METRICS = {
+    "read": "lines",          # Lines read from the file by the live tail
+    "parse": "lines",         # Lines classified (initial load and live tail)
+    "after_queue": None,      # Wait of a tail batch in the Tk event queue
+    "insert": "lines",        # Lines inserted into the text area
+    "timeline_draw": None,    # Timeline strip redraws
+    "search": "bytes",        # Bytes scanned by full-file searches
+}
+
+# Samples kept per metric for recent percentiles and rates.
+_RING_SIZE = 512
+
+# Window of the recent throughput (seconds).
+_RATE_WINDOW = 10.0
+
+# Upper bounds of the duration histogram buckets (ms); the last bucket is open.
+_BUCKETS_MS = tuple(2.0 ** k for k in range(-4, 15))    # 0.0625 ms .. 16 s
+
+# Percentiles of the recent samples.
+_PERCENTILES = (50, 90, 99)
+
+
+class _Metric:
+    __slots__ = ("count", "total_ms", "amount", "max_ms", "histogram", "ring")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.amount = 0
+        self.max_ms = 0.0
+        self.histogram = [0] * (len(_BUCKETS_MS) + 1)
+        self.ring = deque(maxlen=_RING_SIZE)    # (end time, duration ms, amount)
+
+
+class PerfRecorder:
+    """Counters, histograms and recent samples of every metric."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._metrics = {name: _Metric() for name in METRICS}
+
+    def record(self, name, start, amount=0):
+        """
+        Records one unit of work of metric *name* that began at *start*
+        (a time.perf_counter() value) and processed *amount* lines / bytes.
+        """
+        now = time.perf_counter()
+        ms = (now - start) * 1000.0
+        with self._lock:
+            m = self._metrics[name]
+            m.count += 1
+            m.total_ms += ms
+            m.amount += amount
+            if ms > m.max_ms:
+                m.max_ms = ms
+            m.histogram[bisect_left(_BUCKETS_MS, ms)] += 1
+            m.ring.append((now, ms, amount))
+
+    def reset(self):
+        """Clears every metric."""
+        with self._lock:
+            self._started = time.time()
+            self._metrics = {name: _Metric() for name in METRICS}
+
+    def snapshot(self):
+        """Plain-dict view of every metric (see the module docstring)."""
+        now = time.perf_counter()
+        with self._lock:
+            metrics = {name: (m.count, m.total_ms, m.amount, m.max_ms,
+                              list(m.histogram), list(m.ring))
+                       for name, m in self._metrics.items()}
+            started = self._started
+
+        result = {"since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+                  "metrics": {}}
+        for name, (count, total_ms, amount, max_ms, histogram, ring) in metrics.items():
+            unit = METRICS[name]
+            entry = {
+                "count": count,
+                "total_ms": round(total_ms, 2),
+                "mean_ms": round(total_ms / count, 3) if count else None,
+                "max_ms": round(max_ms, 3),
+            }
+            durations = sorted(ms for _, ms, _ in ring)
+            for p in _PERCENTILES:
+                if durations:
+                    rank = max(1, -(-p * len(durations) // 100))
+                    entry[f"p{p}_ms"] = round(durations[rank - 1], 3)
+                else:
+                    entry[f"p{p}_ms"] = None
+            if unit:
+                recent = sum(a for end, _, a in ring if now - end <= _RATE_WINDOW)
+                entry["unit"] = unit
+                entry["amount"] = amount
+                entry[f"{unit}_per_s"] = round(recent / _RATE_WINDOW)
+                entry[f"{unit}_per_busy_s"] = round(amount * 1000 / total_ms) if total_ms else None
+            entry["histogram_ms"] = {
+                (f"<={bound:g}" if i < len(_BUCKETS_MS) else f">{_BUCKETS_MS[-1]:g}"): n
+                for i, (bound, n) in enumerate(zip(_BUCKETS_MS + (None,), histogram)) if n
+            }
+            result["metrics"][name] = entry
+        return result
+
+
+# Process-wide recorder used by the engine and the UI.
+_recorder = PerfRecorder()
+record = _recorder.record
+reset = _recorder.reset
+snapshot = _recorder.snapshot
+
+
+def summary_lines(snap=None):
+    """One text line per metric (overlay and debug log)."""
+    snap = snap or snapshot()
+    lines = []
+    for name, e in snap["metrics"].items():
+        text = f"{name:<14}{e['count']:>8} x  p50 {_ms(e['p50_ms'])}  p99 {_ms(e['p99_ms'])}  max {_ms(e['max_ms'])}"
+        unit = e.get("unit")
+        if unit:
+            text += f"  {e[f'{unit}_per_s']:>10,} {unit}/s"
+        lines.append(text)
+    return lines
+
+
+def _ms(value):
+    return "     -  " if value is None else f"{value:8.2f}"
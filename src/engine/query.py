@@ -0,0 +1,310 @@
+# engine/query.py
+"""
+Query language of the search bar.
+
+A plain search is a single substring ("curl e" looks for "curl e").  When the
+text uses explicit syntax (see is_query_syntax) it is compiled instead into a
+predicate over the lowercased timestamped line:
+
+    word  "a phrase"          substring (case-insensitive)
+    re:/regex/                regular expression (case-insensitive)
+    level:error               level, as detected by the classifier; several
+                              levels separated by commas (level:error,warning)
+    component:curl            substring of the <component> name
+    time:10:00..10:30         time range, bounds inclusive at their precision;
+    time:"2024-05-01 10:00.." either bound may be omitted, dates allowed,
+    time:10:15                a single value is a prefix (here: that minute)
+    a b   a AND b             both terms
+    a OR b   a | b            either term
+    NOT a   -a                negation
+    ( ... )                   grouping
+
+AND binds tighter than OR.  A field needs a value and a regex the re:
+prefix, so that everyday searches such as "/addons/" (a path) or "time:"
+stay plain substrings.  The compiled Query also exposes the literals
+every match must contain (`required`), which the full-file search uses for
+its raw-bytes prefilter and trigram index, and the literals worth
+highlighting (`terms`).
+
+Queries are compiled once per text (get_query) and then evaluated by the
+shared LineClassifier on whatever thread runs it.
+"""
+import re
+from functools import lru_cache
+
+# One token of the query text; fields and phrases may be quoted.
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<lparen>\() |
+        (?P<rparen>\)) |
+        (?i:re):(?P<regex>/(?:\\.|[^/\\])+/)(?=[\s()]|$) |
+        (?P<field>(?i:level|component|time)):(?P<value>"[^"]+"|[^\s()"]+) |
+        (?P<phrase>"[^"]*") |
+        (?P<word>[^\s()]+)
+    )""", re.VERBOSE)
+
+_OPERATORS = {"AND", "OR", "NOT", "|"}
+
+# "<component>:" right after the level in a Kodi line.
+_COMPONENT_RE = re.compile(r"<([^>]*)>:")
+
+# Level names accepted by level: (prefixes of the classifier tags too).
+_LEVEL_ALIASES = {"err": "error", "warn": "warning", "critical": "error"}
+
+# Offset of the time part in "YYYY-MM-DD HH:MM:SS.mmm".
+_TIME_OFFSET = 11
+
+# Leading characters the classifier ignores before a timestamp.
+_LEADING_BLANKS = " \t\r\x00"
+
+
+class QueryError(ValueError):
+    """Invalid query text (unbalanced parenthesis, bad regex or field)."""
+
+
+def _tokenize(text):
+    """Returns [(kind, value), ...]; kind is an operator, "(" / ")" or a term kind."""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "lparen":
+            tokens.append(("(", None))
+        elif kind == "rparen":
+            tokens.append((")", None))
+        elif kind == "regex":
+            tokens.append(("regex", m.group("regex")[1:-1]))
+        elif kind == "value":
+            tokens.append((m.group("field").lower(), m.group("value").strip('"')))
+        elif kind == "phrase":
+            tokens.append(("text", m.group("phrase")[1:-1]))
+        else:
+            word = m.group("word")
+            if word in _OPERATORS:
+                tokens.append(("OR" if word == "|" else word, None))
+            elif word.startswith("-") and len(word) > 1:
+                tokens.append(("NOT", None))
+                tokens.append(("text", word[1:]))
+            else:
+                tokens.append(("text", word))
+    return tokens
+
+
+def is_query_syntax(text):
+    """
+    True when *text* uses explicit query syntax (a field with a value, a
+    re:/regex/ or an AND / OR / NOT operator); anything else is searched as a
+    plain substring.
+    """
+    if not text or not text.strip():
+        return False
+    for m in _TOKEN_RE.finditer(text.rstrip()):
+        kind = m.lastgroup
+        if kind in ("regex", "value"):
+            return True
+        if kind == "word" and m.group("word") in _OPERATORS:
+            return True
+    return False
+
+
+# ── Term predicates (all take the lowercased line) ──────────────────────────
+
+def _text_term(value):
+    needle = value.lower()
+    return lambda low: needle in low
+
+
+def _regex_term(value):
+    try:
+        search = re.compile(value, re.IGNORECASE).search
+    except re.error as e:
+        raise QueryError(f"regex /{value}/: {e}") from None
+    return lambda low: search(low) is not None
+
+
+def _level_term(value):
+    # Imported here: the classifier imports this module.
+    from engine.classifier import LEVELS, detect_level
+    levels = set()
+    for name in value.lower().split(","):
+        name = _LEVEL_ALIASES.get(name, name)
+        matches = [level for level in LEVELS if name and level.startswith(name)]
+        if not matches:
+            raise QueryError(f"level:{value}")
+        levels.update(matches)
+    return lambda low: detect_level(low) in levels
+
+
+def _component_term(value):
+    name = value.lower().strip("<>:")
+    search = _COMPONENT_RE.search
+
+    def match(low):
+        m = search(low)
+        return m is not None and name in m.group(1)
+    return match
+
+
+def _time_bound(bound):
+    """Returns (offset in the line, normalised bound) for a time: bound."""
+    bound = bound.strip().replace("T", " ")
+    if re.fullmatch(r"\d{4}-\d{2}(-\d{2}( \d{2}(:\d{2}(:\d{2}(\.\d{1,3})?)?)?)?)?", bound):
+        return 0, bound
+    if re.fullmatch(r"\d{2}(:\d{2}(:\d{2}(\.\d{1,3})?)?)?", bound):
+        return _TIME_OFFSET, bound
+    raise QueryError(f"time:{bound}")
+
+
+def _time_term(value):
+    if ".." not in value:
+        offset, prefix = _time_bound(value)
+        checks = [lambda ts: ts.startswith(prefix, offset)]
+    else:
+        low_bound, high_bound = value.split("..", 1)
+        checks = []
+        if low_bound.strip():
+            offset, start = _time_bound(low_bound)
+            checks.append(lambda ts: ts[offset:offset + len(start)] >= start)
+        if high_bound.strip():
+            offset_end, end = _time_bound(high_bound)
+            # Inclusive at the precision of the bound: 10:30 keeps 10:30:59.
+            checks.append(lambda ts: ts[offset_end:offset_end + len(end)] <= end)
+        if not checks:
+            raise QueryError(f"time:{value}")
+
+    def match(low):
+        ts = low if low[:1].isdigit() else low.lstrip(_LEADING_BLANKS)
+        return all(check(ts) for check in checks)
+    return match
+
+
+_TERMS = {
+    "text": _text_term,
+    "regex": _regex_term,
+    "level": _level_term,
+    "component": _component_term,
+    "time": _time_term,
+}
+
+
+# ── Parser ──────────────────────────────────────────────────────────────────
+
+class _Parser:
+    """Recursive-descent parser producing (predicate, required, terms)."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QueryError("unexpected ')'")
+        return node
+
+    def parse_or(self):
+        nodes = [self.parse_and()]
+        while self.peek() == "OR":
+            self.next()
+            nodes.append(self.parse_and())
+        if len(nodes) == 1:
+            return nodes[0]
+        preds = [pred for pred, _, _ in nodes]
+        terms = [t for _, _, node_terms in nodes for t in node_terms]
+        # A literal is required by the OR only if every branch requires it.
+        required = set.intersection(*(set(req) for _, req, _ in nodes))
+        return (lambda low: any(pred(low) for pred in preds)), sorted(required), terms
+
+    def parse_and(self):
+        nodes = [self.parse_not()]
+        while self.peek() not in (None, "OR", ")"):
+            if self.peek() == "AND":
+                self.next()
+            nodes.append(self.parse_not())
+        if len(nodes) == 1:
+            return nodes[0]
+        preds = [pred for pred, _, _ in nodes]
+        required = [r for _, req, _ in nodes for r in req]
+        terms = [t for _, _, node_terms in nodes for t in node_terms]
+        return (lambda low: all(pred(low) for pred in preds)), required, terms
+
+    def parse_not(self):
+        if self.peek() == "NOT":
+            self.next()
+            pred, _, _ = self.parse_not()
+            return (lambda low: not pred(low)), [], []
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind = self.peek()
+        if kind is None:
+            raise QueryError("missing term")
+        if kind == "(":
+            self.next()
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QueryError("missing ')'")
+            self.next()
+            return node
+        if kind in (")", "AND", "OR"):
+            raise QueryError(f"unexpected '{kind}'")
+        kind, value = self.next()
+        if not value:
+            raise QueryError(f"empty {kind} term")
+        pred = _TERMS[kind](value)
+        if kind == "text":
+            return pred, [value.lower()], [value.lower()]
+        return pred, [], []
+
+
+class Query:
+    """
+    Compiled search-bar query.
+
+    match(low) tests a lowercased timestamped line; `required` lists the
+    lowercase literals every matching line contains and `terms` the literals
+    to highlight.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        tokens = _tokenize(text)
+        if not tokens:
+            raise QueryError("empty query")
+        self.match, required, terms = _Parser(tokens).parse()
+        self.required = tuple(dict.fromkeys(required))
+        self.terms = tuple(dict.fromkeys(terms))
+
+
+@lru_cache(maxsize=32)
+def get_query(text):
+    """Returns the (cached) compiled Query for *text*; raises QueryError."""
+    return Query(text)
+
+
+def split_search_text(text):
+    """
+    Splits the search bar text into the (query, expr) fields of a
+    FilterSnapshot: a plain lowercase substring, or the text itself when it
+    uses the query syntax.  Text with a syntax error is searched as a plain
+    substring.
+    """
+    text = text.strip()
+    if is_query_syntax(text):
+        try:
+            get_query(text)
+            return "", text
+        except QueryError:
+            pass
+    return text.lower(), ""
@@ -0,0 +1,376 @@
+# engine/record_store.py
+"""
+Columnar store of already-parsed log records.
+
+Every line loaded by the monitor thread (initial load and live tail) is
+parsed once into a few compact columns, indexed by its line number in the
+file:
+
+    level   array('B')  level code (see engine.classifier.LEVEL_CODES),
+                        CODE_CONT for continuations, CODE_SKIP for blank lines
+    parent  array('i')  line number of the timestamped line a continuation
+                        belongs to (-1 when there is none)
+    stamp   array('q')  timestamp in milliseconds (see parse_stamp), 0 when
+                        the line has none
+
+Byte offsets and lengths are not duplicated here: the store is attached to
+the session's LineIndex, which already holds them.
+
+The store also keeps the first and last timestamps of the file as ingest()
+sees them go by (the first one is set by the owner when the loaded range
+does not start at line 0), so the time span of the log is known without
+reading the file again.
+
+With these columns a filter change no longer re-reads and re-classifies the
+whole window: the level filter is a single bytes.translate() over the level
+column, and only the text of the surviving lines is fetched (through the
+index) for the search / keyword / exclusion checks.  Memory cost is 13 bytes
+per line.
+
+select() can also return its result as a LineRows: the line numbers of the
+rows with their level code and timestamp (17 bytes per row), their text
+being read back through the line index only when rows are accessed.  Large
+views (ui/virtual_view.py) keep that instead of every decoded line, and
+only read the window they render.
+"""
+import threading
+from array import array
+from datetime import date
+from itertools import compress
+
+from engine.classifier import (
+    BLANK_CHARS, CODE_CONT, CODE_SKIP, LEVEL_CODES, LEVEL_TAGS, TS_RE, DASH_MARKER,
+)
+
+# Lines processed between two should_stop() checks in select().
+_STOP_CHECK_EVERY = 2048
+
+# Tag of each level code of a LineRows (continuations have none).
+_ROW_TAGS = LEVEL_TAGS + (None,)
+
+# Rows decoded per read when a LineRows is iterated.
+_DECODE_ROWS = 4096
+
+# Milliseconds at 00:00 of each "YYYY-MM-DD" prefix seen so far.
+_DAY_MS = {}
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def parse_stamp(stripped):
+    """
+    Returns the timestamp of a Kodi line ("YYYY-MM-DD HH:MM:SS.mmm ...") in
+    milliseconds since 1970-01-01, read as UTC (Kodi writes local time and
+    the store only needs ordering and differences), or 0 if malformed.
+    """
+    try:
+        day = stripped[:10]
+        base = _DAY_MS.get(day)
+        if base is None:
+            base = (date(int(day[:4]), int(day[5:7]), int(day[8:10])).toordinal()
+                    - _EPOCH_ORDINAL) * 86_400_000
+            _DAY_MS[day] = base
+        return (base
+                + int(stripped[11:13]) * 3_600_000
+                + int(stripped[14:16]) * 60_000
+                + int(stripped[17:19]) * 1000
+                + int(stripped[20:23]))
+    except ValueError:
+        return 0
+
+
+class RecordStore:
+    """
+    Parsed records for a contiguous range of lines [base, end) of the file
+    behind *index*.  Written by the monitor thread, read by the main thread
+    and search workers; all public methods take the internal lock.
+    """
+
+    def __init__(self, index):
+        self._lock = threading.RLock()
+        self.index = index
+        self.base = 0
+        self.level = array("B")
+        self.parent = array("i")
+        self.stamp = array("q")
+        self._last_parent = -1     # Parent of the next continuation line
+        self.first_stamp = 0       # First / last timestamp of the file (ms, 0: unknown)
+        self.last_stamp = 0
+        self._stamps_generation = index.generation   # Index generation they belong to
+
+    @property
+    def end(self):
+        """Line number just after the last stored record."""
+        return self.base + len(self.level)
+
+    def __len__(self):
+        return len(self.level)
+
+    def covers(self, first, last):
+        """True if every line in [first, last) is stored (and there is one)."""
+        with self._lock:
+            return self.base <= first < last <= self.end
+
+    def span_ms(self):
+        """
+        Milliseconds between the first and last timestamps of the file, or
+        None while either is unknown or the file was replaced since.
+        """
+        with self._lock:
+            if self._stamps_generation != self.index.generation:
+                return None
+            if not self.first_stamp or not self.last_stamp:
+                return None
+            return self.last_stamp - self.first_stamp
+
+    def set_first_stamp(self, stamp):
+        """Records the first timestamp ("YYYY-MM-DD HH:MM:SS.mmm") of the file."""
+        with self._lock:
+            self._check_generation()
+            self.first_stamp = parse_stamp(stamp) if stamp else 0
+
+    def _check_generation(self):
+        """Forgets the first / last timestamps once the index was reset."""
+        generation = self.index.generation
+        if generation != self._stamps_generation:
+            self._stamps_generation = generation
+            self.first_stamp = self.last_stamp = 0
+
+    def reset(self, base=0):
+        with self._lock:
+            self.base = base
+            self.level = array("B")
+            self.parent = array("i")
+            self.stamp = array("q")
+            self._last_parent = -1
+
+    def ingest(self, lines, first):
+        """
+        Parses *lines*, which are lines [first, first + len(lines)) of the
+        file, and appends them.  A gap with the stored range restarts the
+        store at *first*.
+        """
+        levels = array("B")
+        parents = array("i")
+        stamps = array("q")
+        ts_match = TS_RE.match
+        blank = BLANK_CHARS
+        dash = DASH_MARKER
+
+        with self._lock:
+            if first != self.end or not self.level:
+                self.reset(first)
+            last_parent = self._last_parent
+
+            for n, line in enumerate(lines, first):
+                stripped = line.strip(blank)
+                if not stripped or dash in line:
+                    levels.append(CODE_SKIP)
+                    parents.append(-1)
+                    stamps.append(0)
+                    last_parent = -1
+                    continue
+
+                if not ts_match(stripped):
+                    levels.append(CODE_CONT)
+                    parents.append(last_parent)
+                    stamps.append(0)
+                    continue
+
+                # Same detection as engine.classifier.detect_level().
+                low = line.lower()
+                if " error " in low or " critical " in low:
+                    levels.append(3)
+                elif " warning " in low:
+                    levels.append(2)
+                elif " info " in low:
+                    levels.append(1)
+                elif " debug " in low:
+                    levels.append(4)
+                else:
+                    levels.append(0)
+                parents.append(-1)
+                stamps.append(parse_stamp(stripped))
+                last_parent = n
+
+            self.level.extend(levels)
+            self.parent.extend(parents)
+            self.stamp.extend(stamps)
+            self._last_parent = last_parent
+
+            self._check_generation()
+            if first == 0 and not self.first_stamp:
+                self.first_stamp = next(filter(None, stamps), 0)
+            self.last_stamp = next(filter(None, reversed(stamps)), self.last_stamp)
+
+    def select(self, classifier, first, last, is_duplicate=None, should_stop=None,
+               numbered=False):
+        """
+        Returns the (line, tag) rows of lines [first, last) that pass
+        *classifier* - same result as classifier.run() over those lines.
+
+        The level filter runs on the level column; only the lines that
+        survive it are read back (via the line index) for the text filters.
+        With numbered=True the rows are returned as a LineRows, and when no
+        text filter nor *is_duplicate* applies no line is read at all.
+        Returns None when should_stop() becomes true.
+        """
+        with self._lock:
+            lo, hi = first - self.base, last - self.base
+            levels = self.level[lo:hi]
+            parents = self.parent[lo:hi]
+            stamps = self.stamp[lo:hi] if numbered else None
+
+        mask = levels.tobytes().translate(classifier.level_table)
+        candidates = list(compress(range(first, last), mask))
+        text_filters = classifier.has_text_filters
+        if numbered and not text_filters and is_duplicate is None:
+            texts = candidates      # The loop below never looks at the text
+        else:
+            texts = self.index.read_rows(candidates)
+
+        rows = []
+        append = rows.append
+        shown = -1     # Line number of the last timestamped line kept
+        countdown = _STOP_CHECK_EVERY
+        for n, line in zip(candidates, texts):
+            if should_stop is not None:
+                countdown -= 1
+                if not countdown:
+                    if should_stop():
+                        return None
+                    countdown = _STOP_CHECK_EVERY
+
+            code = levels[n - first]
+            if code == CODE_CONT:
+                if shown >= 0 and parents[n - first] == shown and not (
+                        text_filters and classifier.is_excluded(line.lower())):
+                    append(n if numbered else (line, None))
+                continue
+
+            if text_filters and not classifier.match_text(line.lower()):
+                continue
+            if is_duplicate is not None and is_duplicate(line):
+                continue
+            append(n if numbered else (line, LEVEL_TAGS[code]))
+            shown = n
+
+        if numbered:
+            offsets = [n - first for n in rows]
+            return LineRows(self.index, rows,
+                            bytes(map(levels.__getitem__, offsets)),
+                            map(stamps.__getitem__, offsets))
+        return rows
+
+
+class LineRows:
+    """
+    (line, tag) rows of a view, held as line numbers of the file behind
+    *index* and decoded on access (see the module docstring).
+
+    Supports what the views do with a list of rows: len(), indexing,
+    slicing (step 1), iteration, extend() and deleting a prefix.  Rows
+    added in decoded form (live tail, streamed search) are kept as they are
+    after the numbered ones.  The line numbers belong to one generation of
+    the index: the view is rebuilt when the file is replaced.
+    """
+
+    def __init__(self, index, lines=(), codes=b"", stamps=()):
+        self.index = index
+        self.lines = array("q", lines)     # Line number of each numbered row
+        self.codes = bytearray(codes)      # Level code (CODE_CONT: continuation)
+        self.stamps = array("q", stamps)   # Timestamp in ms (0 for continuations)
+        self._decoded = []                 # (line, tag) rows appended after them
+
+    @classmethod
+    def from_run(cls, index, first, lines, rows):
+        """
+        Numbers the *rows* classifier.run() kept from *lines*, which are
+        lines [first, first + len(lines)) of the file.  run() keeps the very
+        string objects of *lines*, so each row is found by identity.
+        """
+        numbers = []
+        codes = bytearray()
+        stamps = array("q")
+        i = 0
+        for text, tag in rows:
+            while lines[i] is not text:
+                i += 1
+            numbers.append(first + i)
+            i += 1
+            stripped = text.strip(BLANK_CHARS)
+            if TS_RE.match(stripped):
+                codes.append(LEVEL_CODES[tag])
+                stamps.append(parse_stamp(stripped))
+            else:
+                codes.append(CODE_CONT)
+                stamps.append(0)
+        return cls(index, numbers, codes, stamps)
+
+    def __len__(self):
+        return len(self.lines) + len(self._decoded)
+
+    def _read(self, first, last):
+        """Decoded rows [first, last) of the numbered part."""
+        texts = self.index.read_rows(self.lines[first:last].tolist())
+        return list(zip(texts, map(_ROW_TAGS.__getitem__, self.codes[first:last])))
+
+    def __getitem__(self, key):
+        numbered = len(self.lines)
+        if isinstance(key, slice):
+            first, last, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("LineRows slices do not take a step")
+            rows = self._read(first, min(last, numbered)) if first < numbered else []
+            if last > numbered:
+                rows.extend(self._decoded[max(0, first - numbered):last - numbered])
+            return rows
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("LineRows index out of range")
+        if key >= numbered:
+            return self._decoded[key - numbered]
+        return self._read(key, key + 1)[0]
+
+    def __iter__(self):
+        for first in range(0, len(self.lines), _DECODE_ROWS):
+            yield from self._read(first, first + _DECODE_ROWS)
+        yield from self._decoded
+
+    def __delitem__(self, key):
+        first, last, step = key.indices(len(self)) if isinstance(key, slice) else (None,) * 3
+        if first != 0 or step != 1:
+            raise ValueError("only a prefix of LineRows can be deleted")
+        numbered = len(self.lines)
+        del self.lines[:last]
+        del self.codes[:last]
+        del self.stamps[:last]
+        if last > numbered:
+            del self._decoded[:last - numbered]
+
+    def extend(self, rows):
+        """Appends *rows*: another LineRows of the same index, or (line, tag) rows."""
+        if isinstance(rows, LineRows) and rows.index is self.index and not self._decoded:
+            self.lines.extend(rows.lines)
+            self.codes.extend(rows.codes)
+            self.stamps.extend(rows.stamps)
+            self._decoded.extend(rows._decoded)
+        else:
+            self._decoded.extend(rows)
+
+    def tags(self):
+        """Tag of every row, without decoding the numbered ones."""
+        tags = list(map(_ROW_TAGS.__getitem__, self.codes))
+        tags.extend(tag for _, tag in self._decoded)
+        return tags
+
+    def timestamps(self):
+        """
+        Timestamp (ms) of every row, 0 for continuations; the numbered
+        rows are not decoded.
+        """
+        stamps = array("q", self.stamps)
+        for text, _ in self._decoded:
+            stripped = text.strip(BLANK_CHARS)
+            stamps.append(parse_stamp(stripped) if TS_RE.match(stripped) else 0)
+        return stamps
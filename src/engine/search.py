@@ -0,0 +1,387 @@
+# engine/search.py
+"""
+Full-file search over raw bytes, split across a process pool.
+
+The search worker used to readlines() the whole file in text mode and
+classify every line in one thread: a 400 MB log became gigabytes of Python
+strings and one busy core.  scan_file() instead:
+
+  - memory-maps the file (no text decoding up front) and splits it into chunks of about _CHUNK_BYTES,
+    each starting on a timestamped line (so a chunk never begins in the
+    middle of a message and its continuation lines);
+  - scans every chunk in a worker process: the search term is looked up in
+    the lowercased raw bytes with bytes.find(), and only the messages that
+    contain it (timestamped line + its continuation lines) are decoded and
+    passed to the shared LineClassifier, which applies the remaining
+    filters exactly as everywhere else;
+  - merges the chunk results in file order.
+
+When the caller passes on_chunk, every chunk's rows are also handed to it
+as soon as they are available, in file order, so the UI can render the
+first matches while the rest of the file is still being scanned.  The
+first chunks are small (_FIRST_CHUNK_BYTES, doubling up to _CHUNK_BYTES)
+so that the first screenful arrives within tens of milliseconds.
+
+Files below PARALLEL_MIN_BYTES, and machines where a process pool cannot be
+started, are scanned the same way in the calling thread.  should_stop() is
+polled between chunks: on cancellation the chunks not started yet are
+dropped and the running ones are simply not waited for.
+
+When a TrigramIndex (engine/trigram.py) covers the file, only the blocks
+that may hold the term are scanned, plus the bytes appended since the
+index was last extended.
+
+IncrementalSearch keeps the last result so that extending the query only
+re-filters the previous matches (see its docstring).
+"""
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as _ResultTimeout
+from typing import NamedTuple
+
+from engine import perf
+from engine.classifier import BLANK_CHARS, TS_RE, get_classifier
+from engine.line_index import decode_lines
+from engine.query import get_query
+
+# Files smaller than this are scanned in the calling thread.
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+
+# Target size of one scanned chunk (also the cancellation granularity).
+_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Size of the first chunk when results are streamed (see scan_file); each
+# following chunk is twice as large, up to _CHUNK_BYTES.
+_FIRST_CHUNK_BYTES = 512 * 1024
+
+# Above one hit per this many bytes, the prefilter costs more than it saves:
+# the chunk is decoded and classified as a whole.
+_DENSE_HIT_BYTES = 4096
+
+# Start of the next timestamped line (the classifier strips these blank
+# characters before testing the "YYYY-MM-DD" prefix).
+_NEXT_TS = re.compile(rb"\n[ \t\r\x00]*\d{4}-\d{2}-\d{2}")
+_TS_AT_START = re.compile(rb"[ \t\r\x00]*\d{4}-\d{2}-\d{2}")
+
+# Rows processed between two should_stop() checks in refine_rows().
+_STOP_CHECK_EVERY = 2048
+
+# Start method of the worker processes.  Never fork: the parent runs the Tk
+# mainloop plus the monitor and dispatcher threads, and a lock one of them
+# holds at fork time (e.g. a LineIndex lock) would stay locked in the child.
+# The workers only import this module and its engine dependencies.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_pool = None
+_pool_failed = False
+
+
+def get_pool():
+    """The shared process pool, created on first use (None if unavailable)."""
+    global _pool, _pool_failed
+    if _pool is None and not _pool_failed:
+        try:
+            workers = max(1, min(8, (os.cpu_count() or 2) - 1))
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context(_START_METHOD))
+        except (OSError, ValueError, NotImplementedError, ImportError):
+            _pool_failed = True
+    return _pool
+
+
+def shutdown_pool():
+    """Stops the worker processes (called when the application closes)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _needle(snapshot):
+    """Search term as bytes for the raw prefilter, or None if unusable."""
+    query = snapshot.query
+    if snapshot.expr:
+        # Query syntax: the longest literal every match contains, if any.
+        query = max((t for t in get_query(snapshot.expr).required if t.isascii()),
+                    key=len, default="")
+    # bytes.lower() only folds ASCII: non-ASCII terms skip the prefilter.
+    if not query or not query.isascii():
+        return None
+    return query.encode("ascii")
+
+
+def _first_ts(low):
+    """Offset of the first timestamped line of *low*, or len(low) if none."""
+    if _TS_AT_START.match(low):
+        return 0
+    m = _NEXT_TS.search(low)
+    return m.start() + 1 if m else len(low)
+
+
+def split_chunks(buf, start, end, chunk_bytes=_CHUNK_BYTES, first_bytes=None):
+    """
+    Returns [(first, last), ...] covering buf[start:end]; every chunk but
+    the first starts on a timestamped line.  With *first_bytes*, the chunks
+    start at that size and double up to *chunk_bytes*.
+    """
+    step = min(first_bytes or chunk_bytes, chunk_bytes)
+    bounds = [start]
+    pos = start + step
+    while pos < end:
+        m = _NEXT_TS.search(buf, pos, end)
+        if m is None:
+            break
+        cut = m.start() + 1
+        bounds.append(cut)
+        step = min(step * 2, chunk_bytes)
+        pos = cut + step
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def scan_bytes(raw, snapshot, parent_visible=False):
+    """
+    Filters *raw* (bytes of complete lines, starting on a line boundary)
+    with *snapshot*.  Same result as classifier.run() over the decoded
+    lines: returns (rows, parent_visible).
+    """
+    classifier = get_classifier(snapshot)
+    needle = _needle(snapshot)
+    low = raw.lower() if needle is not None else b""
+    size = len(low)
+    if needle is None or low.count(needle) * _DENSE_HIT_BYTES > size:
+        return classifier.run(decode_lines(raw), parent_visible)
+
+    rows = []
+    state = False
+    # Continuation lines before the first timestamped line belong to a
+    # message that started before *raw*.
+    lead = _first_ts(low)
+    if parent_visible and lead:
+        rows, state = classifier.run(decode_lines(raw[:lead]), True)
+
+    # Byte spans of the messages (timestamped line + continuations) holding
+    # the term; adjacent messages are merged so dense hits decode in bulk.
+    spans = []
+    pos = 0
+    while True:
+        hit = low.find(needle, pos)
+        if hit < 0:
+            break
+        line_start = low.rfind(b"\n", 0, hit) + 1
+        m = _NEXT_TS.search(low, hit)
+        group_end = m.start() + 1 if m else size
+        # A hit on a continuation line only counts through its parent,
+        # which has been (or will be) found on its own.
+        if line_start >= lead and (line_start == 0 or _NEXT_TS.match(low, line_start - 1)):
+            if spans and spans[-1][1] == line_start:
+                spans[-1][1] = group_end
+            else:
+                spans.append([line_start, group_end])
+        pos = group_end
+
+    for start, end in spans:
+        kept, span_state = classifier.run(decode_lines(raw[start:end]))
+        rows.extend(kept)
+    if spans and spans[-1][1] == size:
+        state = span_state       # The last message was classified
+    elif lead < size:
+        state = False            # The last message does not hold the term
+    return rows, state
+
+
+def refine_rows(rows, query, parent_visible=False, should_stop=None):
+    """
+    Narrows the rows of a previous search to those matching *query*, which
+    must contain the previous query (so the new result is a subset).
+    Continuation rows follow their timestamped row.  *parent_visible* is
+    the state the previous search ended with.  Returns (rows,
+    parent_visible) like scan_bytes(), or None if should_stop() returned
+    True.
+    """
+    kept = []
+    append = kept.append
+    keep = False
+    countdown = _STOP_CHECK_EVERY
+    for row in rows:
+        line = row[0]
+        if TS_RE.match(line.strip(BLANK_CHARS)):
+            keep = query in line.lower()
+            if should_stop is not None:
+                countdown -= 1
+                if not countdown:
+                    if should_stop():
+                        return None
+                    countdown = _STOP_CHECK_EVERY
+        if keep:
+            append(row)
+    return kept, parent_visible and keep
+
+
+def _scan_chunk(path, start, end, snapshot, parent_visible):
+    """Worker-process entry point: scans bytes [start, end) of *path*."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return scan_bytes(buf[start:end], snapshot, parent_visible)
+
+
+class ScanResult(NamedTuple):
+    rows: list              # (line, tag) rows in file order
+    end: int                # Offset just after the last scanned (complete) line
+    parent_visible: bool    # Classifier state at `end`
+
+
+def scan_file(path, snapshot, should_stop=None, start=0, parent_visible=False,
+              on_chunk=None, index=None):
+    """
+    Filters the complete lines of *path* from offset *start* (a line
+    boundary) to the end of the file.  *parent_visible* is the classifier
+    state at *start*.  Returns a ScanResult, or None if should_stop()
+    returned True.
+
+    on_chunk(rows, done, total), when given, is called from the calling
+    thread with the rows of each chunk in file order; *done* and *total*
+    are the scanned and total byte counts of this scan.
+
+    *index*, a TrigramIndex of *path*, narrows a scan from offset 0 to the
+    blocks that may contain the search term.
+    """
+    t_start = time.perf_counter()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= start:
+            return ScanResult([], start, parent_visible)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            # Complete lines only: a line still being written is left for
+            # the next scan.
+            end = buf.rfind(b"\n", start, min(size, len(buf))) + 1
+            if end <= start:
+                return ScanResult([], start, parent_visible)
+            first_bytes = _FIRST_CHUNK_BYTES if on_chunk else None
+            narrowed = None
+            needle = _needle(snapshot)
+            if index is not None and start == 0 and needle is not None:
+                st = os.fstat(f.fileno())
+                narrowed = index.candidates(needle, (st.st_dev, st.st_ino))
+            if narrowed is not None and narrowed[1] <= end:
+                # Candidate blocks start on a timestamped line, like chunks.
+                ranges, indexed_end = narrowed
+                chunks = [r for first, last in ranges
+                          for r in split_chunks(buf, first, last, _CHUNK_BYTES, first_bytes)]
+                chunks += split_chunks(buf, indexed_end, end, _CHUNK_BYTES, first_bytes)
+                chunks = [(first, last) for first, last in chunks if first < last]
+            else:
+                chunks = split_chunks(buf, start, end, first_bytes=first_bytes)
+            if not chunks:
+                return ScanResult([], end, False)
+            pool = (get_pool() if end - start >= PARALLEL_MIN_BYTES and len(chunks) > 1
+                    else None)
+
+            if pool is None:
+                rows = []
+                state = parent_visible
+                for first, last in chunks:
+                    if should_stop is not None and should_stop():
+                        return None
+                    kept, state = scan_bytes(buf[first:last], snapshot, state)
+                    rows.extend(kept)
+                    if on_chunk is not None:
+                        on_chunk(kept, last - start, end - start)
+                perf.record("search", t_start, end - start)
+                return ScanResult(rows, end, state)
+
+    # Every chunk but the first starts on a timestamped line: only the first
+    # one inherits the incoming state.
+    futures = [pool.submit(_scan_chunk, path, first, last, snapshot,
+                           parent_visible if i == 0 else False)
+               for i, (first, last) in enumerate(chunks)]
+    rows = []
+    state = parent_visible
+    try:
+        for future, (_, last) in zip(futures, chunks):
+            while True:
+                if should_stop is not None and should_stop():
+                    return None
+                try:
+                    kept, state = future.result(timeout=0.1)
+                    break
+                except _ResultTimeout:
+                    continue
+            rows.extend(kept)
+            if on_chunk is not None:
+                on_chunk(kept, last - start, end - start)
+    finally:
+        for future in futures:
+            future.cancel()
+    perf.record("search", t_start, end - start)
+    return ScanResult(rows, end, state)
+
+
+class IncrementalSearch:
+    """
+    Full-file search that remembers its last result.
+
+    When the next query contains the previous one (type-ahead: "curl",
+    "curl e", "curl er") and nothing else changed, the new result is a
+    subset of the previous one: it is computed by refine_rows() over the
+    remembered rows, plus a scan of the bytes appended since.  Any other
+    change (shorter or different query, other filters, file replaced or
+    truncated) runs a full scan_file(), and so does every query using the
+    query syntax (its plain query is empty).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = None    # (path, identity, filters, query, ScanResult)
+        self.refined = 0     # Searches served by refinement (statistics)
+        self.full_scans = 0
+
+    def clear(self):
+        """Forgets the remembered result (and the memory its rows hold)."""
+        with self._lock:
+            self._last = None
+
+    def run(self, path, snapshot, should_stop=None, on_chunk=None, index=None):
+        """
+        Returns the rows of *path* passing *snapshot*, or None if stopped.
+        *on_chunk* and *index* are passed to scan_file(); a refined result
+        is delivered to on_chunk as a first chunk, before the appended bytes
+        are scanned.
+        """
+        st = os.stat(path)
+        identity = (st.st_dev, st.st_ino)
+        filters = snapshot._replace(query="")
+        with self._lock:
+            last = self._last
+
+        result = None
+        if last is not None:
+            l_path, l_identity, l_filters, l_query, l_result = last
+            if (l_path == path and l_identity == identity and l_filters == filters
+                    and l_query and l_query in snapshot.query
+                    and st.st_size >= l_result.end):
+                refined = refine_rows(l_result.rows, snapshot.query,
+                                      l_result.parent_visible, should_stop)
+                if refined is None:
+                    return None
+                if on_chunk is not None:
+                    on_chunk(refined[0], 0, st.st_size - l_result.end)
+                tail = scan_file(path, snapshot, should_stop, start=l_result.end,
+                                 parent_visible=refined[1], on_chunk=on_chunk)
+                if tail is None:
+                    return None
+                result = ScanResult(refined[0] + tail.rows, tail.end, tail.parent_visible)
+                self.refined += 1
+
+        if result is None:
+            result = scan_file(path, snapshot, should_stop, on_chunk=on_chunk, index=index)
+            if result is None:
+                return None
+            self.full_scans += 1
+
+        with self._lock:
+            self._last = (path, identity, filters, snapshot.query, result)
+        return result.rows
@@ -0,0 +1,220 @@
+# engine/timestamps.py
+"""
+Timestamp lookups by binary search.
+
+Kodi writes its log in chronological order, so any run of rows in file
+order (the rows of the view, the lines of the file) is sorted by the
+"YYYY-MM-DD HH:MM:SS.mmm" prefix of its timestamped lines.  Jumping to a
+time, or back to a double-clicked line after a filter reset, therefore only
+needs O(log n) probes instead of a widget search occurrence by occurrence.
+
+The same property locates a time in the file itself: find_time_offset()
+bisects byte offsets, reading one line at each probe, so a time window of a
+1 GB log (read_time_window) is found in about 30 small reads, before (and
+without) building the line index.
+
+Continuation lines carry no timestamp: the searches probe forward from the
+middle of the range to the next timestamped row, so they never break the
+ordering.  Timestamps are compared as strings, which orders them correctly
+because every field is zero-padded.
+"""
+import os
+import re
+from datetime import datetime, timedelta
+
+from engine.classifier import BLANK_CHARS
+from engine.line_index import decode_lines, read_tail_lines
+
+# Full Kodi timestamp at the start of a line.
+TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}")
+TIMESTAMP_LEN = 23
+
+# Accepted "Go to time" inputs: optional date, then HH:MM[:SS[.mmm]].
+_TIME_INPUT_RE = re.compile(
+    r"(?:(?P<date>\d{4}-\d{2}-\d{2})[ T])?"
+    r"(?P<time>\d{1,2}:\d{2}(?::\d{2}(?:[.,]\d{1,3})?)?)"
+)
+
+# Values completing a partial "HH:MM" / "HH:MM:SS" / "HH:MM:SS.m" time, as a
+# start bound and as an (inclusive) end bound.
+_TIME_PAD = "00:00:00.000"
+_TIME_PAD_END = "23:59:59.999"
+
+# Timestamp at the start of a raw line (leading blanks allowed).
+_STAMP_BYTES_RE = re.compile(rb"[ \t\r\x00]*(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3})")
+
+# Below this many bytes, find_time_offset() scans lines instead of bisecting.
+_SCAN_BYTES = 64 * 1024
+
+# Lines read from the end of the file to find its last timestamp.
+_LAST_STAMP_LINES = 200
+
+_STAMP_FMT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def row_timestamp(text):
+    """The timestamp prefix of a log line, or None for a continuation line."""
+    if not text[:1].isdigit():
+        text = text.lstrip(BLANK_CHARS)
+    stamp = text[:TIMESTAMP_LEN]
+    return stamp if TIMESTAMP_RE.fullmatch(stamp) else None
+
+
+def parse_time_input(text, day, end=False):
+    """
+    Turns a "Go to time" input into a full timestamp string.  Accepts
+    "HH:MM", "HH:MM:SS", "HH:MM:SS.mmm", optionally preceded by a
+    "YYYY-MM-DD" date; *day* ("YYYY-MM-DD") is used when the date is
+    omitted.  With end=True the missing fields are maxed out, so that the
+    result is an inclusive end bound ("10:30" keeps 10:30:59.999).
+    Returns None when the input is not a time.
+    """
+    m = _TIME_INPUT_RE.fullmatch(text.strip())
+    if m is None:
+        return None
+    time = m.group("time").replace(",", ".")
+    if len(time.split(":")[0]) == 1:
+        time = "0" + time
+    time += (_TIME_PAD_END if end else _TIME_PAD)[len(time):]
+    hours, minutes, seconds = time[:2], time[3:5], time[6:8]
+    if hours > "23" or minutes > "59" or seconds > "59":
+        return None
+    return f"{m.group('date') or day} {time}"
+
+
+def bisect_time(count, stamp_at, target):
+    """
+    Index of the first row, among rows 0..count-1 sorted by time, whose
+    timestamp is >= *target*, skipping rows without a timestamp; count if
+    there is none.  *stamp_at(i)* returns the timestamp of row i, or None.
+    Uses O(log n) probes (plus the continuation rows stepped over).
+    """
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probe = mid
+        stamp = stamp_at(probe)
+        while stamp is None and probe + 1 < hi:
+            probe += 1
+            stamp = stamp_at(probe)
+        if stamp is None:
+            hi = mid            # Only continuations in [mid, hi)
+        elif stamp < target:
+            lo = probe + 1
+        else:
+            hi = mid
+    while lo < count and stamp_at(lo) is None:
+        lo += 1
+    return lo
+
+
+def find_stamped_row(count, stamp_at, text_at, target, content=None):
+    """
+    Index of the row stamped exactly *target* (and containing *content*,
+    when given) among rows sorted by time, or None.  Rows sharing the
+    timestamp are checked in order from the first one.
+    """
+    row = bisect_time(count, stamp_at, target)
+    while row < count:
+        stamp = stamp_at(row)
+        if stamp is not None and stamp != target:
+            return None
+        if stamp is not None and (content is None or content in text_at(row)):
+            return row
+        row += 1
+    return None
+
+
+def shift_timestamp(stamp, minutes):
+    """*stamp* moved by *minutes* (negative: earlier), as a timestamp string."""
+    moved = datetime.strptime(stamp, _STAMP_FMT) + timedelta(minutes=minutes)
+    return moved.strftime(_STAMP_FMT)[:TIMESTAMP_LEN]
+
+
+def first_timestamp(path):
+    """Timestamp of the first timestamped line of *path*, or None."""
+    with open(path, "rb") as f:
+        return _next_stamp(f, 0, _SCAN_BYTES)[1]
+
+
+def last_timestamp(path):
+    """Timestamp of the last timestamped line of *path*, or None."""
+    lines, _ = read_tail_lines(path, _LAST_STAMP_LINES)
+    for line in reversed(lines):
+        stamp = row_timestamp(line)
+        if stamp:
+            return stamp
+    return None
+
+
+def _next_stamp(f, pos, limit):
+    """
+    (offset, timestamp) of the first timestamped line starting at or after
+    *pos* and before *limit* in the binary file *f*, or (limit, None).
+    """
+    if pos > 0:
+        f.seek(pos - 1)
+        line = f.readline()         # Rest of the line holding pos - 1
+        pos += len(line) - 1
+    else:
+        f.seek(0)
+    while pos < limit:
+        line = f.readline()
+        if not line:
+            break
+        m = _STAMP_BYTES_RE.match(line)
+        if m:
+            return pos, m.group(1).decode("ascii")
+        pos += len(line)
+    return limit, None
+
+
+def find_time_offset(f, target, after=False):
+    """
+    Offset of the first line of the binary file *f* stamped at or after
+    *target* (strictly after with after=True), or the file size.  Binary
+    search over byte offsets: O(log size) reads of one line each.
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    lo, hi = 0, size
+    if after:
+        before = lambda stamp: stamp <= target
+    else:
+        before = lambda stamp: stamp < target
+    # Invariant: the answer starts in [lo, size]; the first timestamped line
+    # starting at or after hi (if any) is not before the target.
+    while hi - lo > _SCAN_BYTES:
+        mid = (lo + hi) // 2
+        pos, stamp = _next_stamp(f, mid, hi)
+        if stamp is not None and before(stamp):
+            lo = pos
+        else:
+            hi = mid
+    # Line scan from lo: it stops at the first timestamped line from hi on.
+    pos = lo
+    while True:
+        pos, stamp = _next_stamp(f, pos, size)
+        if stamp is None or not before(stamp):
+            return pos
+        pos += 1
+
+
+def read_time_window(path, start, end=None):
+    """
+    Lines of *path* stamped from *start* to *end* inclusive (no upper bound
+    when end is None), with their continuation lines.  Returns (lines,
+    start offset, end offset); the end offset is just after the last
+    complete line of the window.
+    """
+    with open(path, "rb") as f:
+        first = find_time_offset(f, start)
+        if end is None:
+            f.seek(0, os.SEEK_END)
+            last = f.tell()
+        else:
+            last = max(first, find_time_offset(f, end, after=True))
+        f.seek(first)
+        data = f.read(last - first)
+    cut = data.rfind(b"\n") + 1
+    return decode_lines(data[:cut]), first, first + cut
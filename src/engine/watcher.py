@@ -0,0 +1,228 @@
+# engine/watcher.py
+"""
+Wait-for-change primitives used by the live tail.
+
+On Linux, InotifyWatcher blocks on an inotify descriptor (through ctypes, no
+extra dependency) and wakes up as soon as Kodi writes to the log, so new
+lines show up within milliseconds while an idle monitor sleeps for seconds
+at a time.  Everywhere else - and whenever inotify cannot be set up (no
+libc symbol, watch limit reached, unsupported filesystem) - PollingWatcher
+keeps the historical behaviour: wake up every POLL_INTERVAL seconds.
+
+Network filesystems (CIFS, NFS, sshfs...) accept an inotify watch but never
+report writes made by the remote machine, which is where Kodi runs when its
+log is read over a share: logs on such mounts are polled too.
+
+Both expose the same calls:
+    wait(timeout)  -> True when the file may have changed
+    interrupt()    -> wakes a pending wait() immediately (any thread)
+    close()        -> releases the watcher (owner thread only)
+"""
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import sys
+import threading
+import time
+
+# Idle wake-up period of the polling fallback (seconds).
+POLL_INTERVAL = 0.4
+
+# inotify event bits (see <sys/inotify.h>).
+_IN_MODIFY      = 0x00000002
+_IN_ATTRIB      = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM  = 0x00000040
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_DELETE      = 0x00000200
+_IN_Q_OVERFLOW  = 0x00004000
+_IN_NONBLOCK    = 0o4000
+_IN_CLOEXEC     = 0o2000000
+
+# The parent directory is watched rather than the file itself, so that Kodi
+# replacing kodi.log at startup (rename + create) is seen like a write.
+_DIR_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM
+             | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE)
+
+# struct inotify_event header: wd, mask, cookie, len (name follows).
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Filesystem types (as listed in /proc/mounts) whose remote writes raise no
+# inotify event.
+_NETWORK_FS = frozenset({
+    "cifs", "smb3", "smbfs", "nfs", "nfs4", "ncpfs", "afs", "9p", "ceph",
+    "glusterfs", "lustre", "fuse.sshfs", "fuse.rclone", "fuse.s3fs", "davfs",
+    "fuse.davfs2",
+})
+
+# Octal escapes of /proc/mounts fields (space, tab, newline, backslash).
+_MOUNT_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+_libc = None
+
+
+def _load_libc():
+    """Returns libc with the inotify symbols, or None if unavailable."""
+    global _libc
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+class PollingWatcher:
+    """Fallback watcher: reports a possible change every POLL_INTERVAL."""
+
+    kind = "polling"
+
+    def __init__(self, path=None):
+        self.path = path
+        self._wake = threading.Event()
+
+    def wait(self, timeout):
+        self._wake.wait(min(timeout, POLL_INTERVAL))
+        self._wake.clear()
+        return True
+
+    def interrupt(self):
+        self._wake.set()
+
+    def close(self):
+        self._wake.set()
+
+
+class InotifyWatcher:
+    """Linux watcher: blocks until the log file (or its directory entry) changes."""
+
+    kind = "inotify"
+
+    def __init__(self, path):
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify is not available")
+        self.path = path
+        directory, self._name = os.path.split(os.path.abspath(path))
+        self._name = os.fsencode(self._name)
+
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), _DIR_MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, "inotify_add_watch failed")
+        # Self-pipe used by interrupt() to wake a blocked select().  Its
+        # write end never blocks: a full pipe already means "wake up".
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_w, False)
+        self._closed = False
+        # interrupt() runs on other threads: the lock keeps it from writing
+        # to a descriptor close() has just released (and the OS reused).
+        self._lock = threading.Lock()
+
+    def _drain(self):
+        """Reads pending events; True if one concerns the watched file."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return relevant
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(data):
+                _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+                if mask & _IN_Q_OVERFLOW or name == self._name:
+                    relevant = True
+
+    def wait(self, timeout):
+        """
+        Blocks for at most *timeout* seconds.  Returns True as soon as the
+        file is written, created, moved or deleted; False on timeout.
+        Events about other files of the same directory are ignored.
+        """
+        if self._closed:
+            return True
+        deadline = time.monotonic() + timeout
+        remaining = timeout
+        while True:
+            ready, _, _ = select.select([self._fd, self._wake_r], [], [], remaining)
+            if not ready:
+                return False
+            if self._wake_r in ready:
+                os.read(self._wake_r, 512)
+                return True
+            if self._drain():
+                return True
+            # Only unrelated events: keep waiting for the rest of the timeout.
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+    def interrupt(self):
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for fd in (self._fd, self._wake_r, self._wake_w):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+
+def is_network_fs(path, mounts="/proc/mounts"):
+    """
+    True if *path* lies on a network filesystem according to the *mounts*
+    table (the longest mount point containing it wins).  False when the
+    table cannot be read.
+    """
+    path = os.path.realpath(path)
+    best, fs_type = "", ""
+    try:
+        with open(mounts, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                point = _MOUNT_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), fields[1])
+                inside = (path == point or path.startswith(point.rstrip("/") + "/"))
+                if inside and len(point) >= len(best):
+                    best, fs_type = point, fields[2]
+    except OSError:
+        return False
+    return fs_type in _NETWORK_FS
+
+
+def create_watcher(path):
+    """
+    Returns an InotifyWatcher for *path* on Linux, or a PollingWatcher when
+    inotify is unavailable, cannot watch this location, or would miss the
+    remote writes of a network filesystem.
+    """
+    if sys.platform.startswith("linux") and not is_network_fs(path):
+        try:
+            return InotifyWatcher(path)
+        except OSError:
+            pass
+    return PollingWatcher(path)
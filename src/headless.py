@@ -0,0 +1,306 @@
+"""
+Headless mode: tails and filters a Kodi log to stdout, without any window.
+
+    python main.py --headless [log] [-f] [-n N | --full | --since/--until/--last]
+                   [-l error,warning] [-s QUERY] [-k LIST] [--json] [--color WHEN]
+
+It runs the same engine as the GUI monitor loop (line index, rotation
+detection, shared LineClassifier with continuation-line inheritance,
+exclusion list, keyword lists, query language) and reuses its files: the
+log path saved in CONFIG_FILE, EXCLUDE_LIST_FILE, the KEYWORD_DIR lists and
+the LOG_COLORS of the current theme.  Lines are classified and written in
+batches of up to _BATCH_LINES, one write() per batch, so the cost per line
+stays a few C-level string operations and memory stays bounded even with
+--full on a huge log.
+
+No Tkinter / CustomTkinter import happens on this path, so it runs on a
+headless Kodi box or inside a pipeline.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from config import CONFIG_FILE, EXCLUDE_LIST_FILE, KEYWORD_DIR, LOG_COLORS
+from engine.classifier import LEVELS, FilterSnapshot, get_classifier
+from engine.line_index import LineIndex, read_tail_lines
+from engine.query import split_search_text
+from engine.timestamps import (
+    last_timestamp, parse_time_input, read_time_window, row_timestamp, shift_timestamp,
+)
+from engine.watcher import create_watcher
+
+# Lines read, classified and written per batch while following the file.
+_BATCH_LINES = 20000
+
+# Longest idle wait of the follow loop (s); inotify wakes it earlier.
+_IDLE_WAKE_MAX = 5.0
+
+# Wait before retrying a log that became inaccessible (s).
+_RETRY_DELAY = 2.0
+
+# Lines shown by default before following, like the GUI's "1000 lines" mode.
+_TAIL_LINES = 1000
+
+# Level names accepted by --level besides LEVELS.
+_LEVEL_ALIASES = {"err": "error", "warn": "warning", "critical": "error"}
+
+_ANSI_RESET = "\033[0m"
+
+
+def _saved_log_path():
+    """Log path of the GUI session (first line of CONFIG_FILE), or None."""
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            path = f.readline().split('#')[0].strip()
+    except OSError:
+        return None
+    return path if path and os.path.exists(path) else None
+
+
+def _read_list(path):
+    """Non-empty lowercase lines of a list file ([] if it does not exist)."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return [line.strip().lower() for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def _parse_levels(text):
+    """Level tags of a comma-separated --level value."""
+    levels = set()
+    for name in text.lower().split(","):
+        name = _LEVEL_ALIASES.get(name.strip(), name.strip())
+        if name not in LEVELS:
+            raise argparse.ArgumentTypeError(
+                f"unknown level {name!r} (choose from {', '.join(LEVELS)})")
+        levels.add(name)
+    return frozenset(levels)
+
+
+def _ansi_color(hex_color):
+    """24-bit ANSI foreground escape of a "#rrggbb" colour."""
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"\033[38;2;{r};{g};{b}m"
+
+
+def _enable_ansi():
+    """Turns on escape sequence processing in a Windows console (no-op elsewhere)."""
+    if sys.platform != "win32":
+        return
+    try:
+        from ctypes import windll, byref, c_uint
+        handle = windll.kernel32.GetStdHandle(-11)      # STD_OUTPUT_HANDLE
+        mode = c_uint()
+        if windll.kernel32.GetConsoleMode(handle, byref(mode)):
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            windll.kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except Exception:
+        pass
+
+
+def _make_formatter(mode):
+    """
+    Returns a function turning a classified batch [(line, tag)] into the text
+    to write: plain lines, lines coloured by level ("color") or JSON lines.
+    """
+    if mode == "json":
+        dumps = json.dumps
+
+        def format_rows(rows):
+            return "".join(
+                dumps({
+                    "time": row_timestamp(line),
+                    "level": tag,
+                    "text": line.rstrip("\r\n"),
+                }, ensure_ascii=False) + "\n"
+                for line, tag in rows
+            )
+    elif mode == "color":
+        prefixes = {tag: _ansi_color(LOG_COLORS[tag]) for tag in LEVELS}
+
+        def format_rows(rows):
+            get = prefixes.get
+            return "".join(
+                get(tag, "") + line.rstrip("\r\n") + (_ANSI_RESET + "\n" if tag else "\n")
+                for line, tag in rows
+            )
+    else:
+        def format_rows(rows):
+            return "".join(line if line.endswith("\n") else line + "\n" for line, _ in rows)
+    return format_rows
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py --headless",
+        description="Tail and filter a Kodi log without the GUI.",
+    )
+    parser.add_argument("log", nargs="?",
+                        help="log file (default: the one opened last in the GUI)")
+    parser.add_argument("-f", "--follow", action="store_true",
+                        help="keep printing new lines, across Kodi restarts")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("-n", "--lines", type=int, default=_TAIL_LINES,
+                       help=f"start with the last N lines (default {_TAIL_LINES})")
+    scope.add_argument("--full", action="store_true", help="start with the whole file")
+    scope.add_argument("--last", type=int, metavar="MINUTES",
+                       help="start with the last MINUTES of the log")
+    scope.add_argument("--since", metavar="TIME",
+                       help="start at this time ([YYYY-MM-DD ]HH:MM[:SS[.mmm]])")
+    parser.add_argument("--until", metavar="TIME",
+                        help="stop at this time (no --follow then)")
+    parser.add_argument("-l", "--level", type=_parse_levels,
+                        help="levels to keep, e.g. error,warning (default: all)")
+    parser.add_argument("-s", "--search", default="",
+                        help="search text or query (same syntax as the search bar)")
+    parser.add_argument("-k", "--keywords", metavar="LIST",
+                        help=f"keep lines matching the keyword list {KEYWORD_DIR}/LIST.txt")
+    parser.add_argument("--no-exclude", action="store_true",
+                        help=f"ignore the exclusion list ({EXCLUDE_LIST_FILE})")
+    parser.add_argument("--json", action="store_true",
+                        help="one JSON object per line: time, level, text")
+    parser.add_argument("--color", choices=("auto", "always", "never"), default="auto",
+                        help="colour lines by level (default: when writing to a terminal)")
+    return parser
+
+
+def _initial_lines(args, path):
+    """
+    Lines printed first, and the byte offset just after them.  The whole
+    file (--full) is not read here but streamed in batches from offset 0.
+    """
+    if args.last is not None or args.since or args.until:
+        last = last_timestamp(path)
+        if last is None:
+            return [], os.path.getsize(path)
+        day = last[:10]
+        if args.last is not None:
+            start = shift_timestamp(last, -args.last)
+        else:
+            start = parse_time_input(args.since, day) if args.since else ""
+        end = parse_time_input(args.until, day, end=True) if args.until else None
+        if start is None or (args.until and end is None):
+            raise ValueError("invalid time (expected [YYYY-MM-DD ]HH:MM[:SS[.mmm]])")
+        lines, _, end_off = read_time_window(path, start, end)
+        return lines, end_off
+    if args.full:
+        return [], 0
+    return read_tail_lines(path, max(0, args.lines))
+
+
+def _stream(path, tail_end, classifier, parent_visible, emit, follow):
+    """
+    Writes the lines of *path* after byte *tail_end*, batch by batch; with
+    *follow*, keeps waiting for new lines forever.  A rotation (file replaced
+    or truncated) restarts from the top of the new file, like the GUI
+    monitor loop.
+    """
+    index = LineIndex(path)
+    index.sync()
+    tail_line = index.line_at_offset(tail_end)
+    generation = index.generation
+    watcher = create_watcher(path) if follow else None
+    inaccessible = False
+    try:
+        while True:
+            try:
+                index.sync()
+                if inaccessible:
+                    inaccessible = False
+                    print("[INFO] log accessible again", file=sys.stderr)
+                if index.generation != generation:
+                    # Kodi restarted: the index was rebuilt for the new file.
+                    generation = index.generation
+                    tail_line = 0
+                    parent_visible = False
+                    print("[INFO] log rotated, following the new file", file=sys.stderr)
+
+                new_lines = index.read_lines(tail_line, tail_line + _BATCH_LINES)
+                if not new_lines:
+                    if not follow:
+                        return
+                    watcher.wait(_IDLE_WAKE_MAX)
+                    continue
+                tail_line += len(new_lines)
+                rows, parent_visible = classifier.run(new_lines, parent_visible)
+                if rows:
+                    emit(rows)
+            except OSError as e:
+                if not follow:
+                    raise
+                # File locked, deleted or on an unreachable share: retry.
+                if not inaccessible:
+                    inaccessible = True
+                    print(f"[ERROR] {type(e).__name__}: {e}", file=sys.stderr)
+                time.sleep(_RETRY_DELAY)
+    finally:
+        if watcher is not None:
+            watcher.close()
+
+
+def main(argv=None):
+    """Entry point of `main.py --headless`; returns the process exit code."""
+    args = _build_parser().parse_args(argv)
+
+    path = args.log or _saved_log_path()
+    if not path:
+        print("[ERROR] no log file given and none saved by the GUI", file=sys.stderr)
+        return 2
+
+    keywords = ()
+    if args.keywords:
+        list_path = os.path.join(KEYWORD_DIR, f"{args.keywords}.txt")
+        if not os.path.exists(list_path):
+            print(f"[ERROR] keyword list not found: {list_path}", file=sys.stderr)
+            return 2
+        keywords = tuple(_read_list(list_path))
+
+    query, expr = split_search_text(args.search)
+    snapshot = FilterSnapshot(
+        filter_all=args.level is None,
+        active_tags=args.level or frozenset(),
+        query=query,
+        keywords=keywords,
+        excludes=() if args.no_exclude else tuple(_read_list(EXCLUDE_LIST_FILE)),
+        expr=expr,
+    )
+    classifier = get_classifier(snapshot)
+
+    if args.json:
+        mode = "json"
+    elif args.color == "always" or (args.color == "auto" and sys.stdout.isatty()):
+        mode = "color"
+        _enable_ansi()
+    else:
+        mode = "plain"
+    format_rows = _make_formatter(mode)
+    try:
+        sys.stdout.reconfigure(errors="replace")
+    except (AttributeError, ValueError):
+        pass
+    out = sys.stdout
+
+    def emit(rows):
+        out.write(format_rows(rows))
+        out.flush()
+
+    try:
+        initial, tail_end = _initial_lines(args, path)
+        rows, parent_visible = classifier.run(initial)
+        if rows:
+            emit(rows)
+        follow = args.follow and not args.until
+        if follow or (args.full and not args.until):
+            _stream(path, tail_end, classifier, parent_visible, emit, follow)
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # Reader went away (e.g. "| head"): silence the flush at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    return 0
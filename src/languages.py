@@ -100,10 +100,31 @@ LANGS = {
         "tip_github": "Ouvrir la page Github",
         "tip_reset": "Réinitialiser filtres et affichage",
         "tip_duration": "Durée couverte par le journal (du premier au dernier événement)",
+        "search_progress": "🔍 Recherche… {}%",
+        "tip_search_cancel": "Cliquer (ou Échap dans le journal) pour arrêter la recherche ; les résultats déjà affichés sont conservés",
+        "tip_search_index": "Index de recherche : {} indexés, {} en mémoire",
         "truncated_chars": "car.",
         "yes": "Oui",
         "no":  "Non",
         "ok":  "OK",
+        "goto_time_title":   "Aller à l'heure",
+        "goto_time_prompt":  "Heure (HH:MM[:SS[.mmm]], date AAAA-MM-JJ facultative) :",
+        "goto_time_invalid": "Heure non reconnue",
+        "time_window_title": "Fenêtre temporelle",
+        "time_window_last": "Dernières minutes :",
+        "time_window_from": "De :",
+        "time_window_to": "À (facultatif) :",
+        "time_window_clear": "Effacer",
+        "scope_time_window": "Fenêtre temporelle",
+        "tip_time_window": "Clic droit (Ctrl + K) : charger une fenêtre temporelle",
+        "tip_time_window_clear": "Revenir aux 1 000 dernières lignes",
+        "perf_overlay_title": "Statistiques de performance",
+        "perf_export": "Exporter JSON",
+        "perf_reset": "Réinitialiser",
+        "perf_close": "Fermer",
+        "tl_rate": "≈ {} lignes/s",
+        "tl_heatmap_on": "Clic droit : carte de densité",
+        "tl_heatmap_off": "Clic droit : couleurs de niveau",
         "exclude":                "Exclure",
         "exclude_confirm_title":  "Confirmer l'exclusion",
         "exclude_confirm_msg":    "Exclure tous les messages contenant :\n\n\"{}\"",
@@ -155,7 +176,7 @@ LANGS = {
         "tip_filter_error": "Afficher les erreurs",
         "tip_filter_debug": "Afficher les messages de débogage",
         "tip_lang": "Choisir la langue de l'interface",
-        "tip_search_bar": "Rechercher un mot-clé dans les logs",
+        "tip_search_bar": "Rechercher un mot-clé dans les logs\nAvancé : level:error  component:curl  time:10:00..10:30  re:/regex/  OR  NOT  ( )",
         "tip_history_clear": "Supprimer tout l'historique de recherche",
         "tip_history_manage": "Historique de recherche - cliquer pour gérer",
         "tip_history_empty":  "Aucun historique de recherche",
@@ -175,10 +196,13 @@ LANGS = {
             "Ctrl + S : Exporter le LOG\n"
             "Ctrl + P : Uploader le LOG\n"
             "Ctrl + F : Rechercher mot clé\n"
+            "Ctrl + J : Aller à l'heure\n"
             "Ctrl + N : Ouvrir les exclusions\n"
+            "Ctrl + I : Statistiques de performance\n"
             "Ctrl + G : Vider l'affichage de la console\n"
             "Ctrl + L : Retour à la ligne auto\n"
             "Ctrl + T : Mode illimité (∞) / 1000 lignes\n"
+            "Ctrl + K : Fenêtre temporelle (dernières minutes / de – à)\n"
             "Ctrl + A : Sélectionner tout\n"
             "M : Ouvrir le menu contextuel dans le LOG\n"
             "S : Afficher le résumé système\n"
@@ -274,10 +298,31 @@ LANGS = {
         "tip_github": "Open the GitHub page",
         "tip_reset": "Reset filters and display",
         "tip_duration": "Time span covered by the log (from first to last event)",
+        "search_progress": "🔍 Searching… {}%",
+        "tip_search_cancel": "Click (or press Esc in the log) to stop the search; results already shown are kept",
+        "tip_search_index": "Search index: {} indexed, {} in memory",
         "truncated_chars": "chars",
         "yes": "Yes",
         "no":  "No",
         "ok":  "OK",
+        "goto_time_title":   "Go to time",
+        "goto_time_prompt":  "Time (HH:MM[:SS[.mmm]], optional YYYY-MM-DD date):",
+        "goto_time_invalid": "Unrecognized time",
+        "time_window_title": "Time window",
+        "time_window_last": "Last minutes:",
+        "time_window_from": "From:",
+        "time_window_to": "To (optional):",
+        "time_window_clear": "Clear",
+        "scope_time_window": "Time window",
+        "tip_time_window": "Right-click (Ctrl + K): load a time window",
+        "tip_time_window_clear": "Back to the last 1,000 lines",
+        "perf_overlay_title": "Performance statistics",
+        "perf_export": "Export JSON",
+        "perf_reset": "Reset",
+        "perf_close": "Close",
+        "tl_rate": "≈ {} lines/s",
+        "tl_heatmap_on": "Right-click: density heatmap",
+        "tl_heatmap_off": "Right-click: level colours",
         "exclude":                "Exclude",
         "exclude_confirm_title":  "Confirm exclusion",
         "exclude_confirm_msg":    "Exclude all messages containing:\n\n\"{}\"",
@@ -329,7 +374,7 @@ LANGS = {
         "tip_filter_error": "Show errors",
         "tip_filter_debug": "Show debug messages",
         "tip_lang": "Choose interface language",
-        "tip_search_bar": "Search for a keyword in the logs",
+        "tip_search_bar": "Search for a keyword in the logs\nAdvanced: level:error  component:curl  time:10:00..10:30  re:/regex/  OR  NOT  ( )",
         "tip_history_clear": "Delete all search history",
         "tip_history_manage": "Search history - click to manage",
         "tip_history_empty":  "No search history",
@@ -349,10 +394,13 @@ LANGS = {
             "Ctrl + S : Export LOG\n"
             "Ctrl + P : Upload LOG\n"
             "Ctrl + F : Search keyword\n"
+            "Ctrl + J : Go to time\n"
             "Ctrl + N : Open exclusions\n"
+            "Ctrl + I : Performance statistics\n"
             "Ctrl + G : Clear console\n"
             "Ctrl + L : Toggle word wrap\n"
             "Ctrl + T : Unlimited mode (∞) / 1000 lines\n"
+            "Ctrl + K : Time window (last minutes / from – to)\n"
             "Ctrl + A : Select All\n"
             "M : Open context menu in the log\n"
             "S : Show system summary\n"
@@ -448,10 +496,31 @@ LANGS = {
         "tip_github": "Abrir la página de GitHub",
         "tip_reset": "Restablecer filtros y visualización",
         "tip_duration": "Período de tiempo cubierto por el registro (del primer al último evento)",
+        "search_progress": "🔍 Buscando… {}%",
+        "tip_search_cancel": "Haga clic (o pulse Esc en el registro) para detener la búsqueda; se conservan los resultados ya mostrados",
+        "tip_search_index": "Índice de búsqueda: {} indexados, {} en memoria",
         "truncated_chars": "car.",
         "yes": "Sí",
         "no":  "No",
         "ok":  "OK",
+        "goto_time_title":   "Ir a la hora",
+        "goto_time_prompt":  "Hora (HH:MM[:SS[.mmm]], fecha AAAA-MM-DD opcional):",
+        "goto_time_invalid": "Hora no reconocida",
+        "time_window_title": "Ventana de tiempo",
+        "time_window_last": "Últimos minutos:",
+        "time_window_from": "Desde:",
+        "time_window_to": "Hasta (opcional):",
+        "time_window_clear": "Borrar",
+        "scope_time_window": "Ventana de tiempo",
+        "tip_time_window": "Clic derecho (Ctrl + K): cargar una ventana de tiempo",
+        "tip_time_window_clear": "Volver a las últimas 1.000 líneas",
+        "perf_overlay_title": "Estadísticas de rendimiento",
+        "perf_export": "Exportar JSON",
+        "perf_reset": "Restablecer",
+        "perf_close": "Cerrar",
+        "tl_rate": "≈ {} líneas/s",
+        "tl_heatmap_on": "Clic derecho: mapa de densidad",
+        "tl_heatmap_off": "Clic derecho: colores por nivel",
         "exclude":                "Excluir",
         "exclude_confirm_title":  "Confirmar exclusión",
         "exclude_confirm_msg":    "Excluir todos los mensajes que contengan:\n\n\"{}\"",
@@ -503,7 +572,7 @@ LANGS = {
         "tip_filter_error": "Mostrar errores",
         "tip_filter_debug": "Mostrar mensajes de depuración",
         "tip_lang": "Elegir el idioma de la interfaz",
-        "tip_search_bar": "Buscar una palabra clave en los logs",
+        "tip_search_bar": "Buscar una palabra clave en los logs\nAvanzado: level:error  component:curl  time:10:00..10:30  re:/regex/  OR  NOT  ( )",
         "tip_history_clear": "Eliminar todo el historial de búsqueda",
         "tip_history_manage": "Historial de búsqueda - clic para gestionar",
         "tip_history_empty":  "Sin historial de búsqueda",
@@ -523,10 +592,13 @@ LANGS = {
             "Ctrl + S : Exportar LOG\n"
             "Ctrl + P : Subir LOG\n"
             "Ctrl + F : Buscar palabra clave\n"
+            "Ctrl + J : Ir a la hora\n"
             "Ctrl + N : Abrir exclusiones\n"
+            "Ctrl + I : Estadísticas de rendimiento\n"
             "Ctrl + G : Limpiar pantalla de la consola\n"
             "Ctrl + L : Ajuste de línea automático\n"
             "Ctrl + T : Modo ilimitado (∞) / 1000 líneas\n"
+            "Ctrl + K : Ventana de tiempo (últimos minutos / desde – hasta)\n"
             "Ctrl + A : Seleccionar todo\n"
             "M : Abrir el menú contextual en el LOG\n"
             "S : Mostrar resumen del sistema\n"
@@ -622,10 +694,31 @@ LANGS = {
         "tip_github": "Die GitHub-Seite öffnen",
         "tip_reset": "Filter und Anzeige zurücksetzen",
         "tip_duration": "Zeitspanne des Protokolls (vom ersten bis zum letzten Ereignis)",
+        "search_progress": "🔍 Suche… {}%",
+        "tip_search_cancel": "Klicken (oder Esc im Protokoll) um die Suche zu stoppen; bereits angezeigte Ergebnisse bleiben erhalten",
+        "tip_search_index": "Suchindex: {} indiziert, {} im Speicher",
         "truncated_chars": "Zeichen",
         "yes": "Ja",
         "no":  "Nein",
         "ok":  "OK",
+        "goto_time_title":   "Gehe zu Uhrzeit",
+        "goto_time_prompt":  "Uhrzeit (HH:MM[:SS[.mmm]], Datum JJJJ-MM-TT optional):",
+        "goto_time_invalid": "Unbekannte Uhrzeit",
+        "time_window_title": "Zeitfenster",
+        "time_window_last": "Letzte Minuten:",
+        "time_window_from": "Von:",
+        "time_window_to": "Bis (optional):",
+        "time_window_clear": "Löschen",
+        "scope_time_window": "Zeitfenster",
+        "tip_time_window": "Rechtsklick (Ctrl + K): Zeitfenster laden",
+        "tip_time_window_clear": "Zurück zu den letzten 1.000 Zeilen",
+        "perf_overlay_title": "Leistungsstatistik",
+        "perf_export": "JSON exportieren",
+        "perf_reset": "Zurücksetzen",
+        "perf_close": "Schließen",
+        "tl_rate": "≈ {} Zeilen/s",
+        "tl_heatmap_on": "Rechtsklick: Dichte-Heatmap",
+        "tl_heatmap_off": "Rechtsklick: Farben nach Level",
         "exclude":                "Ausschließen",
         "exclude_confirm_title":  "Ausschluss bestätigen",
         "exclude_confirm_msg":    "Alle Meldungen ausschließen, die enthalten:\n\n\"{}\"",
@@ -677,7 +770,7 @@ LANGS = {
         "tip_filter_error": "Fehler anzeigen",
         "tip_filter_debug": "Debug-Meldungen anzeigen",
         "tip_lang": "Sprache de Benutzeroberfläche wählen",
-        "tip_search_bar": "Nach einem Stichwort in den Logs suchen",
+        "tip_search_bar": "Nach einem Stichwort in den Logs suchen\nErweitert: level:error  component:curl  time:10:00..10:30  re:/regex/  OR  NOT  ( )",
         "tip_history_clear": "Gesamten Suchverlauf löschen",
         "tip_history_manage": "Suchverlauf - klicken zum Verwalten",
         "tip_history_empty":  "Kein Suchverlauf vorhanden",
@@ -697,10 +790,13 @@ LANGS = {
             "Ctrl + S : LOG exportieren\n"
             "Ctrl + P : LOG hochladen\n"
             "Ctrl + F : Stichwort suchen\n"
+            "Ctrl + J : Gehe zu Uhrzeit\n"
             "Ctrl + N : Ausschlüsse öffnen\n"
+            "Ctrl + I : Leistungsstatistik\n"
             "Ctrl + G : Konsolenanzeige leeren\n"
             "Ctrl + L : Automatischer Zeilenumbruch\n"
             "Ctrl + T : Unbegrenzter Modus (∞) / 1000 Zeilen\n"
+            "Ctrl + K : Zeitfenster (letzte Minuten / von – bis)\n"
             "Ctrl + A : Alles auswählen\n"
             "M : Kontextmenü im LOG öffnen\n"
             "S : Systemübersicht anzeigen\n"
@@ -796,10 +892,31 @@ LANGS = {
         "tip_github": "Apri la pagina GitHub",
         "tip_reset": "Ripristina filtri e visualizzazione",
         "tip_duration": "Intervallo di tempo coperto dal registro (dal primo all'ultimo evento)",
+        "search_progress": "🔍 Ricerca… {}%",
+        "tip_search_cancel": "Fare clic (o premere Esc nel registro) per interrompere la ricerca; i risultati già mostrati vengono mantenuti",
+        "tip_search_index": "Indice di ricerca: {} indicizzati, {} in memoria",
         "truncated_chars": "car.",
         "yes": "Sì",
         "no":  "No",
         "ok":  "OK",
+        "goto_time_title":   "Vai all'ora",
+        "goto_time_prompt":  "Ora (HH:MM[:SS[.mmm]], data AAAA-MM-GG facoltativa):",
+        "goto_time_invalid": "Ora non riconosciuta",
+        "time_window_title": "Finestra temporale",
+        "time_window_last": "Ultimi minuti:",
+        "time_window_from": "Da:",
+        "time_window_to": "A (facoltativo):",
+        "time_window_clear": "Cancella",
+        "scope_time_window": "Finestra temporale",
+        "tip_time_window": "Clic destro (Ctrl + K): carica una finestra temporale",
+        "tip_time_window_clear": "Torna alle ultime 1.000 righe",
+        "perf_overlay_title": "Statistiche sulle prestazioni",
+        "perf_export": "Esporta JSON",
+        "perf_reset": "Reimposta",
+        "perf_close": "Chiudi",
+        "tl_rate": "≈ {} righe/s",
+        "tl_heatmap_on": "Clic destro: mappa di densità",
+        "tl_heatmap_off": "Clic destro: colori per livello",
         "exclude":                "Escludi",
         "exclude_confirm_title":  "Conferma esclusione",
         "exclude_confirm_msg":    "Escludere tutti i messaggi contenenti:\n\n\"{}\"",
@@ -851,7 +968,7 @@ LANGS = {
         "tip_filter_error": "Mostra errori",
         "tip_filter_debug": "Mostra messaggi di debug",
         "tip_lang": "Scegli la lingua dell'interfaccia",
-        "tip_search_bar": "Cerca una parola chiave nei log",
+        "tip_search_bar": "Cerca una parola chiave nei log\nAvanzato: level:error  component:curl  time:10:00..10:30  re:/regex/  OR  NOT  ( )",
         "tip_history_clear": "Cancella tutta la cronologia delle ricerche",
         "tip_history_manage": "Cronologia ricerche - clic per gestire",
         "tip_history_empty":  "Nessuna cronologia di ricerca",
@@ -871,10 +988,13 @@ LANGS = {
             "Ctrl + S : Esporta LOG\n"
             "Ctrl + P : Carica LOG\n"
             "Ctrl + F : Cerca parola chiave\n"
+            "Ctrl + J : Vai all'ora\n"
             "Ctrl + N : Apri esclusioni\n"
+            "Ctrl + I : Statistiche sulle prestazioni\n"
             "Ctrl + G : Pulisci visualizzazione console\n"
             "Ctrl + L : A capo automatico\n"
             "Ctrl + T : Modalità illimitata (∞) / 1000 righe\n"
+            "Ctrl + K : Finestra temporale (ultimi minuti / da – a)\n"
             "Ctrl + A : Seleziona tutto\n"
             "M : Apri il menu contestuale nel LOG\n"
             "S : Mostra riepilogo sistema\n"
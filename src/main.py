@@ -2,25 +2,44 @@
 Main entry point for the Kodi Log Monitor application.
 Handles high-DPI scaling, Windows-specific dark mode styling,
 and application initialization with CustomTkinter.
+
+With --headless, runs the command-line tail/filter mode (headless.py)
+instead, before any Tkinter / CustomTkinter import.
 """
 
 __author__ = "Nanomani"
 
 import sys
 import os
-import tkinter as tk
-import customtkinter as ctk
-
-from utils import check_single_instance
-from ui.app import KodiLogMonitor
-from config import ENABLE_SINGLE_INSTANCE, APP_THEME
+import multiprocessing
 
-# --- CustomTkinter global appearance ---
-# Sync CTK appearance mode with the saved app color theme
-ctk.set_appearance_mode("light" if APP_THEME == "light" else "dark")
-ctk.set_default_color_theme("dark-blue")
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    from headless import main as headless_main
+    sys.exit(headless_main([arg for arg in sys.argv[1:] if arg != "--headless"]))
 
 if __name__ == "__main__":
+    # Required by the full-file search process pool in frozen (PyInstaller)
+    # builds: worker processes re-run the executable and must stop here.
+    multiprocessing.freeze_support()
+
+    # The GUI imports stay under the __main__ guard: the search workers
+    # (spawn / forkserver) import this module as __mp_main__ and must not
+    # load Tkinter or build the UI.
+    import tkinter as tk
+    import customtkinter as ctk
+
+    from utils import check_single_instance
+    from ui.app import KodiLogMonitor
+    from config import ENABLE_SINGLE_INSTANCE, APP_THEME, init_user_files
+
+    # Colors file and keyword folder (headless runs never create them).
+    init_user_files()
+
+    # --- CustomTkinter global appearance ---
+    # Sync CTK appearance mode with the saved app color theme
+    ctk.set_appearance_mode("light" if APP_THEME == "light" else "dark")
+    ctk.set_default_color_theme("dark-blue")
+
     check_single_instance()
 
     # 1. Handle DPI Awareness before creating the UI
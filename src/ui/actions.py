@@ -3,6 +3,8 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
 import threading
+import json
+import time
 import webbrowser
 import os
 import sys
@@ -13,9 +15,17 @@ from config import *
 from config import APP_THEME
 from languages import LANGS, LANG_NAMES, LANG_CODES
 from utils import get_system_font, parse_version
+from engine import perf
+from engine.matcher import get_matcher
+from engine.query import QueryError, get_query, is_query_syntax
+from engine.timestamps import last_timestamp, parse_time_input, shift_timestamp
 from ui.ui_builder import ToolTip, _patch_combo_hover_text
 
 
+# Refresh interval of the performance statistics overlay (ms).
+_PERF_REFRESH_MS = 1000
+
+
 class ActionsMixin:
     """Manages all user interactions (buttons, menus, shortcuts)."""
 
@@ -41,7 +51,9 @@ class ActionsMixin:
         if save_path:
             try:
                 with open(save_path, "w", encoding="utf-8") as f:
-                    f.write(self._strip_pad(self.txt_area.get("1.0", tk.END)))
+                    # A virtual view only holds a window in the widget.
+                    text = self.virt_text() if self.virt_active() else self.txt_area.get("1.0", tk.END)
+                    f.write(self._strip_pad(text))
             except IOError as e:
                 print(f"Error exporting log: {e}")
 
@@ -502,6 +514,8 @@ class ActionsMixin:
         except Exception as e:
             print(f"[EXCLUDE] Failed to load {EXCLUDE_LIST_FILE}: {e}")
         self.exclude_patterns = patterns[:EXCLUDE_LIST_MAX_SIZE]
+        # Compile the matcher now rather than on the first filtered line.
+        get_matcher(tuple(self.exclude_patterns))
         self.update_exclude_button()
 
     def save_exclude_patterns(self, patterns):
@@ -514,6 +528,7 @@ class ActionsMixin:
                 for p in patterns:
                     f.write(p + "\n")
             self.exclude_patterns = [p.lower() for p in patterns]
+            get_matcher(tuple(self.exclude_patterns))
         except Exception as e:
             print(f"[EXCLUDE] Failed to save {EXCLUDE_LIST_FILE}: {e}")
 
@@ -1249,6 +1264,115 @@ class ActionsMixin:
         self.update_debug_indicator()
         return "break"
 
+    # ------------------------------------------------------------------
+    # Performance statistics overlay — Ctrl+I, or click on 🐞
+    # ------------------------------------------------------------------
+
+    def show_perf_overlay(self, event=None):
+        """
+        Opens (or closes, when already open) the live statistics overlay:
+        the engine.perf counters refreshed every second, with the tail
+        dispatcher state, plus Export (JSON for bug reports) and Reset.
+        Non-modal, so the log keeps scrolling underneath.
+        """
+        overlay = getattr(self, "_perf_overlay", None)
+        if overlay is not None and overlay.winfo_exists():
+            overlay.destroy()
+            return "break"
+        l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
+
+        dlg = ctk.CTkToplevel(self.root)
+        dlg.title(l_ui.get("perf_overlay_title", "Performance statistics"))
+        dlg.configure(fg_color=COLOR_BG_DIALOG)
+        dlg.transient(self.root)
+        dlg.resizable(False, False)
+        self._perf_overlay = dlg
+
+        stats_label = tk.Label(
+            dlg,
+            text="",
+            bg=COLOR_BG_MAIN,
+            fg=COLOR_TEXT_MAIN,
+            font=(self._mono_font, 11),
+            justify="left",
+            anchor="w",
+            padx=10,
+            pady=8,
+        )
+        stats_label.pack(padx=16, pady=(16, 10), fill="x")
+
+        def _refresh():
+            if not dlg.winfo_exists():
+                return
+            lines = perf.summary_lines()
+            dispatcher = getattr(self, "tail_dispatcher", None)
+            if dispatcher is not None:
+                s = dispatcher.stats()
+                lines.append("")
+                lines.append(f"tail batch {s['batch_size']:>6}   backlog {s['backlog']:>6}"
+                             f"   max drain {s['max_drain_ms']:>8.2f} ms")
+            stats_label.configure(text="\n".join(lines))
+            dlg.after(_PERF_REFRESH_MS, _refresh)
+
+        def _export():
+            path = filedialog.asksaveasfilename(
+                parent=dlg,
+                defaultextension=".json",
+                initialfile=PERF_EXPORT_FILE,
+                filetypes=[("JSON", "*.json"), ("All files", "*.*")],
+            )
+            if path:
+                try:
+                    with open(path, "w", encoding="utf-8") as f:
+                        json.dump(self.perf_report(), f, indent=2)
+                except Exception as e:
+                    print(f"[ERROR] {type(e).__name__}: {e}")
+
+        btn_frame = tk.Frame(dlg, bg=COLOR_BG_DIALOG)
+        btn_frame.pack(padx=16, pady=(0, 16))
+        for text, command in (
+            (l_ui.get("perf_export", "Export JSON"), _export),
+            (l_ui.get("perf_reset", "Reset"), perf.reset),
+            (l_ui.get("perf_close", "Close"), dlg.destroy),
+        ):
+            ctk.CTkButton(
+                btn_frame,
+                text=text,
+                width=110,
+                fg_color=COLOR_BTN_DEFAULT,
+                hover_color=COLOR_BTN_ACTIVE,
+                text_color=COLOR_TEXT_BRIGHT,
+                font=(self._main_font, 13),
+                command=command,
+            ).pack(side="left", padx=5)
+
+        dlg.bind("<Escape>", lambda e: dlg.destroy())
+        _refresh()
+        self._center_dialog(dlg, 720)
+        dlg.lift()
+        return "break"
+
+    def perf_report(self):
+        """Everything the statistics overlay exports, as a JSON-ready dict."""
+        report = {
+            "app": f"{APP_NAME} {APP_VERSION}",
+            "platform": sys.platform,
+            "python": sys.version.split()[0],
+            "exported": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "log_size": None,
+            "perf": perf.snapshot(),
+        }
+        try:
+            if self.log_file_path:
+                report["log_size"] = os.path.getsize(self.log_file_path)
+        except OSError:
+            pass
+        for name in ("tail_dispatcher", "trigram_index"):
+            component = getattr(self, name, None)
+            if component is not None:
+                report[name] = component.stats()
+        return report
+
     def update_debug_indicator(self):
         """
         Shows or hides the 🐞 debug indicator in the footer.
@@ -1408,6 +1532,109 @@ class ActionsMixin:
 
         return confirmed[0]
 
+    def show_goto_time_dialog(self, event=None):
+        """
+        Ctrl+J: asks for a time and scrolls to the first line of the view
+        stamped at or after it (binary search, see time_row_at_or_after).
+        Without a date, the date of the first visible line is used.
+        """
+        if not self.check_log_loaded():
+            return "break"
+        l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
+
+        dlg = ctk.CTkToplevel(self.root)
+        dlg.title(l_ui.get("goto_time_title", "Go to time"))
+        dlg.configure(fg_color=COLOR_BG_DIALOG)
+        dlg.transient(self.root)
+        dlg.resizable(False, False)
+
+        ctk.CTkLabel(
+            dlg,
+            text=l_ui.get("goto_time_prompt", "Time (HH:MM[:SS[.mmm]], optional YYYY-MM-DD date):"),
+            font=(self._main_font, 13),
+            text_color=COLOR_TEXT_MAIN,
+            wraplength=320,
+            justify="center",
+        ).pack(padx=24, pady=(24, 10))
+
+        entry = tk.Entry(
+            dlg,
+            bg=COLOR_BG_MAIN,
+            fg=COLOR_TEXT_BRIGHT,
+            borderwidth=0,
+            width=26,
+            insertbackground=COLOR_TEXT_BRIGHT,
+            font=(self._main_font, 12),
+            relief="flat",
+            justify="center",
+            highlightthickness=1,
+            highlightbackground=COLOR_BG_MAIN,
+            highlightcolor=COLOR_ACCENT,
+        )
+        entry.pack(padx=24, pady=(0, 6))
+
+        error_label = ctk.CTkLabel(
+            dlg, text="", font=(self._main_font, 12), text_color=COLOR_DANGER,
+        )
+        error_label.pack(padx=24, pady=(0, 6))
+
+        def _go(e=None):
+            target = parse_time_input(entry.get(), self._view_day())
+            row = self.time_row_at_or_after(target) if target else None
+            if row is None:
+                error_label.configure(text=l_ui.get("goto_time_invalid", "Unrecognized time"))
+                return "break"
+            dlg.destroy()
+            # Keep the live tail from scrolling away from the target line.
+            self.is_paused.set(True)
+            if hasattr(self, "update_button_colors"):
+                self.update_button_colors()
+            self.highlight_row(row)
+            return "break"
+
+        btn_frame = tk.Frame(dlg, bg=COLOR_BG_DIALOG)
+        btn_frame.pack(padx=24, pady=(0, self.sc(48)))
+
+        ctk.CTkButton(
+            btn_frame,
+            text=l_ui.get("ok", "OK"),
+            width=90,
+            fg_color=COLOR_BTN_ACTIVE,
+            hover_color=COLOR_BTN_ACTIVE,
+            text_color=COLOR_TEXT_BRIGHT,
+            font=(self._main_font, 13),
+            command=_go,
+        ).pack(side="left")
+
+        dlg.bind("<Return>",   _go)
+        dlg.bind("<KP_Enter>", _go)
+        dlg.bind("<Escape>",   lambda e: dlg.destroy())
+
+        self._center_dialog(dlg, 380)
+        dlg.lift()
+        dlg.attributes("-topmost", True)
+        dlg.after(150, lambda: dlg.attributes("-topmost", False))
+        dlg.grab_set()
+        entry.focus_set()
+        self.root.wait_window(dlg)
+        return "break"
+
+    def _view_day(self):
+        """Date ("YYYY-MM-DD") of the first timestamped line from the top of the viewport."""
+        count, stamp_at, _ = self.view_rows()
+        row = int(self.txt_area.index("@0,0").split(".")[0]) - 1
+        if self.virt_active():
+            row += self._virt_start
+        for i in range(row, count):
+            stamp = stamp_at(i)
+            if stamp:
+                return stamp[:10]
+        for i in range(min(row, count) - 1, -1, -1):
+            stamp = stamp_at(i)
+            if stamp:
+                return stamp[:10]
+        return ""
+
     def _reset_update_notifications_dialog(self, event=None):
         """
         Asks the user to confirm resetting update notification options to
@@ -1574,6 +1801,7 @@ class ActionsMixin:
         """
         new_mode = tk.WORD if self.wrap_mode.get() else tk.NONE
         self.txt_area.config(wrap=new_mode)
+        self._update_line_tabs()
 
         # Immediately sync button color and tooltip to new state
         self.update_button_colors()
@@ -1647,29 +1875,20 @@ class ActionsMixin:
 
             def _focus_line():
                 try:
-                    # Prefer timestamp-based search (millisecond precision → near-unique)
-                    # then validate the full line content, exactly like
-                    # find_and_highlight_timestamp does.  Fall back to plain content
-                    # search for lines that carry no timestamp.
+                    # Prefer timestamp-based search (millisecond precision → near-unique,
+                    # binary search over the view) then validate the full line content,
+                    # exactly like find_and_highlight_timestamp does.  Fall back to plain
+                    # content search for lines that carry no timestamp.
                     ts_match = re.search(
                         r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}", search_text
                     )
                     pos = None
                     if ts_match:
-                        ts = ts_match.group(0)
-                        scan = "1.0"
-                        while True:
-                            idx = self.txt_area.search(ts, scan, stopindex=tk.END, exact=True)
-                            if not idx:
-                                break
-                            line_txt = self.txt_area.get(
-                                idx + " linestart", idx + " lineend"
-                            ).strip()
-                            if search_text in line_txt:
-                                pos = idx
-                                break
-                            scan = self.txt_area.index(idx + " lineend")
+                        row = self.find_time_row(ts_match.group(0), search_text)
+                        if row is not None:
+                            pos = self.log_see_row(row)
                     if pos is None:
+                        self.virt_reveal(search_text)
                         pos = self.txt_area.search(
                             search_text, "1.0", stopindex=tk.END, exact=True
                         )
@@ -1717,6 +1936,11 @@ class ActionsMixin:
         if not self.check_log_loaded() or not self.check_log_available():
             return
 
+        # In a time window, the button leaves it (back to the last 1000 lines).
+        if self.time_window and not self.load_full_file.get():
+            self.set_time_window(None)
+            return
+
         # Compute what the new value would be after toggling
         new_value = not self.load_full_file.get()
 
@@ -1834,12 +2058,7 @@ class ActionsMixin:
 
         # Update the button text (Limit / Unlimited)
         l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        new_text = (
-            l_ui.get("unlimited", "⚠️ Unlimited")
-            if new_value
-            else l_ui.get("limit", "ℹ️ 1000 lines max")
-        )
-        self.limit_var.set(new_text)
+        self.limit_var.set(self.limit_text(l_ui))
 
         # 4. Execute the heavy task (reload file)
         self.root.update_idletasks()
@@ -1849,6 +2068,152 @@ class ActionsMixin:
 
         self.save_session()
 
+    def set_time_window(self, window):
+        """
+        Loads only the lines of *window*, a (start, end or None) pair of
+        timestamps, instead of the last 1000 lines; None goes back to the
+        last 1000 lines.  Full-file mode is left, and the log reloaded.
+        """
+        self.time_window = window
+        self.load_full_file.set(False)
+        self.update_button_colors()
+        l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
+        self.limit_var.set(self.limit_text(l_ui))
+        self.root.update_idletasks()
+        if self.log_file_path:
+            self.start_monitoring(self.log_file_path, save=False, retranslate=False)
+
+    def show_time_window_dialog(self, event=None):
+        """
+        Ctrl+K / right-click on the limit button: asks for a time window,
+        either the last N minutes of the log or a From / To range (To
+        optional, times as in Go to time, on the day of the last line when
+        no date is given).  The window is located by binary search over the
+        file (engine/timestamps.py), so only its lines are read.
+        """
+        if not self.check_log_loaded() or not self.check_log_available():
+            return "break"
+        l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
+
+        dlg = ctk.CTkToplevel(self.root)
+        dlg.title(l_ui.get("time_window_title", "Time window"))
+        dlg.configure(fg_color=COLOR_BG_DIALOG)
+        dlg.transient(self.root)
+        dlg.resizable(False, False)
+
+        form = tk.Frame(dlg, bg=COLOR_BG_DIALOG)
+        form.pack(padx=24, pady=(24, 6))
+
+        def _field(row, key, default):
+            ctk.CTkLabel(
+                form,
+                text=l_ui.get(key, default),
+                font=(self._main_font, 13),
+                text_color=COLOR_TEXT_MAIN,
+            ).grid(row=row, column=0, sticky="e", padx=(0, 10), pady=4)
+            entry = tk.Entry(
+                form,
+                bg=COLOR_BG_MAIN,
+                fg=COLOR_TEXT_BRIGHT,
+                borderwidth=0,
+                width=24,
+                insertbackground=COLOR_TEXT_BRIGHT,
+                font=(self._main_font, 12),
+                relief="flat",
+                highlightthickness=1,
+                highlightbackground=COLOR_BG_MAIN,
+                highlightcolor=COLOR_ACCENT,
+            )
+            entry.grid(row=row, column=1, sticky="w", pady=4)
+            return entry
+
+        entry_last = _field(0, "time_window_last", "Last minutes:")
+        entry_from = _field(1, "time_window_from", "From:")
+        entry_to   = _field(2, "time_window_to", "To (optional):")
+        if self.time_window:
+            entry_from.insert(0, self.time_window[0])
+            if self.time_window[1]:
+                entry_to.insert(0, self.time_window[1])
+
+        error_label = ctk.CTkLabel(
+            dlg, text="", font=(self._main_font, 12), text_color=COLOR_DANGER,
+        )
+        error_label.pack(padx=24, pady=(0, 6))
+
+        def _window():
+            """(start, end) from the fields, or None when they are invalid."""
+            last = last_timestamp(self.log_file_path)
+            if last is None:
+                return None
+            minutes = entry_last.get().strip()
+            if minutes:
+                if not minutes.isdigit() or int(minutes) <= 0:
+                    return None
+                return shift_timestamp(last, -int(minutes)), None
+            day = last[:10]
+            start = parse_time_input(entry_from.get(), day)
+            end_text = entry_to.get().strip()
+            end = parse_time_input(end_text, day, end=True) if end_text else None
+            if start is None or (end_text and (end is None or end < start)):
+                return None
+            return start, end
+
+        def _apply(e=None):
+            try:
+                window = _window()
+            except (OSError, ValueError) as err:
+                print(f"[ERROR] {type(err).__name__}: {err}")
+                window = None
+            if window is None:
+                error_label.configure(text=l_ui.get("goto_time_invalid", "Unrecognized time"))
+                return "break"
+            dlg.destroy()
+            self.set_time_window(window)
+            return "break"
+
+        def _clear():
+            dlg.destroy()
+            if self.time_window:
+                self.set_time_window(None)
+
+        btn_frame = tk.Frame(dlg, bg=COLOR_BG_DIALOG)
+        btn_frame.pack(padx=24, pady=(0, self.sc(48)))
+
+        ctk.CTkButton(
+            btn_frame,
+            text=l_ui.get("ok", "OK"),
+            width=90,
+            fg_color=COLOR_BTN_ACTIVE,
+            hover_color=COLOR_BTN_ACTIVE,
+            text_color=COLOR_TEXT_BRIGHT,
+            font=(self._main_font, 13),
+            command=_apply,
+        ).pack(side="left", padx=(0, 10))
+
+        ctk.CTkButton(
+            btn_frame,
+            text=l_ui.get("time_window_clear", "Clear"),
+            width=90,
+            fg_color=COLOR_BTN_DEFAULT,
+            hover_color=COLOR_BTN_ACTIVE,
+            text_color=COLOR_TEXT_BRIGHT,
+            font=(self._main_font, 13),
+            command=_clear,
+        ).pack(side="left")
+
+        dlg.bind("<Return>",   _apply)
+        dlg.bind("<KP_Enter>", _apply)
+        dlg.bind("<Escape>",   lambda e: dlg.destroy())
+
+        self._center_dialog(dlg, 400)
+        dlg.lift()
+        dlg.attributes("-topmost", True)
+        dlg.after(150, lambda: dlg.attributes("-topmost", False))
+        dlg.grab_set()
+        entry_last.focus_set()
+        self.root.wait_window(dlg)
+        return "break"
+
     def toggle_pause_scroll(self):
         if not self.check_log_loaded():
             return
@@ -2382,12 +2747,10 @@ class ActionsMixin:
             self.cde_limit.configure(
                 fg_color=LOG_COLORS["warning"] if _active else COLOR_BTN_DEFAULT,
                 text_color=COLOR_TEXT_ON_ACCENT if _active else COLOR_TEXT_BRIGHT,
-                text="♾" if _active else "🛡️",
+                text="♾" if _active else ("🕒" if self.time_window else "🛡️"),
             )
             if hasattr(self, "btn_limit_tooltip") and self.btn_limit_tooltip:
-                self.btn_limit_tooltip.text = l.get(
-                    "tip_limit_on" if _active else "tip_limit_off", ""
-                )
+                self.btn_limit_tooltip.text = self.limit_tooltip_text(l)
 
         if hasattr(self, "cde_wrap"):
             _active = self.wrap_mode.get()
@@ -2521,8 +2884,10 @@ class ActionsMixin:
             self.btn_clear_tooltip.text = l["tip_clear"]
         if hasattr(self, "label_duration_tooltip") and self.label_duration_tooltip:
             self.label_duration_tooltip.text = l.get("tip_duration", "")
+        if hasattr(self, "label_search_tooltip") and self.label_search_tooltip:
+            self.label_search_tooltip.text = l.get("tip_search_cancel", "")
         if hasattr(self, "btn_limit_tooltip") and self.btn_limit_tooltip:
-            self.btn_limit_tooltip.text = l["tip_limit_on" if not self.load_full_file.get() else "tip_limit_off"]
+            self.btn_limit_tooltip.text = self.limit_tooltip_text(l)
         if hasattr(self, "btn_wrap_tooltip") and self.btn_wrap_tooltip:
             self.btn_wrap_tooltip.text = l["tip_wrap_on" if self.wrap_mode.get() else "tip_wrap_off"]
         if hasattr(self, "btn_pause_tooltip") and self.btn_pause_tooltip:
@@ -2598,7 +2963,7 @@ class ActionsMixin:
             self.wrap_var.set("")
 
         if not self.load_full_file.get():
-            self.limit_var.set(l["limit"])
+            self.limit_var.set(self.limit_text(l))
         else:
             self.limit_var.set("")
 
@@ -2651,6 +3016,7 @@ class ActionsMixin:
             return
 
         query = self.search_query.get()
+        self._update_search_entry_style(query)
 
         if query:
             self.btn_clear_search.place(relx=0.5, rely=0.5, anchor="center")
@@ -2666,6 +3032,7 @@ class ActionsMixin:
 
             # Empty query: bypass the sorting search worker and restore natural order.
             self._cancel_pending_search()
+            self.full_search.clear()    # Nothing left to refine
             self.refresh_natural_order()
             return
 
@@ -2675,6 +3042,22 @@ class ActionsMixin:
             self.root.after_cancel(self._search_after_id)
         self._search_after_id = self.root.after(250, self._fire_search)
 
+    def _update_search_entry_style(self, text):
+        """
+        Colors the search text: accent when it is read as a query
+        (engine/query.py), danger when that query has a syntax error (it is
+        then searched as plain text), normal otherwise.
+        """
+        color = COLOR_TEXT_BRIGHT
+        if is_query_syntax(text):
+            try:
+                get_query(text.strip())
+                color = COLOR_ACCENT
+            except QueryError:
+                color = COLOR_DANGER
+        if self.search_entry.cget("fg") != color:
+            self.search_entry.configure(fg=color)
+
     def _fire_search(self):
         """
         Called 250 ms after the last keystroke (debounce).
@@ -2689,12 +3072,8 @@ class ActionsMixin:
 
         # --- Capture Tkinter state HERE (main thread only) ---
         # Background threads must not call .get() on Tkinter variables.
-        query_lower      = self.search_query.get().strip().lower()
-        filter_all       = self.filter_vars["all"].get()
-        active_tags      = {k for k, v in self.filter_vars.items()
-                            if k != "all" and v.get()}
-        load_full        = self.load_full_file.get()
-        keywords_lower   = [k.lower() for k in self.get_keywords_from_file()]
+        snapshot  = self.build_filter_snapshot()
+        load_full = self.load_full_file.get()
 
         # Increment version: any worker still running for the previous query
         # will see the mismatch and stop early.
@@ -2705,92 +3084,44 @@ class ActionsMixin:
 
         threading.Thread(
             target=self._search_worker,
-            args=(version, query_lower, filter_all, active_tags,
-                  load_full, keywords_lower),
+            args=(version, snapshot, load_full),
             daemon=True,
         ).start()
 
-    def _search_worker(self, version, query_lower, filter_all,
-                       active_tags, load_full, keywords_lower):
+    def _search_worker(self, version, snapshot, load_full):
         """
-        Background thread: reads the log file and filters lines using only
-        plain Python values (no Tkinter calls - not thread-safe).
+        Background thread: filters the lines in scope with the shared
+        classifier, using only the snapshot captured on the main thread
+        (no Tkinter calls - not thread-safe).  In full-file mode the file is
+        scanned as raw bytes, in parallel on large files, and a query that
+        extends the previous one only re-filters its results
+        (engine/search.py); its results are streamed to the view chunk by
+        chunk (_stream_search_rows) instead of being applied at the end.
 
         Aborts early whenever _search_version no longer matches, meaning
         the user typed another character and a newer search has taken over.
         """
-        _ts_re = re.compile(r"^\d{4}-\d{2}-\d{2}")
         try:
             if not self.log_file_path or not self.running:
                 return
 
-            with open(self.log_file_path, "r", encoding="utf-8",
-                      errors="ignore") as f:
-                if load_full:
-                    lines = f.readlines()
-                else:
-                    f.seek(0, os.SEEK_END)
-                    f.seek(max(0, f.tell() - 200_000))
-                    lines = f.readlines()[-1000:]
-
-            if version != self._search_version:
-                return
-
-            to_display = []
-            last_parent_visible = False
-
-            for line in lines:
-                if version != self._search_version:
+            should_stop = lambda: version != self._search_version
+            if load_full and (snapshot.query or snapshot.expr):
+                def on_chunk(rows, done, total):
+                    if self.running:
+                        self.root.after(0, self._stream_search_rows,
+                                        rows, done, total, version)
+                if self.full_search.run(self.log_file_path, snapshot, should_stop,
+                                        on_chunk=on_chunk, index=self.trigram_index) is None:
                     return  # Newer search started - discard current work
+                if self.running:
+                    self.root.after(0, self._finish_search_stream, version)
+                return
 
-                stripped = line.strip()
-                if not stripped or "info <general>: --------" in line:
-                    last_parent_visible = False
-                    continue
-
-                low = line.lower()
-
-                # Exclusion list check - safe to read from background thread.
-                if self.exclude_patterns and any(exc in low for exc in self.exclude_patterns):
-                    last_parent_visible = False
-                    continue
-
-                if not _ts_re.match(stripped):
-                    # Orphan continuation: inherit parent visibility.
-                    if last_parent_visible:
-                        to_display.append((line, None))
-                    continue
-
-                # Determine log level (mirrors get_line_data)
-                if " error " in low or " critical " in low:
-                    current_tag = "error"
-                elif " warning " in low:
-                    current_tag = "warning"
-                elif " info " in low:
-                    current_tag = "info"
-                elif " debug " in low:
-                    current_tag = "debug"
-                else:
-                    current_tag = None
-
-                # Level filter (mirrors is_filter_match)
-                if not filter_all:
-                    if current_tag is None or current_tag not in active_tags:
-                        last_parent_visible = False
-                        continue
-
-                # Text search filter
-                if query_lower and query_lower not in low:
-                    last_parent_visible = False
-                    continue
-
-                # Keyword-list filter
-                if keywords_lower and not any(k in low for k in keywords_lower):
-                    last_parent_visible = False
-                    continue
-
-                to_display.append((line, current_tag))
-                last_parent_visible = True
+            to_display = self.filter_window(snapshot, load_full, should_stop=should_stop,
+                                            numbered=True)
+            if to_display is None:
+                return  # Newer search started - discard current work
 
             if version != self._search_version:
                 return
@@ -2823,6 +3154,106 @@ class ActionsMixin:
         self.txt_area.delete("1.0", tk.END)
         self.bulk_insert(to_display)
 
+    # ── Streamed search results ─────────────────────────────────────────
+    # The chunks of a full-file search reach the main thread in file order
+    # (root.after callbacks run FIFO).  The first chunk with rows goes through
+    # bulk_insert(), the next ones through append_search_rows(); the footer
+    # shows the progress until the last chunk, or until the user cancels
+    # (click on the progress label, or Escape in the log).  A newer search or
+    # refresh bumps _search_version, which ends the stream implicitly.
+
+    def search_streaming(self):
+        """True while a streamed search is filling the view."""
+        return self._stream_version is not None and self._stream_version == self._search_version
+
+    def _start_search_stream(self, version):
+        """Replaces the current view with the (empty) result of search *version*."""
+        self._stream_version = version
+        self._stream_rows = []
+        self._stream_count = 0
+        self._stream_tail = []
+        self._search_progress = 0.0
+        # A pending jump may target any chunk: it runs once the stream ends.
+        self._stream_jump = self.pending_jump_timestamp
+        self.pending_jump_timestamp = None
+        self.txt_area.config(state=tk.NORMAL)
+        self.txt_area.delete("1.0", tk.END)
+        self.virt_reset()
+        if hasattr(self, "timeline_clear"):
+            self.timeline_clear()
+        self.show_loading(False)
+        self.update_stats()
+
+    def _stream_search_rows(self, rows, done, total, version):
+        """
+        Called on the main thread for each chunk of a streamed search:
+        renders its rows after the previous ones and updates the progress.
+        """
+        if version != self._search_version or not self.running:
+            return  # Superseded by a more recent search - ignore
+        if self._stream_version != version:
+            self._start_search_stream(version)
+
+        self._search_progress = min(1.0, done / total) if total else 1.0
+        self.label_search.configure(
+            text=LANGS.get(self.current_lang.get(), LANGS["EN"])["search_progress"].format(
+                int(self._search_progress * 100))
+        )
+        if not rows:
+            return
+        first = not self._stream_count
+        self._stream_count += len(rows)
+        if first:
+            self._stream_rows = list(rows)
+            self.bulk_insert(rows)
+        else:
+            self.append_search_rows(rows)
+        if self.virt_active():
+            # The row list of the virtual view holds the result from now on.
+            self._stream_rows = None
+
+    def _finish_search_stream(self, version):
+        """Called on the main thread once every chunk of search *version* is in."""
+        if version != self._search_version or not self.running:
+            return
+        if self._stream_version != version:
+            # Nothing to scan (empty file): the view still has to be replaced.
+            self._start_search_stream(version)
+        self._end_search_stream()
+
+    def cancel_search(self, event=None):
+        """
+        Stops the streamed search in progress, keeping the results already
+        displayed.  Bound to the footer progress label and to Escape in the
+        log; does nothing (and lets the event through) otherwise.
+        """
+        if not self.search_streaming():
+            return None
+        self._cancel_pending_search()
+        self.full_search.clear()    # The next query starts from a full scan
+        self._end_search_stream()
+        return "break"
+
+    def _end_search_stream(self):
+        """Leaves streaming mode: no-results screen, pending jump, held tail lines."""
+        self._stream_version = None
+        if not self.search_query.get().strip():
+            self.full_search.clear()
+        count, self._stream_count = self._stream_count, 0
+        self._stream_rows = []
+        tail, self._stream_tail = self._stream_tail, []
+        jump, self._stream_jump = self._stream_jump, None
+        if not count:
+            # The widget was cleared by _start_search_stream(): bulk_insert()
+            # shows the no-results screen.
+            self.bulk_insert([])
+        else:
+            if jump:
+                self.jump_to_timestamp(jump)
+            self.update_stats()
+        if tail:
+            self.append_batch_to_gui(tail)
+
     def clear_search(self):
         # Deactivate pause first so that on_search_change's refresh_natural_order
         # call already runs with pause=False and scrolls to end - avoids a
@@ -2846,8 +3277,8 @@ class ActionsMixin:
     @staticmethod
     def _strip_pad(text: str) -> str:
         """Strip trailing whitespace from each line.
-        Removes the fixed-width padding added by _pad_line() for the horizontal
-        scrollbar, so copied text does not contain hundreds of trailing spaces."""
+        Removes the tab appended by _pad_line() for the horizontal scrollbar,
+        so copied text does not carry it."""
         return "\n".join(line.rstrip() for line in text.splitlines())
 
     def copy_selection(self):
@@ -3148,12 +3579,12 @@ class ActionsMixin:
     def immediate_ui_refresh(self):
         """Immediately syncs the limit label with the current toggle state."""
         l = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        txt = l["unlimited"] if self.load_full_file.get() else l["limit"]
+        txt = self.limit_text(l)
         self.limit_var.set(txt)  # uses textvariable - no .config() needed
 
     def copy_to_clipboard(self, event=None):
         """Copies the currently selected text from the log area to the clipboard.
-        Trailing spaces added by _pad_line() are stripped before copying."""
+        The tab added by _pad_line() is stripped before copying."""
         try:
             selected_text = self.txt_area.get(tk.SEL_FIRST, tk.SEL_LAST)
             if selected_text:
@@ -14,6 +14,7 @@ from config import *
 from config import APP_THEME
 from languages import LANGS
 from utils import get_system_font, get_mono_font, get_emoji_font
+from engine.search import IncrementalSearch, shutdown_pool
 
 from ui.monitor import MonitorMixin
 from ui.log_display import LogDisplayMixin
@@ -21,9 +22,10 @@ from ui.session import SessionMixin
 from ui.actions import ActionsMixin
 from ui.ui_builder import UIBuilderMixin
 from ui.timeline import TimelineMixin
+from ui.virtual_view import VirtualViewMixin
 
 
-class KodiLogMonitor(UIBuilderMixin, TimelineMixin, ActionsMixin, SessionMixin, LogDisplayMixin, MonitorMixin):
+class KodiLogMonitor(UIBuilderMixin, TimelineMixin, VirtualViewMixin, ActionsMixin, SessionMixin, LogDisplayMixin, MonitorMixin):
     """
     Main class - assembles all modules via multiple inheritance.
     Converted to CustomTkinter (CTk root window).
@@ -83,6 +85,7 @@ class KodiLogMonitor(UIBuilderMixin, TimelineMixin, ActionsMixin, SessionMixin,
         self.log_file_path = ""
         self.paste_url = DEFAULT_PASTE_URL
         self.max_size_mb = DEFAULT_SECURITY_FILE_MAX_SIZE_STARTUP
+        self.display_max_lines = DEFAULT_DISPLAY_MAX_LINES   # Live-tail view cap (0 = none)
         self.updates_enabled = True
         self.skip_version = ""
         self.debug_mode = False           # Toggled by Ctrl+Shift+D; persisted in config
@@ -98,17 +101,32 @@ class KodiLogMonitor(UIBuilderMixin, TimelineMixin, ActionsMixin, SessionMixin,
             self._colors_file_mtime = None
         self.running = False
         self.monitor_thread = None
+        self.line_index = None   # engine.line_index.LineIndex of the active log
+        self.record_store = None # engine.record_store.RecordStore of the active log
+        self.trigram_index = None  # engine.trigram.TrigramIndex of the active log
+        self.file_watcher = None # engine.watcher watcher of the monitor thread
+        self.tail_dispatcher = None  # engine.dispatcher.TailDispatcher (tail -> UI hand-off)
+        self.full_search = IncrementalSearch()  # Full-file search, refined on type-ahead
         self.seen_lines = deque(maxlen=2000)
         self._seen_set = set()          # O(1) companion set for is_duplicate()
         self.pending_jump_timestamp = None
         self.log_lock = threading.Lock()
         self._search_version = 0        # Incremented on each new search to cancel stale workers
         self._search_after_id = None    # Pending debounce timer ID
+        self._stream_version = None     # Search version whose results are being streamed
+        self._stream_rows = []          # Rows streamed so far, until the view turns virtual
+        self._stream_count = 0          # Rows streamed so far by that search
+        self._stream_tail = []          # Live-tail lines held back until the stream ends
+        self._stream_jump = None        # Pending jump deferred to the end of the stream
+        self._search_progress = 0.0     # Fraction of the file scanned (footer progress)
         self._last_wrap_anchor = None   # Last explicitly-focused line index for wrap toggle
         self._last_wrap_content = None  # Line text set by double-click; survives filter resets
         self._menu_kbfocus = -1         # Keyboard-focused item index in the log context menu
         self._summary_showing = False   # True while the summary view is displayed
         self.exclude_patterns = []      # Lowercase exclusion strings, cached from file
+        self.filter_snapshot = None     # engine.classifier.FilterSnapshot of the last refresh
+        self.time_window = None         # (start, end or None) timestamps loaded instead of the last 1000 lines
+        self.time_window_lines = None   # (first, last or None) line numbers of time_window once indexed
 
         # --- Tkinter control variables (compatible with CTK) ---
         self.load_full_file = tk.BooleanVar(value=False)
@@ -240,11 +258,21 @@ class KodiLogMonitor(UIBuilderMixin, TimelineMixin, ActionsMixin, SessionMixin,
         self.txt_area.bind("<Control-f>", self.focus_search_entry)
         self.txt_area.bind("<Control-F>", self.focus_search_entry)
 
+        self.root.bind("<Control-j>", self.show_goto_time_dialog)
+        self.root.bind("<Control-J>", self.show_goto_time_dialog)
+        self.txt_area.bind("<Control-j>", self.show_goto_time_dialog)
+        self.txt_area.bind("<Control-J>", self.show_goto_time_dialog)
+
         self.root.bind("<Control-n>", lambda e: self.show_exclude_list())
         self.root.bind("<Control-N>", lambda e: self.show_exclude_list())
         self.txt_area.bind("<Control-n>", lambda e: self.show_exclude_list())
         self.txt_area.bind("<Control-N>", lambda e: self.show_exclude_list())
 
+        self.root.bind("<Control-i>", self.show_perf_overlay)
+        self.root.bind("<Control-I>", self.show_perf_overlay)
+        self.txt_area.bind("<Control-i>", self.show_perf_overlay)
+        self.txt_area.bind("<Control-I>", self.show_perf_overlay)
+
         self.root.bind("<Control-g>", self.select_clear_console_from_keyboard)
         self.root.bind("<Control-G>", self.select_clear_console_from_keyboard)
         self.txt_area.bind("<Control-g>", self.select_clear_console_from_keyboard)
@@ -269,6 +297,11 @@ class KodiLogMonitor(UIBuilderMixin, TimelineMixin, ActionsMixin, SessionMixin,
         self.txt_area.bind("<Control-t>", self.toggle_limit_from_keyboard)
         self.txt_area.bind("<Control-T>", self.toggle_limit_from_keyboard)
 
+        self.root.bind("<Control-k>", self.show_time_window_dialog)
+        self.root.bind("<Control-K>", self.show_time_window_dialog)
+        self.txt_area.bind("<Control-k>", self.show_time_window_dialog)
+        self.txt_area.bind("<Control-K>", self.show_time_window_dialog)
+
         self.root.bind("<Control-r>", self.select_reset_all_filters_from_keyboard)
         self.root.bind("<Control-R>", self.select_reset_all_filters_from_keyboard)
         self.txt_area.bind("<Control-r>", self.select_reset_all_filters_from_keyboard)
@@ -343,6 +376,8 @@ class KodiLogMonitor(UIBuilderMixin, TimelineMixin, ActionsMixin, SessionMixin,
 
         # Escape in search field clears it and returns focus to log
         self.search_entry.bind("<Escape>", self.reset_search_and_focus_log)
+        # Escape in the log stops a streamed search (results so far are kept)
+        self.txt_area.bind("<Escape>", self.cancel_search, add="+")
 
         # History event bindings
         self.setup_history_events()
@@ -493,6 +528,15 @@ class KodiLogMonitor(UIBuilderMixin, TimelineMixin, ActionsMixin, SessionMixin,
         self.running = False
         _step("running = False")
 
+        # Wake the monitor thread if it is blocked waiting for file changes.
+        if getattr(self, "file_watcher", None) is not None:
+            self.file_watcher.interrupt()
+
+        # Stop the search index builder and the search worker processes.
+        if self.trigram_index is not None:
+            self.trigram_index.close()
+        shutdown_pool()
+
         if hasattr(self, "monitor_thread") and \
            self.monitor_thread is not None and \
            self.monitor_thread.is_alive():
@@ -1,22 +1,21 @@
 import tkinter as tk
+import tkinter.font as tkfont
 import customtkinter as ctk
 import os
 import re
-from datetime import datetime
+import time
+from functools import lru_cache
 
 from config import *
 from languages import LANGS
+from engine import perf
+from engine.classifier import BLANK_CHARS as _BLANK_CHARS, FilterSnapshot, get_classifier
+from engine.matcher import get_matcher, trie_pattern
+from engine.query import get_query, split_search_text
+from engine.record_store import LineRows
 
-# Pre-compiled timestamp pattern shared by all display functions.
-# Kodi log lines start with YYYY-MM-DD; lines without this prefix are
-# orphan continuations that belong to the preceding timestamped line.
-_TS_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
-
-# Characters treated as "blank" when deciding whether to skip a line.
-# str.strip() removes whitespace but NOT NUL bytes (\x00), which Kodi
-# occasionally writes as padding after certain log entries (e.g. curl errors).
-# We strip both so that NUL-padded lines are discarded like empty lines.
-_BLANK_CHARS = " \t\r\n\x00"
+# Index pairs passed to a single tag_add() call when applying highlights.
+_TAG_ADD_CHUNK = 1000
 
 
 def _is_blank(line: str) -> bool:
@@ -24,13 +23,25 @@ def _is_blank(line: str) -> bool:
     return not line.strip(_BLANK_CHARS)
 
 
+# Tags carried by log lines; they hold the width tab stop (see _update_line_tabs).
+_LINE_TAGS = ("info", "warning", "error", "debug", "continuation")
+
+# Columns between the default Tk tab stops, used to expand a line's own tabs.
+_TAB_COLUMNS = 8
+
+
 def _pad_line(text: str, chars_label: str = "chars") -> str:
     """
     Prepares a log line for display:
     1. Truncates lines exceeding LOG_MAX_LINE_DISPLAY characters and appends a
        translated suffix with the number of hidden characters.
        The source file is never modified.
-    2. Pads to LOG_MIN_LINE_WIDTH so the horizontal scroll region stays stable.
+    2. Appends a single tab: its stop, set on the level tags at
+       LOG_MIN_LINE_WIDTH characters, keeps the horizontal scroll region
+       stable without storing hundreds of padding spaces per line.
+    3. Expands the line's own tabs (tracebacks, add-on dumps) to spaces at
+       the default Tk stops: the width stop applies to every tab of the
+       line, so only the trailing pad tab may remain.
     """
     has_newline = text.endswith("\n")
     content = text[:-1] if has_newline else text
@@ -39,67 +50,70 @@ def _pad_line(text: str, chars_label: str = "chars") -> str:
         hidden = len(content) - LOG_MAX_LINE_DISPLAY
         content = content[:LOG_MAX_LINE_DISPLAY] + f"  […+{hidden:,} {chars_label}]"
 
-    content = content.ljust(LOG_MIN_LINE_WIDTH)
-    return content + "\n" if has_newline else content
+    if "\t" in content:
+        content = content.expandtabs(_TAB_COLUMNS)
+
+    return content + "\t\n" if has_newline else content + "\t"
+
+
+def _search_terms(text):
+    """Lowercase literals of the search bar text to highlight."""
+    query, expr = split_search_text(text)
+    if expr:
+        return get_query(expr).terms
+    return (query,) if query else ()
+
+
+@lru_cache(maxsize=8)
+def _compile_highlights(terms, keywords):
+    """
+    Builds the highlight regex for the search terms and a keyword list.
+    Returns (regex, keyword -> tag name) or None if there is nothing to
+    highlight.  The search bar color wins when a word is in both.
+    """
+    keyword_to_tag = {}
+    for k in keywords:
+        if k:
+            keyword_to_tag[k.lower()] = "highlight"
+    for term in terms:
+        keyword_to_tag[term] = "search_bar_highlight"
+    if not keyword_to_tag:
+        return None
+    # Prefix-trie alternation: the longest keyword wins at each position.
+    regex = re.compile(trie_pattern(keyword_to_tag), re.IGNORECASE)
+    return regex, keyword_to_tag
 
 
 class LogDisplayMixin:
     """Manages the display, filtering, and highlighting of logs."""
 
+    def build_filter_snapshot(self):
+        """
+        Captures every filter setting into an immutable FilterSnapshot.
+        Must run on the main thread (reads Tkinter variables).  The result is
+        also stored in self.filter_snapshot, which the live tail reads on
+        every batch so that it always follows the latest refresh.
+        """
+        query, expr = split_search_text(self.search_query.get())
+        snapshot = FilterSnapshot(
+            filter_all=self.filter_vars["all"].get(),
+            active_tags=frozenset(k for k, v in self.filter_vars.items()
+                                  if k != "all" and v.get()),
+            query=query,
+            keywords=tuple(k.lower() for k in self.get_keywords_from_file()),
+            excludes=tuple(self.exclude_patterns),
+            expr=expr,
+        )
+        self.filter_snapshot = snapshot
+        return snapshot
+
     def get_line_data(self, line):
-        # 1. We check if a specific filter is active (if 'all' is False)
-        is_filtering = not self.filter_vars["all"].get()
-
-        # 2. Check if the line has a timestamp (e.g., 2024-05-20)
-        # Kodi typically uses the YYYY-MM-DD format at the beginning of lines
-        has_timestamp = re.match(r"^\d{4}-\d{2}-\d{2}", line.strip())
-
-        # 3. IF we filter AND the line does NOT have a timestamp, we ignore it (returns None)
-        if is_filtering and not has_timestamp:
-            return None
-
-        if _is_blank(line):
-            return None
-
-        # SKIP THE KODI STARTUP DASH LINE IF DESIRED
-        if "info <general>: --------" in line:
-            # You can choose to ignore it or leave it as is
-            # If you want to remove it: return None
-            return None
-
-        low = line.lower()
-
-        # Exclusion list check (cached lowercase patterns, loaded from file).
-        # Short-circuits immediately when any pattern matches - O(n_patterns).
-        if self.exclude_patterns and any(exc in low for exc in self.exclude_patterns):
-            return None
-
-        q = self.search_query.get().lower()
-        current_tag = None
-        if " error " in low or " critical " in low:
-            current_tag = "error"
-        elif " warning " in low:
-            current_tag = "warning"
-        elif " info " in low:
-            current_tag = "info"
-        elif " debug " in low:
-            current_tag = "debug"
-        if not self.filter_vars["all"].get():
-            if (
-                current_tag is None
-                or not self.filter_vars.get(
-                    current_tag, tk.BooleanVar(value=False)
-                ).get()
-            ):
-                return None
-        if q and q not in low:
-            return None
-        l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        if self.selected_list.get() != l_ui["none"]:
-            kw = self.get_keywords_from_file()
-            if kw and not any(k.lower() in low for k in kw):
-                return None
-        return (line, current_tag)
+        """
+        Classifies a single timestamped line against the current filters.
+        Returns (line, tag), or None when the line is filtered out.
+        """
+        snapshot = getattr(self, "filter_snapshot", None) or self.build_filter_snapshot()
+        return get_classifier(snapshot).classify(line)
 
     def bulk_insert(self, data_list):
         """Inserts a set of data into the text box with detailed filter info if empty."""
@@ -110,9 +124,14 @@ class LogDisplayMixin:
         if not self.running:
             return
 
-        # Filter None entries AND blank/NUL-padded lines as a last safety net,
-        # regardless of which code path produced the list.
-        valid_data = [d for d in data_list if d is not None and not _is_blank(d[0])]
+        if isinstance(data_list, LineRows):
+            # Rows of the record store: never blank.  A large view keeps them
+            # as line numbers (see ui/virtual_view.py), a small one is decoded.
+            valid_data = data_list if len(data_list) >= VIRTUAL_VIEW_MIN_LINES else list(data_list)
+        else:
+            # Filter None entries AND blank/NUL-padded lines as a last safety net,
+            # regardless of which code path produced the list.
+            valid_data = [d for d in data_list if d is not None and not _is_blank(d[0])]
         self.txt_area.config(state=tk.NORMAL)
 
         if not valid_data:
@@ -175,11 +194,12 @@ class LogDisplayMixin:
                 rows.append((f" - {l_ui.get('list_filter', 'List search')}", kw_list))
 
             # 4. Search scope (always shown)
-            scope_value = (
-                l_ui.get("scope_full_log", "Full log")
-                if self.load_full_file.get()
-                else l_ui.get("scope_last_1000", "Last 1,000 lines")
-            )
+            if self.load_full_file.get():
+                scope_value = l_ui.get("scope_full_log", "Full log")
+            elif self.time_window:
+                scope_value = f"{l_ui.get('scope_time_window', 'Time window')} {self._time_window_text()}"
+            else:
+                scope_value = l_ui.get("scope_last_1000", "Last 1,000 lines")
             rows.append((l_ui.get("search_scope", " - Search scope"), scope_value))
 
             # Compute pad from the longest label so all ":" align regardless of language
@@ -209,41 +229,15 @@ class LogDisplayMixin:
         # Normal insertion if valid_data exists
         self._no_results_showing = False      # Flag: real content is being displayed
         self.txt_area.delete('1.0', tk.END)
+        # A freshly loaded view is never trimmed below its initial size.
+        self._display_floor = len(valid_data)
 
-        # Hoist keyword detection outside the loop (avoid N Tkinter .get() calls)
-        l_ui_bulk   = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        search_term = self.search_query.get().strip()
-        has_list    = self.selected_list.get() not in ("", l_ui_bulk.get("none", "None"))
-        list_kw     = self.get_keywords_from_file() if has_list else []
-
-        chars_label = l_ui_bulk.get("truncated_chars", "chars")
-
-        if not search_term and not list_kw:
-            # Fast path: no highlighting needed.
-            # Batch consecutive lines that share the same tag into a single insert()
-            # call. This reduces the number of Tk tag-range B-tree entries from N
-            # (one per line) to at most the number of tag transitions, which for a
-            # typical log file is orders of magnitude smaller. The result is
-            # dramatically faster scrolling on large files.
-            prev_tag = None
-            batch    = []
-            for text, tag in valid_data:
-                # Map None (continuation lines) to their dedicated tag
-                eff_tag = tag if tag is not None else "continuation"
-                padded  = _pad_line(text, chars_label)
-                if eff_tag == prev_tag:
-                    batch.append(padded)
-                else:
-                    if batch:
-                        self.txt_area.insert(tk.END, "".join(batch), prev_tag)
-                    prev_tag = eff_tag
-                    batch    = [padded]
-            if batch:
-                self.txt_area.insert(tk.END, "".join(batch), prev_tag)
+        if len(valid_data) >= VIRTUAL_VIEW_MIN_LINES:
+            # Large view: only a window of it is rendered (see ui/virtual_view.py).
+            self.virt_load(valid_data)
         else:
-            # Slow path: per-line keyword highlighting (unavoidable)
-            for text, tag in valid_data:
-                self.insert_with_highlight(_pad_line(text, chars_label), tag)
+            self.virt_reset()
+            self._insert_rows(valid_data)
 
         if self.pending_jump_timestamp:
             self.jump_to_timestamp(self.pending_jump_timestamp)
@@ -265,6 +259,49 @@ class LogDisplayMixin:
         self.update_stats()
         self.show_loading(False)
 
+    def _insert_rows(self, rows):
+        """
+        Inserts (text, tag) rows at the end of the text area, with keyword
+        highlighting when a search term or keyword list is active.
+
+        Consecutive lines that share the same tag are batched into a single
+        insert() call. This reduces the number of Tk tag-range B-tree entries
+        from N (one per line) to at most the number of tag transitions, which
+        for a typical log file is orders of magnitude smaller. The result is
+        dramatically faster scrolling on large files.  Highlights are then
+        applied to the whole inserted block at once (_apply_highlights).
+        """
+        t_start     = time.perf_counter()
+        l_ui_bulk   = LANGS.get(self.current_lang.get(), LANGS["EN"])
+        chars_label = l_ui_bulk.get("truncated_chars", "chars")
+        highlights  = self._get_highlights()
+        start       = self.txt_area.index("end-1c")
+
+        prev_tag = None
+        batch    = []
+        inserted = []
+        for text, tag in rows:
+            # Map None (continuation lines) to their dedicated tag
+            eff_tag = tag if tag is not None else "continuation"
+            padded  = _pad_line(text, chars_label)
+            if eff_tag == prev_tag:
+                batch.append(padded)
+            else:
+                if batch:
+                    block = "".join(batch)
+                    self.txt_area.insert(tk.END, block, prev_tag)
+                    inserted.append(block)
+                prev_tag = eff_tag
+                batch    = [padded]
+        if batch:
+            block = "".join(batch)
+            self.txt_area.insert(tk.END, block, prev_tag)
+            inserted.append(block)
+
+        if highlights is not None and inserted:
+            self._apply_highlights(start, "".join(inserted), highlights)
+        perf.record("insert", t_start, len(rows))
+
     def append_batch_to_gui(self, batch):
         """
         Appends a batch of (text, tag) lines to the text area in a single lock
@@ -273,27 +310,37 @@ class LogDisplayMixin:
 
         Behaviour mirrors append_to_gui(): silently returns when paused or stopped,
         scrolls to end, and refreshes stats once for the whole batch.
+
+        Returns the number of lines displayed (0 when paused or stopped), which
+        the tail dispatcher uses to measure the per-line display cost.
         """
         if not self.running:
-            return
+            return 0
         if self.is_paused.get():
-            return
+            return 0
         # Strip blank/NUL-padded lines as a last safety net before display.
         batch = [item for item in batch if not _is_blank(item[0])]
         if not batch:
-            return
+            return 0
+        if self.search_streaming():
+            # A streamed search is still filling the view: keep the new lines
+            # until its last chunk is in, so they land after it.
+            self._stream_tail.extend(batch)
+            return len(batch)
         if getattr(self, "_no_results_showing", False):
             # Matching lines arrived while no-results was showing (e.g. after a log
             # rotation): rebuild the view once. trigger_refresh sets
             # _no_results_showing = False so subsequent batches are appended normally.
             self.trigger_refresh()
-            return
+            return len(batch)
 
         with self.log_lock:
             self.txt_area.config(state=tk.NORMAL)
-            chars_label = LANGS.get(self.current_lang.get(), LANGS["EN"]).get("truncated_chars", "chars")
-            for text, tag in batch:
-                self.insert_with_highlight(_pad_line(text, chars_label), tag)
+            if self.virt_active():
+                self.virt_append(batch)
+            else:
+                self._insert_rows(batch)
+            trimmed = self._trim_display()
             current_x = self.txt_area.xview()[0]
             self.txt_area.see(tk.END)
             self.txt_area.xview_moveto(current_x)
@@ -302,6 +349,74 @@ class LogDisplayMixin:
         # Append new lines to the timeline strip
         if hasattr(self, "timeline_append"):
             self.timeline_append(batch)
+            if trimmed:
+                self.timeline_trim(trimmed)
+        return len(batch)
+
+    def append_search_rows(self, rows):
+        """
+        Appends the next chunk of a streamed search (see
+        ActionsMixin._stream_search_rows) to the view.  Until the view turns
+        virtual, _stream_rows collects the result so far; the virtual view
+        then takes that list over as its own rows, so the result is never
+        held twice.
+
+        Unlike append_batch_to_gui(), the rows are never dropped while paused
+        nor trimmed by the display cap: they belong to the result being
+        built.  The view switches to virtual mode once it crosses
+        VIRTUAL_VIEW_MIN_LINES, like bulk_insert() would have.  The view only
+        follows the new rows when it already showed the end of the result
+        and is not paused, so earlier results being read stay in place.
+        """
+        with self.log_lock:
+            self.txt_area.config(state=tk.NORMAL)
+            current_x = self.txt_area.xview()[0]
+            follow = not self.is_paused.get() and self.log_yview()[1] >= 1.0
+            if self.virt_active():
+                self.virt_append(rows, follow)
+            else:
+                result = self._stream_rows
+                if result is not None:
+                    result.extend(rows)
+                if result is not None and len(result) >= VIRTUAL_VIEW_MIN_LINES:
+                    top = None if follow else int(self.txt_area.index("@0,0").split(".")[0]) - 1
+                    self.virt_load(result, top)
+                else:
+                    self._insert_rows(rows)
+            self._display_floor = self._stream_count
+            if follow:
+                self.txt_area.see(tk.END)
+            self.txt_area.xview_moveto(current_x)
+
+        if hasattr(self, "timeline_append"):
+            self.timeline_append(rows)
+
+    def _trim_display(self):
+        """
+        Ring-buffer cap of the live view: once the text area holds more than
+        display_max_lines (+ DISPLAY_TRIM_SLACK) lines, deletes the oldest
+        ones in a single operation.  A view that was loaded larger than the
+        cap keeps its initial size instead.  Returns the number of lines
+        removed (0 if none).
+        """
+        if self.display_max_lines <= 0:
+            return 0
+        cap = max(self.display_max_lines, getattr(self, "_display_floor", 0))
+        virtual = self.virt_active()
+        if virtual:
+            rows = len(self._virt_rows)
+        else:
+            # The text always ends with an empty line after the last newline.
+            rows = int(self.txt_area.index("end-1c").split(".")[0]) - 1
+        if rows <= cap + DISPLAY_TRIM_SLACK:
+            return 0
+        excess = rows - cap
+        if virtual:
+            self.virt_trim(excess)
+        else:
+            self.txt_area.delete("1.0", f"{excess + 1}.0")
+        self._display_trimmed = getattr(self, "_display_trimmed", 0) + excess
+        return excess
 
     def append_to_gui(self, text, tag):
         """
@@ -344,63 +459,53 @@ class LogDisplayMixin:
         """
         # Map None (continuation lines) to their dedicated tag
         base_tag = base_tag if base_tag is not None else "continuation"
-        l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
-
-        # 1. Get terms from search bar
-        search_term = self.search_query.get().strip()
-
-        # 2. Get terms from keyword list
-        list_keywords = []
-        if self.selected_list.get() != l_ui["none"]:
-            list_keywords = self.get_keywords_from_file() or []
-
-        # 3. Create a map of keyword -> tag_name
-        # We use a dict to know which color to apply to which word
-        keyword_to_tag = {}
-
-        # Add list keywords (Yellow)
-        for k in list_keywords:
-            if k: keyword_to_tag[k.lower()] = "highlight"
-
-        # Add search term (Blue) - This overwrites if the word is in both,
-        # giving priority to the search bar color.
-        if search_term:
-            keyword_to_tag[search_term.lower()] = "search_bar_highlight"
-
-        if not keyword_to_tag:
-            self.txt_area.insert(tk.END, text, base_tag)
-            return
-
-        try:
-            # Sort keywords by length (longest first) to avoid partial matching issues
-            sorted_keys = sorted(keyword_to_tag.keys(), key=len, reverse=True)
-            pattern = "|".join(re.escape(k) for k in sorted_keys)
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-        except Exception:
-            matches = []
-
-        if not matches:
-            self.txt_area.insert(tk.END, text, base_tag)
-            return
-
-        # 4. Insert text with specific tags
-        last_idx = 0
-        for m in matches:
-            # Insert text before the match
-            self.txt_area.insert(tk.END, text[last_idx: m.start()], base_tag)
+        highlights = self._get_highlights()
+        start = self.txt_area.index("end-1c")
+        self.txt_area.insert(tk.END, text, base_tag)
+        if highlights is not None:
+            self._apply_highlights(start, text, highlights)
 
+    def _get_highlights(self):
+        """
+        Returns the compiled (regex, keyword -> tag) pair for the current
+        search term and keyword list, or None when nothing is highlighted.
+        Compiled once per (search term, keyword list, list mtime).
+        """
+        search_text = self.search_query.get().strip()
+        keywords = self.get_keywords_from_file()
+        key = (search_text, getattr(self, "_kw_cache_key", None))
+        if getattr(self, "_hl_key", None) != key:
+            self._hl_key = key
+            self._hl_compiled = _compile_highlights(_search_terms(search_text), tuple(keywords))
+        return self._hl_compiled
+
+    def _apply_highlights(self, start, text, highlights):
+        """
+        Highlights every keyword match of *text*, which was just inserted at
+        widget index *start*.  Match offsets are turned into line.column
+        indices in one pass and applied with one tag_add() per tag and
+        _TAG_ADD_CHUNK ranges, instead of one insert per match.
+        """
+        regex, keyword_to_tag = highlights
+        line, col = (int(part) for part in start.split("."))
+        line_start = -col    # Offset in text of the widget line containing `line`
+        prev = 0
+        ranges = {}
+        for m in regex.finditer(text):
+            s, e = m.span()
+            newlines = text.count("\n", prev, s)
+            if newlines:
+                line += newlines
+                line_start = text.rfind("\n", 0, s) + 1
+            prev = s
             # Determine which tag to use for this specific match
-            matched_text = m.group(0).lower()
-            tag_to_apply = keyword_to_tag.get(matched_text, "highlight")
+            tag = keyword_to_tag.get(m.group(0).lower(), "highlight")
+            ranges.setdefault(tag, []).extend(
+                (f"{line}.{s - line_start}", f"{line}.{e - line_start}"))
 
-            # Apply both the base tag (log level color) and the specific highlight (background)
-            self.txt_area.insert(
-                tk.END, text[m.start(): m.end()], (base_tag, tag_to_apply)
-            )
-            last_idx = m.end()
-
-        # Insert remaining text
-        self.txt_area.insert(tk.END, text[last_idx:], base_tag)
+        for tag, indices in ranges.items():
+            for i in range(0, len(indices), _TAG_ADD_CHUNK):
+                self.txt_area.tag_add(tag, *indices[i:i + _TAG_ADD_CHUNK])
 
     def get_keywords_from_file(self):
         """
@@ -437,6 +542,8 @@ class LogDisplayMixin:
 
         self._kw_cache = keywords
         self._kw_cache_key = cache_key
+        # Compile the list matcher now rather than on the first filtered line.
+        get_matcher(tuple(k.lower() for k in keywords))
         return keywords
 
     def refresh_natural_order(self):
@@ -448,50 +555,14 @@ class LogDisplayMixin:
         self._reset_seen_cache()  # Clear deque + O(1) set together
 
         try:
-            with open(self.log_file_path, "r", encoding="utf-8", errors="ignore") as f:
-                # Calculating the playback position
-                if self.load_full_file.get():
-                    lines = f.readlines()
-                else:
-                    f.seek(0, os.SEEK_END)
-                    # We go back ~200 KB to get the last lines.
-                    f.seek(max(0, f.tell() - 200000))
-                    lines = f.readlines()[-1000:]
-
-                to_display = []
-                query = self.search_query.get().lower()
-                last_parent_visible = False
-
-                for line in lines:
-                    stripped = line.strip(_BLANK_CHARS)
-                    if not stripped or "info <general>: --------" in line:
-                        last_parent_visible = False
-                        continue
-
-                    if not _TS_RE.match(stripped):
-                        # Orphan continuation: show only if parent was visible
-                        # and the line itself is not excluded.
-                        if last_parent_visible:
-                            low = line.lower()
-                            if not (self.exclude_patterns and
-                                    any(exc in low for exc in self.exclude_patterns)):
-                                to_display.append((line, None))
-                        continue
-
-                    # Normal timestamped line
-                    data = self.get_line_data(line)
-                    if data:
-                        text, tag = data
-                        if not query or query in text.lower():
-                            to_display.append((text, tag))
-                            last_parent_visible = True
-                        else:
-                            last_parent_visible = False
-                    else:
-                        last_parent_visible = False
-
-                # INSERTION WITHOUT SORTING (natural file order preserved)
-                self.bulk_insert(to_display)
+            # The view is rebuilt from the file: rows still waiting for the
+            # live tail hand-off are part of it already.
+            self._discard_pending_tail()
+            # Whole file or last 1000 lines, filtered from the record store.
+            to_display = self.filter_window(self.build_filter_snapshot(), numbered=True)
+
+            # INSERTION WITHOUT SORTING (natural file order preserved)
+            self.bulk_insert(to_display)
 
         except Exception as e:
             print(f"[ERROR] {type(e).__name__}: {e}")
@@ -500,46 +571,21 @@ class LogDisplayMixin:
     def refresh_display_with_sorting(self):
         """Reads the file and applies filters with strict chronological sorting."""
         try:
-            with open(self.log_file_path, "r", encoding="utf-8", errors="ignore") as f:
-                # The lines are retrieved according to the mode (complete or last 1000).
-                if self.load_full_file.get():
-                    lines = f.readlines()
-                else:
-                    f.seek(0, os.SEEK_END)
-                    f.seek(max(0, f.tell() - 200000))
-                    lines = f.readlines()[-1000:]
-
-                to_display = []
-                last_parent_visible = False
-
-                for line in lines:
-                    stripped = line.strip(_BLANK_CHARS)
-                    if not stripped or "info <general>: --------" in line:
-                        last_parent_visible = False
-                        continue
-
-                    if not _TS_RE.match(stripped):
-                        # Orphan continuation: inherit parent visibility.
-                        if last_parent_visible:
-                            low = line.lower()
-                            if not (self.exclude_patterns and
-                                    any(exc in low for exc in self.exclude_patterns)):
-                                to_display.append((line, None))
-                        continue
-
-                    # Normal timestamped line
-                    data = self.get_line_data(line)
-                    if data and self.is_filter_match(data[1], data[0]):
-                        to_display.append(data)
-                        last_parent_visible = True
-                    else:
-                        last_parent_visible = False
-
-                # File is already in chronological order - no sort needed.
-                self.bulk_insert(to_display)
+            self._discard_pending_tail()
+            # The lines are retrieved according to the mode (complete or last 1000).
+            to_display = self.filter_window(self.build_filter_snapshot(), numbered=True)
+
+            # File is already in chronological order - no sort needed.
+            self.bulk_insert(to_display)
         except Exception as e:
             print(f"[ERROR] {type(e).__name__}: {e}")
 
+    def _discard_pending_tail(self):
+        """Drops live-tail rows not yet displayed (a full reload includes them)."""
+        dispatcher = getattr(self, "tail_dispatcher", None)
+        if dispatcher is not None:
+            dispatcher.discard()
+
     def trigger_refresh(self, *args):
         """Triggered during a filter change or search."""
         self._last_wrap_anchor = None   # Filter change invalidates the remembered line
@@ -569,18 +615,41 @@ class LogDisplayMixin:
 
     def is_filter_match(self, tag, text):
         """Checks whether a line matches the active filters and the search."""
+        snapshot = getattr(self, "filter_snapshot", None) or self.build_filter_snapshot()
         # 1. Checking the log level (ALL, INFO filters, etc.)
-        if not self.filter_vars["all"].get():
-            if not self.filter_vars.get(tag, tk.BooleanVar(value=False)).get():
-                return False
+        if not snapshot.filter_all and tag not in snapshot.active_tags:
+            return False
 
         # 2. Verification of textual research
-        query = self.search_query.get().lower()
-        if query and query not in text.lower():
+        if snapshot.query and snapshot.query not in text.lower():
+            return False
+        if snapshot.expr and not get_query(snapshot.expr).match(text.lower()):
             return False
 
         return True
 
+    def _update_line_tabs(self):
+        """
+        Sets the tab stop that ends every log line (see _pad_line) at
+        LOG_MIN_LINE_WIDTH characters, so each line is at least that wide on
+        screen and the horizontal scrollbar thumb does not change size with
+        the visible lines.  A second stop one character further makes Tk
+        extrapolate 1-character stops for longer lines.  Tk applies these
+        stops to every tab of the line, which is why _pad_line() expands the
+        tabs of the log text itself.
+        Only the log line tags get it, so screens that indent with tabs
+        (no-results, summary) keep the default stops; word-wrap mode, which
+        has no horizontal scrolling, drops it.
+        """
+        if self.wrap_mode.get():
+            tabs = ""
+        else:
+            char_w = tkfont.Font(font=(self.mono_font_family, self.font_size)).measure("0")
+            stop = char_w * LOG_MIN_LINE_WIDTH
+            tabs = (stop, stop + char_w)
+        for tag_name in _LINE_TAGS:
+            self.txt_area.tag_configure(tag_name, tabs=tabs)
+
     def update_tags_config(self):
         """
         Configures the visual styles (tags) for the log display area.
@@ -615,6 +684,7 @@ class LogDisplayMixin:
 
         # txt_area is a tk.Text widget - use standard Tkinter configure
         self.txt_area.configure(bg=COLOR_BG_MAIN, font=c_font)
+        self._update_line_tabs()
 
         # font_label is a CTkLabel - use CTK configure
         self.font_label.configure(text=str(self.font_size))
@@ -666,6 +736,7 @@ class LogDisplayMixin:
         # Set label texts explicitly (no textvariable - avoids CTK pack_forget issue)
         self.label_lines.configure(text=lines_text)
         self.label_size.configure(text=size_text)
+        self.label_size_tooltip.text = self._search_index_tip(l)
 
         self.sep_lines.pack_forget()
         self.label_lines.pack_forget()
@@ -679,6 +750,8 @@ class LogDisplayMixin:
         self.label_wrap.pack_forget()
         self.sep_pause.pack_forget()
         self.label_pause.pack_forget()
+        self.sep_search.pack_forget()
+        self.label_search.pack_forget()
 
         # --- Bloc NUMBER OF LINES ---
         if lines_text and "N/A" not in lines_text:
@@ -710,7 +783,7 @@ class LogDisplayMixin:
                         # Sync button appearance immediately (no hover needed)
                         self.update_button_colors()
                         l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
-                        self.limit_var.set(l_ui.get("limit", "ℹ️ 1000 lines max"))
+                        self.limit_var.set(self.limit_text(l_ui))
                         self.root.update_idletasks()
                 else:
                     self.label_size.configure(text_color=COLOR_TEXT_MAIN)
@@ -741,15 +814,12 @@ class LogDisplayMixin:
             self.label_duration.pack_forget()
 
         # --- LIMIT Block ---
-        txt_limit = l["limit"]
-        txt_unlimited = l.get("unlimited", "⚠️ Unlimited")
-
-        if not self.load_full_file.get():
-            self.limit_var.set(txt_limit)
-            self.label_limit.configure(text=txt_limit, text_color=COLOR_TEXT_MAIN)
-        else:
-            self.limit_var.set(txt_unlimited)
-            self.label_limit.configure(text=txt_unlimited, text_color=COLOR_WARNING)
+        txt_limit = self.limit_text(l)
+        self.limit_var.set(txt_limit)
+        self.label_limit.configure(
+            text=txt_limit,
+            text_color=COLOR_WARNING if self.load_full_file.get() else COLOR_TEXT_MAIN,
+        )
 
         # Always pack if a file is loaded to ensure it doesn't disappear
         self.sep_limit.pack(side=tk.LEFT, fill=tk.Y, padx=20, pady=2)
@@ -777,6 +847,17 @@ class LogDisplayMixin:
             self.sep_pause.pack_forget()
             self.label_pause.pack_forget()
 
+        # --- SEARCH PROGRESS Block ---
+        if self.search_streaming():
+            self.label_search.configure(
+                text=l["search_progress"].format(int(self._search_progress * 100))
+            )
+            self.sep_search.pack(side=tk.LEFT, fill=tk.Y, padx=20, pady=2)
+            self.label_search.pack(side=tk.LEFT)
+        else:
+            self.sep_search.pack_forget()
+            self.label_search.pack_forget()
+
     def scheduled_stats_update(self):
         """
         Periodically refreshes file statistics (lines, size) every 4 seconds.
@@ -789,8 +870,10 @@ class LogDisplayMixin:
 
     # ── File-info helpers ────────────────────────────────────────────────────────
     # Size is read instantly via os.path.getsize().
-    # Line-count is computed in a daemon thread and cached; a stale value is
-    # shown immediately and refreshed once the background thread completes.
+    # Line-count comes from the line index shared with the live tail: the
+    # monitor thread extends it by newline counting over the bytes appended
+    # since its last sync and only rebuilds it on rotation/truncation, so a
+    # refresh is a len() on the UI thread.
 
     def _format_size(self, size_bytes):
         """Convert a byte count to a human-readable string."""
@@ -801,66 +884,14 @@ class LogDisplayMixin:
             temp /= 1024
         return "N/A"
 
-    def _refresh_line_count_async(self, path, size_bytes):
-        """
-        Counts lines in *path* on a background thread and updates the footer
-        labels on the main thread when done.  Skipped if a count job is already
-        running for the same file+size combination.
-        """
-        import threading
-
-        # Deduplicate: don't launch a second thread for the same snapshot
-        job_key = (path, size_bytes)
-        if getattr(self, "_line_count_job", None) == job_key:
-            return
-        self._line_count_job = job_key
-
-        def _count():
-            try:
-                with open(path, "rb") as f:
-                    count = sum(1 for _ in f)
-            except Exception:
-                count = 0
-            # Store result and schedule a lightweight UI refresh on the main thread
-            self._cached_line_count = count
-            self._cached_line_count_key = job_key
-            try:
-                self.root.after(0, self._apply_cached_file_info)
-            except Exception:
-                pass
-
-        threading.Thread(target=_count, daemon=True).start()
-
-    def _apply_cached_file_info(self):
-        """
-        Called on the main thread after a background line-count finishes.
-        Refreshes only the lines / size labels without repeating the full
-        update_stats() layout pass.
-        """
-        if not self.log_file_path:
-            return
-        l = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        count = getattr(self, "_cached_line_count", 0)
-        size_str = self._format_size(
-            os.path.getsize(self.log_file_path)
-            if os.path.exists(self.log_file_path) else 0
-        )
-        try:
-            formatted_total = f"{int(count):,}".replace(",", " ")
-        except (ValueError, TypeError):
-            formatted_total = str(count)
-        lines_text = l["stats_simple"].format(formatted_total)
-        size_text  = l["file_size_text"].format(size_str)
-        self.stats_var.set(lines_text)
-        self.size_var.set(size_text)
-        self.label_lines.configure(text=lines_text)
-        self.label_size.configure(text=size_text)
-
     def get_file_info(self):
         """
         Returns (size_str, line_count) for the current log file.
-        Size is always fresh; line-count comes from the in-memory cache and a
-        background thread is launched to refresh it asynchronously.
+        Size is always fresh; line-count is read, without locking, from the
+        line index the monitor thread keeps in sync with the file (it scans
+        only the appended bytes on every pass of the live tail).  While the
+        index is still being built, the last count shown is kept; the
+        monitor thread refreshes the footer once the index is ready.
         """
         if not self.log_file_path or not os.path.exists(self.log_file_path):
             return "0 KB", 0
@@ -868,137 +899,119 @@ class LogDisplayMixin:
             size_bytes = os.path.getsize(self.log_file_path)
             size_str = self._format_size(size_bytes)
 
-            # Use the cached line-count if available for the same file+size
-            cached_key = getattr(self, "_cached_line_count_key", None)
-            if cached_key == (self.log_file_path, size_bytes):
-                line_count = self._cached_line_count
+            index = getattr(self, "line_index", None)
+            if index is not None and index.ready and index.path == self.log_file_path:
+                line_count = index.line_count(size_bytes)
+                self._last_line_count = (self.log_file_path, line_count)
             else:
-                # Show the last known count while the background thread runs
-                line_count = getattr(self, "_cached_line_count", 0)
-                self._refresh_line_count_async(self.log_file_path, size_bytes)
+                path, line_count = getattr(self, "_last_line_count", (None, 0))
+                if path != self.log_file_path:
+                    line_count = 0
 
             return size_str, line_count
         except Exception:
             pass
         return "N/A", 0
 
+    def _search_index_tip(self, l):
+        """Footer tooltip describing the trigram search index ("" if none)."""
+        index = getattr(self, "trigram_index", None)
+        if index is None or index.path != self.log_file_path:
+            return ""
+        stats = index.stats()
+        if not stats["indexed_bytes"]:
+            return ""
+        return l["tip_search_index"].format(
+            self._format_size(stats["indexed_bytes"]),
+            self._format_size(stats["memory_bytes"]),
+        )
+
     def get_log_duration(self):
         """
         Returns the time span covered by the log as a formatted string '🕒 HH:MM:SS',
         or an empty string if the duration cannot be determined.
 
-        Strategy: read only the first 4 KB for the earliest timestamp and the
-        last 4 KB for the latest timestamp - O(1) regardless of file size.
+        The first and last timestamps are tracked by the record store as the
+        monitor thread parses the lines, so no file access is needed here.
         """
-        if not self.log_file_path or not os.path.exists(self.log_file_path):
+        store = getattr(self, "record_store", None)
+        if store is None or store.index.path != self.log_file_path:
             return ""
-
-        TS_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}")
-        TS_FMT = "%Y-%m-%d %H:%M:%S.%f"
-        CHUNK = 4096
-
-        try:
-            with open(self.log_file_path, "r", encoding="utf-8", errors="ignore") as f:
-                # --- First timestamp: read from file start ---
-                head = f.read(CHUNK)
-                first_matches = TS_RE.findall(head)
-                if not first_matches:
-                    return ""
-                first_ts = datetime.strptime(first_matches[0], TS_FMT)
-
-                # --- Last timestamp: read from file end ---
-                f.seek(0, os.SEEK_END)
-                file_size = f.tell()
-                f.seek(max(0, file_size - CHUNK))
-                tail = f.read()
-                last_matches = TS_RE.findall(tail)
-                if not last_matches:
-                    return ""
-                last_ts = datetime.strptime(last_matches[-1], TS_FMT)
-
-            delta = last_ts - first_ts
-            if delta.total_seconds() < 1:
-                return ""
-
-            total_seconds = int(delta.total_seconds())
-            hours, remainder = divmod(total_seconds, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            return f"🕒 {hours:02d}:{minutes:02d}:{seconds:02d}"
-
-        except Exception:
+        span = store.span_ms()
+        if span is None or span < 1000:
             return ""
 
+        hours, remainder = divmod(span // 1000, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return f"🕒 {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+    def _time_window_text(self):
+        """Compact "🕒 start → end" text of the active time window."""
+        start, end = self.time_window
+        return f"🕒 {start[11:19]} → {end[11:19] if end else '…'}"
+
+    def limit_text(self, l):
+        """Footer text of the load scope: full file, time window or last 1000 lines."""
+        if self.load_full_file.get():
+            return l.get("unlimited", "⚠️ Unlimited")
+        if self.time_window:
+            return self._time_window_text()
+        return l.get("limit", "ℹ️ 1000 lines max")
+
+    def limit_tooltip_text(self, l):
+        """Tooltip of the limit button for the current load scope."""
+        if self.time_window and not self.load_full_file.get():
+            return l.get("tip_time_window_clear", "")
+        tip = l.get("tip_limit_on" if self.load_full_file.get() else "tip_limit_off", "")
+        return f"{tip}\n{l.get('tip_time_window', '')}"
+
     def jump_to_timestamp(self, timestamp):
         self.root.after(100, lambda: self._execute_jump(timestamp))
 
     def _execute_jump(self, timestamp):
-        idx = self.txt_area.search(timestamp, "1.0", tk.END)
-        if idx:
-            self.txt_area.see(idx)
-            start_line = f"{idx} linestart"
-            end_line = f"{idx} lineend"
-            self.txt_area.tag_add("highlight", start_line, end_line)
+        row = self.find_time_row(timestamp)
+        if row is not None:
+            idx = self.log_see_row(row)
+            self.txt_area.tag_add("highlight", idx, f"{idx} lineend")
             self.root.after(
                 3000, lambda: self.txt_area.tag_remove("highlight", "1.0", tk.END)
             )
 
     def find_and_highlight_timestamp(self, target_ts, target_content=None):
-        """Search for the timestamp and validate with the line content to avoid duplicates."""
+        """
+        Scrolls to the line stamped *target_ts* and highlights it.  The line
+        content disambiguates lines sharing the same millisecond.  The row is
+        found by binary search over the view (see find_time_row).
+        """
         self.txt_area.tag_remove("highlight_jump", "1.0", tk.END)
 
-        search_pos = "1.0"
-        found_final_idx = None
-
-        while True:
-            # We are looking for the next occurrence of the timestamp
-            idx = self.txt_area.search(target_ts, search_pos, stopindex=tk.END)
-            if not idx:
-                break  # No more occurrences found
-
-            # If there is comparison content, the entire line is checked.
-            if target_content:
-                current_line_text = self.txt_area.get(
-                    idx + " linestart", idx + " lineend"
-                ).strip()
-
-                # Comparison: if the current line contains the target content
-                if target_content in current_line_text:
-                    found_final_idx = idx
-                    break
-            else:
-                # If there is no comparison content, take the first one found (fallback).
-                found_final_idx = idx
-                break
-
-            # Otherwise, we continue the search after this line.
-            search_pos = self.txt_area.index(idx + " lineend")
-
-        # IF WE FOUND THE EXACT LINE
-        if found_final_idx:
-            line_end = self.txt_area.index(f"{found_final_idx} lineend")
-
-            # Position the cursor (INSERT)
-            self.txt_area.mark_set(tk.INSERT, found_final_idx)
+        row = self.find_time_row(target_ts, target_content)
+        if row is not None:
+            self.highlight_row(row)
 
-            # Force focus on the text area to validate the position
-            self.txt_area.focus_set()
+    def highlight_row(self, row):
+        """
+        Puts the cursor on *row* (whole view), scrolls to it and highlights
+        it in yellow / black for 5 seconds.
+        """
+        idx = self.log_see_row(row)
+        line_end = self.txt_area.index(f"{idx} lineend")
 
-            # Scroll to the line
-            self.txt_area.see(found_final_idx)
+        # Force focus on the text area to validate the position
+        self.txt_area.focus_set()
 
-            # 3. Apply Yellow/Black highlighting
-            self.txt_area.tag_add("highlight_temp", found_final_idx, line_end)
-            self.txt_area.tag_config(
-                "highlight_temp",
-                background=LOG_COLORS["highlight_kwl_bg"],
-                foreground=LOG_COLORS["highlight_kwl_fg"],
-                font=(self.mono_font_family, self.font_size),
-            )
+        self.txt_area.tag_add("highlight_temp", idx, line_end)
+        self.txt_area.tag_config(
+            "highlight_temp",
+            background=LOG_COLORS["highlight_kwl_bg"],
+            foreground=LOG_COLORS["highlight_kwl_fg"],
+            font=(self.mono_font_family, self.font_size),
+        )
 
-            # Delete after 5 seconds
-            self.root.after(
-                5000, lambda: self.txt_area.tag_remove("highlight_temp", "1.0", tk.END)
-            )
+        # Delete after 5 seconds
+        self.root.after(
+            5000, lambda: self.txt_area.tag_remove("highlight_temp", "1.0", tk.END)
+        )
 
     def on_double_click_line(self, event):
         """
@@ -1,7 +1,6 @@
 import os
 import time
 import threading
-import re
 import subprocess
 import tkinter as tk
 import sys
@@ -9,11 +8,30 @@ import customtkinter as ctk
 
 from config import *
 from languages import LANGS
-from ui.log_display import _is_blank, _BLANK_CHARS
-
-# Maximum number of lines collected in one batch before dispatching to the UI.
-# Keeps the main thread responsive even under intense log flux.
-_BATCH_MAX = 150
+from engine import perf
+from engine.classifier import get_classifier
+from engine.dispatcher import TailDispatcher
+from engine.line_index import LineIndex, read_tail_lines
+from engine.record_store import LineRows, RecordStore
+from engine.timestamps import first_timestamp, read_time_window
+from engine.trigram import TrigramIndex
+from engine.watcher import create_watcher
+
+# Longest time the tail waits for the UI to absorb the previous batch (s).
+# Normally the wait ends as soon as the drain has run; the bound only keeps
+# the loop alive if the UI stops draining (e.g. a modal dialog).
+_DRAIN_WAIT_MAX = 0.5
+
+# Minimum interval between two back-pressure counter dumps in the debug log.
+_DISPATCH_LOG_INTERVAL = 5.0
+
+# Number of lines shown when the "1000 lines max" limit is active.
+_TAIL_LINES = 1000
+
+# Longest idle wait of the live tail (seconds).  With inotify, new lines wake
+# the loop immediately; this bound only keeps the periodic checks (file
+# deleted, stats) going on filesystems that do not report changes.
+_IDLE_WAKE_MAX = 5.0
 
 class MonitorMixin:
     def monitor_loop(self):
@@ -28,6 +46,7 @@ class MonitorMixin:
         else:
             def _rstep(label): pass
 
+        watcher = None
         try:
             # --- CAPTURE UI VALUES SAFELY AT START ---
             if not self.running:
@@ -36,6 +55,7 @@ class MonitorMixin:
             try:
                 # Capture Tkinter variables once to avoid crashes during loop
                 load_full = self.load_full_file.get()
+                time_window = None if load_full else self.time_window
                 current_lang_code = self.current_lang.get()
                 # Capture the language dictionary for this thread session
                 l_ui = LANGS.get(current_lang_code, LANGS["EN"])
@@ -43,198 +63,242 @@ class MonitorMixin:
                 # If UI is destroyed or inaccessible, exit thread
                 return
 
-            # --- INITIAL OPENING OF THE FILE ---
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                if load_full:
-                    f.seek(0)
-                else:
-                    # Seek to the end and read a chunk (approx 100kb)
-                    f.seek(0, os.SEEK_END)
-                    f.seek(max(0, f.tell() - 100000))
-
-                initial_lines = f.readlines()
-                _rstep(f"file read  {len(initial_lines)} raw lines")
-                if not load_full:
-                    initial_lines = initial_lines[-1000:]
-
-                last_pos = f.tell()
-
-                _ts_re = re.compile(r"^\d{4}-\d{2}-\d{2}")
-                to_display = []
-                last_parent_visible = False
-
-                for line in initial_lines:
-                    stripped = line.strip(_BLANK_CHARS)
-                    if not stripped or "info <general>: --------" in line:
-                        last_parent_visible = False
-                        continue
-
-                    if not _ts_re.match(stripped):
-                        # Orphan continuation: inherit parent visibility.
-                        if last_parent_visible:
-                            low = line.lower()
-                            if not (self.exclude_patterns and
-                                    any(exc in low for exc in self.exclude_patterns)):
-                                to_display.append((line, None))
-                        continue
-
-                    data = self.get_line_data(line)
-                    if data and not self.is_duplicate(data[0]):
-                        to_display.append(data)
-                        last_parent_visible = True
+            # The line index belongs to this monitoring session: a newer call to
+            # start_monitoring() replaces it, which also tells this thread to stop.
+            index = self.line_index
+            store = self.record_store
+            trigram = self.trigram_index
+            path  = index.path
+
+            # --- INITIAL LOAD ---
+            if load_full:
+                # Single pass: builds the line index and decodes every line.
+                initial_lines = index.sync(collect=True)
+                tail_line = len(index)
+            elif time_window:
+                # Locate the window by binary search over the file offsets:
+                # only its lines are read, whatever the size of the file.
+                initial_lines, window_start, tail_end = read_time_window(path, *time_window)
+            else:
+                # Read the last lines backwards from the end of the file so the
+                # first screen appears immediately; the full index is built below.
+                initial_lines, tail_end = read_tail_lines(path, _TAIL_LINES)
+            _rstep(f"file read  {len(initial_lines)} raw lines")
+
+            # Filters captured by start_monitoring() on the main thread.
+            snapshot = self.filter_snapshot
+            t_parse = time.perf_counter()
+            to_display, last_parent_visible = get_classifier(snapshot).run(
+                initial_lines, is_duplicate=self.is_duplicate)
+            perf.record("parse", t_parse, len(initial_lines))
+            if load_full and len(to_display) >= VIRTUAL_VIEW_MIN_LINES:
+                # Virtual view: keep the rows as line numbers, the view only
+                # reads back the window it renders.
+                to_display = LineRows.from_run(index, 0, initial_lines, to_display)
+
+            # Persist flag so the live tail loop continues from the correct state.
+            self._monitor_last_parent_visible = last_parent_visible
+
+            _rstep(f"parse done  {len(to_display)} displayable lines")
+
+            # Send initial data to GUI
+            if self.running:
+                try:
+                    if to_display:
+                        self.root.after(0, self.bulk_insert, to_display)
+                        _rstep("bulk_insert dispatched to UI")
                     else:
-                        last_parent_visible = False
-
-                # Persist flag so the live tail loop continues from the correct state.
-                self._monitor_last_parent_visible = last_parent_visible
-
-                _rstep(f"parse done  {len(to_display)} displayable lines")
-
-                # Send initial data to GUI
-                if self.running:
-                    try:
-                        if to_display:
+                        # Logic for empty files or filtering
+                        is_filtering = bool(snapshot.active_tags)
+                        if not load_full and not is_filtering:
                             self.root.after(0, self.bulk_insert, to_display)
-                            _rstep("bulk_insert dispatched to UI")
                         else:
-                            # Logic for empty files or filtering
-                            is_filtering = any(v.get() for k, v in self.filter_vars.items() if k != "all")
-                            if not load_full and not is_filtering:
-                                self.root.after(0, self.bulk_insert, to_display)
-                            else:
-                                # Delayed update to ensure UI is ready
-                                self.root.after(1000, lambda: self.bulk_insert(to_display) if self.running else None)
-                    except (tk.TclError, RuntimeError):
-                        return
-
-                # Persistent flag for file access errors
-                self.is_file_inaccessible = False
-
-                # --- REAL-TIME MONITORING LOOP ---
-                while self.running:
-                    try:
-                        # 1. Check if the file still exists/is accessible
-                        current_size = os.path.getsize(self.log_file_path)
+                            # Delayed update to ensure UI is ready
+                            self.root.after(1000, lambda rows=to_display: self.bulk_insert(rows) if self.running else None)
+                except (tk.TclError, RuntimeError):
+                    return
+
+            if not load_full:
+                # Build the full index now that the first screen is on its way,
+                # then resume tailing right after the last line already shown
+                # (lines written in the meantime are delivered by the loop).
+                index.sync()
+                tail_line = index.line_at_offset(tail_end)
+                _rstep(f"line index built  {len(index)} lines")
+            if time_window:
+                # A closed window ends at tail_line; an open one follows the tail.
+                self.time_window_lines = (index.line_at_offset(window_start),
+                                          tail_line if time_window[1] else None)
+            # Keep the parsed records of the loaded lines so filter changes
+            # can be served from memory.
+            store.ingest(initial_lines, tail_line - len(initial_lines))
+            # The decoded lines are not needed past this point: don't hold
+            # them (and the rows sent to the view) for the whole session.
+            del initial_lines, to_display
+            if not store.first_stamp:
+                # Loaded range starts mid-file: read the first timestamp once
+                # (the footer duration is then served from the store).
+                store.set_first_stamp(first_timestamp(path))
+            _rstep(f"record store filled  {len(store)} records")
+            index.ready = True
+            generation = index.generation
+            if self.running:
+                # The footer line count is read from the index from now on.
+                self.root.after(0, self.update_stats)
+            last_pos = index.offset_of(tail_line)
 
-                        # 2. Recovery: If file WAS inaccessible, reconnect!
-                        if self.is_file_inaccessible:
-                            try:
-                                f.close()
-                            except Exception:
-                                pass
+            # Persistent flag for file access errors
+            self.is_file_inaccessible = False
 
-                            f = open(self.log_file_path, 'r', encoding='utf-8', errors='ignore')
-                            f.seek(last_pos)
+            # Wakes the idle loop as soon as Kodi writes (inotify on Linux,
+            # polling elsewhere); interrupted by start_monitoring/on_closing.
+            watcher = create_watcher(path)
+            self.file_watcher = watcher
+            _rstep(f"file watcher  {watcher.kind}")
 
-                            self.is_file_inaccessible = False
-                            if self.running:
-                                self.root.after(0, self.inactivity_timer_var.set, "")
-                                self.root.after(0, lambda: self.update_status_color(
-                                    LOG_COLORS["info"] if not self.load_full_file.get() else LOG_COLORS["warning"]
-                                ))
-                                self.root.after(0, self.reset_all_filters)
+            dispatcher = self.tail_dispatcher
+            closed_window = bool(time_window and time_window[1])
+            indicator_active = False     # "new lines" indicator currently shown
+            last_dispatch_log = time.time()
 
-                        # 3. Detect Log Rotations (Kodi restarts)
-                        if current_size < last_pos:
-                            _rstep("ROTATION detected — restarting monitor")
-                            if self.running:
-                                self.root.after(0, self.start_monitoring, self.log_file_path, False, False)
-                            return
-
-                        # 4. Read all available lines as a batch.
-                        #    Collecting up to _BATCH_MAX lines before dispatching
-                        #    means one after() call instead of one per line, which
-                        #    prevents flooding the Tkinter event queue under high flux.
-                        batch = []
-                        has_new_lines = False  # raw file activity, independent of filters
-                        while self.running and len(batch) < _BATCH_MAX:
-                            line = f.readline()
-                            if not line:
-                                break
-                            last_pos = f.tell()
-                            has_new_lines = True  # file wrote something, regardless of filter
-
-                            stripped = line.strip()
-                            if not stripped or "info <general>: --------" in line:
-                                self._monitor_last_parent_visible = False
-                                continue
-
-                            if not _ts_re.match(stripped):
-                                # Orphan continuation: inherit parent visibility.
-                                if self._monitor_last_parent_visible:
-                                    low = line.lower()
-                                    if not (self.exclude_patterns and
-                                            any(exc in low for exc in self.exclude_patterns)):
-                                        batch.append((line, None))
-                                continue
-
-                            data = self.get_line_data(line)
-                            if data and not self.is_duplicate(data[0]):
-                                batch.append((data[0], data[1]))
-                                self._monitor_last_parent_visible = True
-                            else:
-                                self._monitor_last_parent_visible = False
+            # --- REAL-TIME MONITORING LOOP ---
+            while self.running and self.line_index is index:
+                try:
+                    # 1. Check if the file still exists/is accessible
+                    current_size = os.path.getsize(path)
+
+                    # 2. Recovery: If file WAS inaccessible, reconnect!
+                    if self.is_file_inaccessible:
+                        self.is_file_inaccessible = False
+                        if self.running:
+                            self.root.after(0, self.inactivity_timer_var.set, "")
+                            self.root.after(0, lambda: self.update_status_color(
+                                LOG_COLORS["info"] if not self.load_full_file.get() else LOG_COLORS["warning"]
+                            ))
+                            self.root.after(0, self.reset_all_filters)
+
+                    # 3. Detect Log Rotations (Kodi restarts): sync() resets the
+                    #    index when the file shrank or was replaced by a new one.
+                    index.sync()
+                    if current_size < last_pos or index.generation != generation:
+                        _rstep("ROTATION detected — restarting monitor")
+                        if self.running:
+                            self.root.after(0, self.start_monitoring, path, False, False)
+                        return
 
-                        # 5a. File had new content: update indicator on raw activity,
-                        #     dispatch only the filtered batch to the GUI.
-                        if has_new_lines:
+                    # Search index: first build once the file is big enough,
+                    # then extended every few MB (no-op otherwise).
+                    trigram.extend_async(current_size)
+
+                    if closed_window:
+                        # 4. A closed time window ends before the lines Kodi
+                        #    writes now: nothing is read or classified, the
+                        #    tail just follows the index (extended by sync()).
+                        if len(index) > tail_line:
+                            tail_line = len(index)
+                            last_pos = index.offset_of(tail_line)
                             self.last_activity_time = time.time()
-                            self.is_file_inaccessible = False
-                            if self.running:
-                                if batch:
-                                    self.root.after(0, self.append_batch_to_gui, batch)
+                        new_lines = batch = []
+                    else:
+                        # 4. Read the next lines as a batch, straight from the
+                        #    index.  The batch size adapts to how fast the UI
+                        #    absorbed the previous ones (see engine.dispatcher).
+                        t_read = time.perf_counter()
+                        new_lines = index.read_lines(tail_line, tail_line + dispatcher.batch_size)
+                        if new_lines:
+                            perf.record("read", t_read, len(new_lines))
+                        store.ingest(new_lines, tail_line)
+                        tail_line += len(new_lines)
+                        last_pos = index.offset_of(tail_line)
+
+                        # The classifier follows the snapshot of the latest refresh.
+                        t_parse = time.perf_counter()
+                        batch, self._monitor_last_parent_visible = get_classifier(self.filter_snapshot).run(
+                            new_lines, self._monitor_last_parent_visible, self.is_duplicate)
+                        if new_lines:
+                            perf.record("parse", t_parse, len(new_lines))
+                    has_new_lines = bool(new_lines)  # raw file activity, independent of filters
+
+                    # 5a. File had new content: update indicator on raw activity,
+                    #     hand only the filtered batch to the GUI.
+                    if has_new_lines:
+                        self.last_activity_time = time.time()
+                        self.is_file_inaccessible = False
+                        if self.running:
+                            # Coalesced into the pending drain if the UI is behind:
+                            # at most one after() callback is ever queued.
+                            dispatcher.push(batch)
+                            if not indicator_active:
+                                indicator_active = True
                                 self.root.after(0, lambda: self.update_status_color(
                                     LOG_COLORS["info"] if not self.load_full_file.get() else LOG_COLORS["warning"]
                                 ))
                                 self.root.after(0, self.inactivity_timer_var.set, "")
-                            # Brief pause between batches: gives the main thread time
-                            # to process the after() callback and remain responsive.
-                            time.sleep(0.05)
-
-                        # 5b. No new data: handle inactivity timer then wait
-                        else:
-                            if self.inactivity_limit > 0:
-                                elapsed = time.time() - self.last_activity_time
-                                if elapsed >= self.inactivity_limit:
-                                    if self.running:
-                                        try:
-                                            self.root.after(0, self.update_status_color, COLOR_DANGER)
-                                            mins, secs = divmod(int(elapsed), 60)
-                                            timer_str = f"{l_ui.get('inactive', 'Inactive')} : {mins:02d}:{secs:02d}"
-                                            self.root.after(0, self.inactivity_timer_var.set, timer_str)
-                                        except Exception:
-                                            pass
-                                else:
-                                    if self.running:
-                                        try:
-                                            self.root.after(0, self.update_status_color, COLOR_INDICATOR_OFF)
-                                            self.root.after(0, self.inactivity_timer_var.set, "")
-                                        except Exception:
-                                            pass
+                        # Back-pressure: wait until the UI has consumed the
+                        # batch (returns at once if it already has).  Lines not
+                        # read yet simply stay in the file meanwhile.
+                        dispatcher.wait_drained(_DRAIN_WAIT_MAX)
+
+                        if _dlog and time.time() - last_dispatch_log >= _DISPATCH_LOG_INTERVAL:
+                            last_dispatch_log = time.time()
+                            _dlog.debug("TAIL      dispatch %s", dispatcher.stats())
+                            _dlog.debug("TAIL      search index %s", trigram.stats())
+                            for perf_line in perf.summary_lines():
+                                _dlog.debug("PERF      %s", perf_line)
+
+                    # 5b. No new data: handle inactivity timer then wait
+                    else:
+                        indicator_active = False
+                        if self.inactivity_limit > 0:
+                            elapsed = time.time() - self.last_activity_time
+                            if elapsed >= self.inactivity_limit:
+                                if self.running:
+                                    try:
+                                        self.root.after(0, self.update_status_color, COLOR_DANGER)
+                                        mins, secs = divmod(int(elapsed), 60)
+                                        timer_str = f"{l_ui.get('inactive', 'Inactive')} : {mins:02d}:{secs:02d}"
+                                        self.root.after(0, self.inactivity_timer_var.set, timer_str)
+                                    except Exception:
+                                        pass
                             else:
                                 if self.running:
                                     try:
                                         self.root.after(0, self.update_status_color, COLOR_INDICATOR_OFF)
                                         self.root.after(0, self.inactivity_timer_var.set, "")
-                                        self.root.after(0, self.update_stats)
                                     except Exception:
                                         pass
-                            time.sleep(0.4)
+                        else:
+                            if self.running:
+                                try:
+                                    self.root.after(0, self.update_status_color, COLOR_INDICATOR_OFF)
+                                    self.root.after(0, self.inactivity_timer_var.set, "")
+                                    self.root.after(0, self.update_stats)
+                                except Exception:
+                                    pass
+
+                        # Sleep until the file changes, waking up in time to
+                        # show the inactivity timer (then once per second).
+                        if self.inactivity_limit > 0:
+                            remaining = self.inactivity_limit - (time.time() - self.last_activity_time)
+                            timeout = remaining if remaining > 0 else 1.0
+                        else:
+                            timeout = _IDLE_WAKE_MAX
+                        watcher.wait(min(timeout, _IDLE_WAKE_MAX))
 
-                    except (IOError, OSError):
-                        # File becomes locked or deleted temporarily
-                        if not self.is_file_inaccessible and self.running:
-                            self.is_file_inaccessible = True
-                            # SAFE: Use local l_ui instead of self.current_lang.get()
-                            msg = l_ui.get("file_error", "⚠️ LOG INACCESSIBLE!")
-                            self.root.after(0, self.inactivity_timer_var.set, msg)
-                            self.root.after(0, self.update_status_color, COLOR_DANGER)
+                except (IOError, OSError):
+                    # File becomes locked or deleted temporarily
+                    if not self.is_file_inaccessible and self.running:
+                        self.is_file_inaccessible = True
+                        # SAFE: Use local l_ui instead of self.current_lang.get()
+                        msg = l_ui.get("file_error", "⚠️ LOG INACCESSIBLE!")
+                        self.root.after(0, self.inactivity_timer_var.set, msg)
+                        self.root.after(0, self.update_status_color, COLOR_DANGER)
 
-                        time.sleep(2)
-                        continue
+                    time.sleep(2)
+                    continue
 
-                    except (tk.TclError, RuntimeError):
-                        break
+                except (tk.TclError, RuntimeError):
+                    break
 
         except Exception as e:
             if self.running:
@@ -243,6 +307,9 @@ class MonitorMixin:
                     self.root.after(0, self.show_loading, False)
                 except Exception:
                     pass
+        finally:
+            if watcher is not None:
+                watcher.close()
 
     def start_monitoring(self, path, save=True, retranslate=True, is_manual=True):
         """
@@ -258,7 +325,28 @@ class MonitorMixin:
         self.inactivity_timer_var.set("")
         self.running = True
         self._reset_seen_cache()   # clears deque + O(1) set together
+        if path != self.log_file_path:
+            self.time_window = None     # Times of another log are meaningless here
+        self.time_window_lines = None   # Resolved again by the monitor thread
         self.log_file_path = path
+        # Fresh line index for this session; replacing it also stops any
+        # monitor thread still attached to the previous one.
+        self.line_index = LineIndex(path)
+        self.record_store = RecordStore(self.line_index)
+        if getattr(self, "trigram_index", None) is not None:
+            self.trigram_index.close()
+        self.trigram_index = TrigramIndex(path, TRIGRAM_INDEX_MIN_BYTES)
+        # Drop the rows remembered for type-ahead refinement of the last search.
+        self.full_search.clear()
+        # Wake the previous monitor thread so it notices it was replaced,
+        # and drop the rows it had not delivered yet.
+        if getattr(self, "file_watcher", None) is not None:
+            self.file_watcher.interrupt()
+        if getattr(self, "tail_dispatcher", None) is not None:
+            self.tail_dispatcher.close()
+        self.tail_dispatcher = TailDispatcher(
+            lambda fn: self.root.after(0, fn), self.append_batch_to_gui)
+        self.build_filter_snapshot()
 
         # Reset footer stats so update_stats re-fetches fresh values for the new file
         if hasattr(self, 'stats_var'):
@@ -304,6 +392,71 @@ class MonitorMixin:
         self.show_loading(True)
         self.root.after(150, self._launch_thread)
 
+    def read_log_window(self, load_full=None):
+        """
+        Returns the lines currently in scope: the whole file in full mode,
+        the time window when one is set, otherwise the last _TAIL_LINES
+        lines.
+
+        Served from the line index once the monitor thread has built it (a
+        seek + read of only the needed bytes); before that, falls back to
+        reading the file directly.  Safe to call from worker threads.
+        """
+        if load_full is None:
+            load_full = self.load_full_file.get()
+        path = self.log_file_path
+        index = getattr(self, "line_index", None)
+
+        if index is not None and index.ready and index.path == path:
+            index.sync()
+            return index.read_lines(*self._window_lines(len(index), load_full))
+
+        if load_full:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                return f.readlines()
+        if self.time_window:
+            return read_time_window(path, *self.time_window)[0]
+        return read_tail_lines(path, _TAIL_LINES)[0]
+
+    def _window_lines(self, end, load_full):
+        """(first, last) line numbers in scope for a file of *end* indexed lines."""
+        if load_full:
+            return 0, end
+        window = self.time_window_lines
+        if self.time_window and window:
+            first, last = window
+            return first, end if last is None else min(last, end)
+        return max(0, end - _TAIL_LINES), end
+
+    def filter_window(self, snapshot, load_full=None, is_duplicate=None, should_stop=None,
+                      numbered=False):
+        """
+        Returns the (line, tag) rows of the lines in scope (see
+        read_log_window) that pass *snapshot*, or None if should_stop()
+        returned True.
+
+        Served from the record store when it holds the whole window, so a
+        filter change only reads back the lines that pass the level filter;
+        otherwise the window is read and classified from scratch.
+        *numbered* asks for a LineRows when served from the store (the
+        fallback always returns a list).
+        Safe to call from worker threads.
+        """
+        if load_full is None:
+            load_full = self.load_full_file.get()
+        classifier = get_classifier(snapshot)
+        store = getattr(self, "record_store", None)
+
+        if store is not None and store.index.path == self.log_file_path:
+            first, last = self._window_lines(store.end, load_full)
+            if store.covers(first, last):
+                return store.select(classifier, first, last, is_duplicate, should_stop,
+                                    numbered=numbered)
+
+        result = classifier.run(self.read_log_window(load_full),
+                                is_duplicate=is_duplicate, should_stop=should_stop)
+        return None if result is None else result[0]
+
     def _launch_thread(self):
         self.monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True)
         self.monitor_thread.start()
@@ -40,6 +40,7 @@ class SessionMixin:
                     f"{str(self.app_theme.get()):<{w}} # App color theme (dark/light)",
                     f"{str(self.window_state):<{w}} # Window state (normal/zoomed)",
                     f"{('1' if self.debug_mode else '0'):<{w}} # Debug mode (1=on 0=off)",
+                    f"{str(self.display_max_lines):<{w}} # Max lines kept in view while tailing (0=no cap)",
                 ]
                 f.write("\n".join(config_data))
         except (IOError, OSError) as e:
@@ -177,6 +178,13 @@ class SessionMixin:
                 if len(lines) >= 20:
                     self.debug_mode = (lines[19].strip() == "1")
 
+                # Line 21: Max lines kept in view while tailing (0 = no cap)
+                if len(lines) >= 21:
+                    try:
+                        self.display_max_lines = max(0, int(lines[20]))
+                    except ValueError:
+                        self.display_max_lines = DEFAULT_DISPLAY_MAX_LINES
+
         except Exception as e:
             print(f"Error loading configuration: {e}")
 
@@ -7,12 +7,34 @@ Each displayed line maps to a proportional pixel row; consecutive lines that
 share the same log level are merged into a single coloured rectangle.
 A lightweight outline rectangle marks the currently visible viewport.
 
+The levels are kept as one byte per line with a max-severity pyramid
+(engine/level_pyramid.py), so a redraw costs O(height), not O(lines).
+
+Rendering is incremental: the strip holds one canvas rectangle per pixel
+row, scaled for a line capacity slightly above the current line count
+(_CAPACITY_HEADROOM).  A live-tail append only recomputes the rows from the
+first changed line on, and only the rows whose colour changed are
+reconfigured.  Every bucket is recomputed only when the lines outgrow the
+capacity or are trimmed / reloaded; the items themselves are only
+recreated when the strip is resized.
+
+Right-clicking the strip switches it to a density heatmap: each row is
+shaded by the rate (lines per second) of the lines it covers, so log storms
+stand out.  The hover tooltip shows, for the row under the cursor, the
+count of each level and that rate.  The indices of the stamped lines are
+kept sorted beside the timestamps, so a row finds its nearest timestamp by
+bisection however long the run of un-stamped continuation lines around it.
+
 Clicking or dragging the strip scrolls the text area to that position and
 activates pause mode so the view stays put.
 """
+import math
 import re
+import time
 import tkinter as tk
-from datetime import datetime
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
 
 from config import (
     LOG_COLORS,
@@ -22,10 +44,9 @@ from config import (
     COLOR_TIMELINE_VIEWPORT,   # dedicated color for the viewport overlay outline
 )
 from languages import LANGS
-
-# Severity order used to pick the dominant colour when a pixel bucket spans
-# lines of mixed levels.  Higher value wins.
-_PRIORITY = {"error": 4, "warning": 3, "info": 2, "debug": 1}
+from engine import perf
+from engine.level_pyramid import SEVERITY_TAGS, LevelPyramid
+from engine.record_store import LineRows, parse_stamp
 
 # Minimum guaranteed pixel height for high-severity segments so they remain
 # visible even on very long logs where proportional mapping gives < 1 px.
@@ -39,18 +60,51 @@ _TAG_TO_LANG_KEY = {"error": "err", "warning": "warn", "info": "info", "debug":
 _TS_RE = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3})")
 
 
-def _extract_ts(text):
-    """Return the timestamp string from a log line, or None if not found."""
+# Heatmap: number of shades, and the rate (lines/s) shown with the hottest.
+_HEAT_STEPS = 8
+_HEAT_MAX_RATE = 1000.0
+
+# Origin of the millisecond timestamps of engine.record_store.parse_stamp.
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _extract_stamp(text):
+    """Return the timestamp of a log line in ms (parse_stamp), or 0 if not found."""
     m = _TS_RE.search(text)
-    return m.group(1) if m else None
+    return parse_stamp(m.group(1)) if m else 0
+
+
+def _format_stamp(ms):
+    """Kodi timestamp string of a millisecond timestamp."""
+    return (_EPOCH + timedelta(milliseconds=ms)).strftime("%Y-%m-%d %H:%M:%S.%f")[:23]
+
+
+def _mix(color_a, color_b, t):
+    """Blend of two "#rrggbb" colours, t = 0 (a) .. 1 (b)."""
+    a = [int(color_a[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(color_b[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#" + "".join(f"{round(x + (y - x) * t):02x}" for x, y in zip(a, b))
 
 
-def _parse_ts(ts_str):
-    """Parse a Kodi timestamp string to a datetime object, or None."""
-    try:
-        return datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S.%f")
-    except Exception:
-        return None
+def _heat_palette():
+    """Colour of each heat step: 0 = no lines, then background → warning → error."""
+    warm, hot = LOG_COLORS["warning"], LOG_COLORS["error"]
+    half = (_HEAT_STEPS - 1) / 2
+    palette = [COLOR_BG_MAIN]
+    for step in range(_HEAT_STEPS):
+        if step <= half:
+            palette.append(_mix(_mix(COLOR_BG_MAIN, warm, 0.25), warm, step / half))
+        else:
+            palette.append(_mix(warm, hot, (step - half) / half))
+    return palette
+
+
+def _heat_step(rate):
+    """Heat step (1.._HEAT_STEPS) of a rate in lines per second (log scale)."""
+    if rate <= 1.0:
+        return 1
+    t = min(1.0, math.log10(rate) / math.log10(_HEAT_MAX_RATE))
+    return 1 + round(t * (_HEAT_STEPS - 1))
 
 # Width of the coloured segment area in logical pixels (before DPI scaling).
 # sc() will multiply by self.scale: 14 px on FHD (scale=0.50), 28 px on 4K (scale=1).
@@ -61,6 +115,10 @@ _STRIP_WIDTH    = 28
 # when the viewport is at the very top or bottom of the strip.
 _STRIP_OVERHANG = 2
 
+# Lines the layout can hold beyond the current count, as a fraction of it:
+# the bottom of the strip fills up with live-tail lines until a relayout.
+_CAPACITY_HEADROOM = 0.05
+
 
 class TimelineMixin:
     """
@@ -83,11 +141,20 @@ class TimelineMixin:
         Must be called from _build_main_area, after main_container exists
         but before txt_area is gridded (so column indices are correct).
         """
-        self._timeline_data       = []    # list[str|None]:      one tag per displayed line
-        self._timeline_timestamps = []    # list[str|None]:      timestamp string (or None for orphans)
-        self._timeline_first_ts   = None  # datetime|None:       first event's timestamp
+        self._timeline_levels     = LevelPyramid()  # severity code per displayed line
+        self._timeline_stamps     = array("q")  # timestamp per line in ms (0 for orphans)
+        self._timeline_stamped    = array("q")  # base-relative index of each stamped line
+        self._timeline_stamp_base = 0     # lines trimmed since _timeline_stamped was built
+        self._timeline_first_ts   = None  # int|None:            first event's timestamp (ms)
+        self._timeline_heatmap    = False # density heatmap instead of severity colours
         self._timeline_draw_pending = False
         self._tl_tip_last_idx     = -1   # cache: avoids re-parsing on same position
+        self._tl_capacity   = 0     # Lines the current layout maps onto the strip height
+        self._tl_layout     = None  # (height, width) the row items were created for
+        self._tl_row_items  = []    # Canvas rectangle of each pixel row
+        self._tl_row_values = []    # Severity code / heat step currently shown by each row
+        self._tl_overdraw   = []    # Minimum-height rectangles currently drawn
+        self._tl_dirty_from = 0     # First line changed since the last draw (None: none)
 
         self.timeline_canvas = tk.Canvas(
             self.main_container,
@@ -100,6 +167,7 @@ class TimelineMixin:
         )
 
         self.timeline_canvas.bind("<Button-1>",  self._timeline_on_click)
+        self.timeline_canvas.bind("<Button-3>",  self._timeline_toggle_heatmap)
         self.timeline_canvas.bind("<B1-Motion>", self._timeline_on_drag)
         self.timeline_canvas.bind("<Configure>", self._timeline_on_resize)
         self.timeline_canvas.bind("<Motion>",    self._timeline_on_hover)
@@ -128,19 +196,20 @@ class TimelineMixin:
         """
         Full rebuild from the list of (text, tag) tuples passed to bulk_insert.
         Call this right after bulk_insert has populated the text widget.
+        A LineRows gives its levels and timestamps without being decoded.
         """
-        self._timeline_data       = []
-        self._timeline_timestamps = []
-        self._timeline_first_ts   = None
+        if isinstance(valid_data, LineRows):
+            tags, stamps = valid_data.tags(), valid_data.timestamps()
+        else:
+            tags = [tag for _, tag in valid_data]
+            stamps = array("q", [_extract_stamp(text) for text, _ in valid_data])
+        self._timeline_levels     = LevelPyramid(tags)
+        self._timeline_stamps     = stamps
+        self._timeline_stamped    = array("q", [i for i, ms in enumerate(self._timeline_stamps) if ms])
+        self._timeline_stamp_base = 0
+        self._timeline_first_ts   = self._timeline_first_stamp()
         self._tl_tip_last_idx     = -1
-
-        for text, tag in valid_data:
-            self._timeline_data.append(tag)
-            ts_str = _extract_ts(text)
-            self._timeline_timestamps.append(ts_str)
-            if ts_str is not None and self._timeline_first_ts is None:
-                self._timeline_first_ts = _parse_ts(ts_str)
-
+        self._tl_capacity         = 0       # New content: rescale the strip
         self._timeline_schedule_draw()
 
     def timeline_append(self, batch):
@@ -148,23 +217,59 @@ class TimelineMixin:
         Incremental append for live-tail updates.
         Call after append_batch_to_gui with the same batch list.
         """
-        for text, tag in batch:
-            self._timeline_data.append(tag)
-            ts_str = _extract_ts(text)
-            self._timeline_timestamps.append(ts_str)
-            if ts_str is not None and self._timeline_first_ts is None:
-                self._timeline_first_ts = _parse_ts(ts_str)
+        if self._tl_dirty_from is None:
+            self._tl_dirty_from = len(self._timeline_levels)
+        self._timeline_levels.extend(tag for _, tag in batch)
+        new_stamps = [_extract_stamp(text) for text, _ in batch]
+        offset = len(self._timeline_stamps) + self._timeline_stamp_base
+        self._timeline_stamps.extend(new_stamps)
+        self._timeline_stamped.extend(offset + i for i, ms in enumerate(new_stamps) if ms)
+        if self._timeline_first_ts is None:
+            self._timeline_first_ts = self._timeline_first_stamp()
+        self._timeline_schedule_draw()
+
+    def timeline_trim(self, count):
+        """
+        Drop the *count* oldest entries, mirroring lines trimmed from the top
+        of the text area by the display cap.
+        """
+        self._timeline_levels.trim(count)
+        self._tl_dirty_from = 0     # Every bucket shifts
+        del self._timeline_stamps[:count]
+        # Shift by bumping the base instead of rewriting every stored index
+        self._timeline_stamp_base += count
+        del self._timeline_stamped[:bisect_left(self._timeline_stamped, self._timeline_stamp_base)]
+        self._timeline_first_ts = self._timeline_first_stamp()
+        self._tl_tip_last_idx = -1
         self._timeline_schedule_draw()
 
     def timeline_clear(self):
         """
         Reset the strip (new file loaded, filters cleared, or no results).
         """
-        self._timeline_data       = []
-        self._timeline_timestamps = []
+        self._timeline_levels.clear()
+        self._timeline_stamps     = array("q")
+        self._timeline_stamped    = array("q")
+        self._timeline_stamp_base = 0
         self._timeline_first_ts   = None
         self._tl_tip_last_idx     = -1
         self._timeline_hide_tip()
+        self._timeline_reset_items()
+
+    def _timeline_first_stamp(self):
+        """First non-zero timestamp (ms) of the strip, or None."""
+        if not self._timeline_stamped:
+            return None
+        return self._timeline_stamps[self._timeline_stamped[0] - self._timeline_stamp_base]
+
+    def _timeline_reset_items(self):
+        """Forget the row items; the next draw lays the strip out again."""
+        self._tl_capacity   = 0
+        self._tl_layout     = None
+        self._tl_row_items  = []
+        self._tl_row_values = []
+        self._tl_overdraw   = []
+        self._tl_dirty_from = 0
         try:
             self.timeline_canvas.delete("all")
         except Exception:
@@ -192,16 +297,24 @@ class TimelineMixin:
 
         Algorithm
         ---------
+        Layout - one rectangle per pixel row, created when the strip size
+          changes.  When the lines outgrow _tl_capacity, the strip is
+          rescaled (the new capacity leaves _CAPACITY_HEADROOM for the live
+          tail) and every row recomputed.  Row y covers lines
+          [y * capacity / h, (y + 1) * capacity / h), at least one line.
+
         Pass 1 - proportional rendering:
-          For each pixel row y, compute which slice of _timeline_data it covers,
-          pick the highest-severity colour in that slice, then merge consecutive
-          same-colour rows into one rectangle.
+          For each pixel row from the first changed line on, read the highest
+          severity of its lines from the level pyramid (O(log n) per row) and
+          recolour the row only if that changed.
 
         Pass 2 - minimum-height guarantee:
-          High-severity segments (error ≥ 3 px, warning ≥ 2 px) are overdrawn on
-          top if their natural proportional height is below the threshold.  This
-          ensures isolated events remain visible on very long logs.
+          High-severity runs of rows (error ≥ 3 px, warning ≥ 2 px) are
+          overdrawn on top if their natural proportional height is below the
+          threshold.  This ensures isolated events remain visible on very long
+          logs.  The overdraw is only recreated when it changed.
         """
+        start  = time.perf_counter()
         canvas = self.timeline_canvas
         try:
             h = canvas.winfo_height()
@@ -212,95 +325,164 @@ class TimelineMixin:
         if h <= 1 or w <= 1:
             return
 
-        n = len(self._timeline_data)
-        canvas.delete("segments")          # remove previous colour blocks only
-
+        n = len(self._timeline_levels)
         if n == 0:
-            canvas.delete("all")
+            self._timeline_reset_items()
             return
 
-        # Segments are drawn only in the inner zone, leaving _STRIP_OVERHANG px
-        # empty on each side so the viewport overlay borders are always visible.
-        overhang = self.sc(_STRIP_OVERHANG)
-        seg_x0   = overhang
-        seg_x1   = w - overhang
-
-        # ── Pass 1: proportional colour runs ──────────────────────────────
-        prev_color    = None
-        prev_priority = 0
-        prev_y        = 0
-        high_segs     = []   # (y_top, y_bot, color, priority) for overdraw pass
-
-        for y in range(h):
-            i_start = int(y       * n / h)
-            i_end   = int((y + 1) * n / h)
-            # Guarantee at least one element per bucket
-            if i_end <= i_start:
-                i_end = i_start + 1
-            if i_end > n:
-                i_end = n
-
-            color, priority = self._timeline_bucket_color(i_start, i_end)
-
-            if color != prev_color:
-                # Flush the previous run
-                if prev_color is not None and prev_y < y:
-                    canvas.create_rectangle(
-                        seg_x0, prev_y, seg_x1, y,
-                        fill=prev_color, outline="",
-                        tags="segments",
-                    )
-                    if prev_priority >= 3:           # warning or error
-                        high_segs.append((prev_y, y, prev_color, prev_priority))
-                prev_color    = color
-                prev_priority = priority
-                prev_y        = y
-
-        # Flush the last run
-        if prev_color is not None and prev_y < h:
-            canvas.create_rectangle(
-                seg_x0, prev_y, seg_x1, h,
-                fill=prev_color, outline="",
-                tags="segments",
-            )
-            if prev_priority >= 3:
-                high_segs.append((prev_y, h, prev_color, prev_priority))
-
-        # ── Pass 2: overdraw high-severity segments below minimum height ──
-        for y_top, y_bot, color, priority in high_segs:
-            tag_name  = "error" if priority >= 4 else "warning"
-            min_h     = _MIN_SEG_H.get(tag_name, 1)
-            nat_h     = y_bot - y_top
-            if nat_h < min_h:
-                center    = (y_top + y_bot) // 2
-                new_top   = max(0,     center - min_h // 2)
-                new_bot   = min(h - 1, new_top + min_h)
+        # ── Layout: row items per strip size, capacity per line count ─────
+        if self._tl_layout != (h, w):
+            canvas.delete("segments")
+            canvas.delete("overdraw")
+            # Segments are drawn only in the inner zone, leaving _STRIP_OVERHANG
+            # px empty on each side so the viewport overlay borders stay visible.
+            overhang = self.sc(_STRIP_OVERHANG)
+            seg_x0   = overhang
+            seg_x1   = w - overhang
+            self._tl_row_items = [
                 canvas.create_rectangle(
-                    seg_x0, new_top, seg_x1, new_bot,
-                    fill=color, outline="",
+                    seg_x0, y, seg_x1, y + 1,
+                    fill=COLOR_BG_MAIN, outline="", width=0,
                     tags="segments",
                 )
+                for y in range(h)
+            ]
+            self._tl_row_values = [0] * h
+            self._tl_overdraw  = []
+            self._tl_layout    = (h, w)
+            self._tl_capacity  = 0
+        if n > self._tl_capacity:
+            # Rescale: every bucket moves, the row items are kept.
+            self._tl_capacity   = n + int(n * _CAPACITY_HEADROOM)
+            self._tl_dirty_from = 0
+
+        dirty = self._tl_dirty_from
+        self._tl_dirty_from = None
+        if dirty is not None:
+            self._timeline_update_rows(dirty, n, h)
 
         # Draw the viewport indicator on top of the colour blocks
         self._timeline_draw_viewport()
+        perf.record("timeline_draw", start)
+
+    def _timeline_update_rows(self, dirty, n, h):
+        """Pass 1 and 2 for the rows covering lines *dirty* and after."""
+        canvas   = self.timeline_canvas
+        capacity = self._tl_capacity
+        values   = self._tl_row_values
+        items    = self._tl_row_items
+
+        # Rows holding at least one line, and the first row touching *dirty*
+        # (the row before it too: its heat depends on the next row's start).
+        used  = min(h, -(-n * h // capacity))
+        first = max(0, dirty * h // capacity - 1)
+        if self._timeline_heatmap:
+            new_values = [self._timeline_row_heat(y, h) for y in range(first, used)]
+            colors = _heat_palette()
+            color_of = colors.__getitem__
+        else:
+            new_values = self._timeline_levels.bucket_max(
+                [y * capacity // h for y in range(first, used)])
+            color_of = lambda code: self._timeline_code_color(code)[0]
+        new_values.extend([0] * (h - used))
+
+        itemconfigure = canvas.itemconfigure
+        for y, value in enumerate(new_values, first):
+            if value != values[y]:
+                values[y] = value
+                itemconfigure(items[y], fill=color_of(value))
+
+        # ── Pass 2: overdraw high-severity runs below minimum height ─────
+        overdraw = []
+        y = 0
+        while y < h and not self._timeline_heatmap:
+            code = values[y]
+            y_top = y
+            while y < h and values[y] == code:
+                y += 1
+            if code >= 3:                            # warning or error
+                tag_name = "error" if code >= 4 else "warning"
+                min_h    = _MIN_SEG_H.get(tag_name, 1)
+                if y - y_top < min_h:
+                    center  = (y_top + y) // 2
+                    new_top = max(0,     center - min_h // 2)
+                    new_bot = min(h - 1, new_top + min_h)
+                    overdraw.append((new_top, new_bot, code))
+        if overdraw != self._tl_overdraw:
+            self._tl_overdraw = overdraw
+            canvas.delete("overdraw")
+            seg_x0, _, seg_x1, _ = canvas.coords(items[0])
+            for y_top, y_bot, code in overdraw:
+                canvas.create_rectangle(
+                    seg_x0, y_top, seg_x1, y_bot,
+                    fill=self._timeline_code_color(code)[0], outline="",
+                    tags="overdraw",
+                )
 
-    def _timeline_bucket_color(self, i_start, i_end):
+    # ── Per-row statistics ────────────────────────────────────────────────
+
+    def _timeline_row_lines(self, y, h):
+        """Lines [first, last) covered by pixel row *y* (at least one line)."""
+        n = len(self._timeline_levels)
+        capacity = max(self._tl_capacity, n)
+        first = min(y * capacity // h, n - 1)
+        last = max(first + 1, min((y + 1) * capacity // h, n))
+        return first, last
+
+    def _timeline_stamp_from(self, i, limit):
+        """First non-zero timestamp (ms) of lines [i, limit), or 0."""
+        base = self._timeline_stamp_base
+        stamped = self._timeline_stamped
+        k = bisect_left(stamped, i + base)
+        if k < len(stamped) and stamped[k] - base < limit:
+            return self._timeline_stamps[stamped[k] - base]
+        return 0
+
+    def _timeline_stamp_before(self, i, limit=0):
+        """Last non-zero timestamp (ms) of lines [limit, i), or 0."""
+        base = self._timeline_stamp_base
+        stamped = self._timeline_stamped
+        k = bisect_left(stamped, i + base) - 1
+        if k >= 0 and stamped[k] - base >= limit:
+            return self._timeline_stamps[stamped[k] - base]
+        return 0
+
+    def _timeline_rate(self, first, last):
         """
-        Return (fill_colour, priority) for a bucket [i_start, i_end) of
-        _timeline_data.  Uses the highest-severity log level found in the range.
-        Orphan / continuation lines (tag=None) count as background (priority 0).
+        Lines per second of lines [first, last): their count over the time
+        from their first timestamp to the first timestamp after them (their
+        last one at the end of the strip).  None without timestamps.
         """
-        best_priority = -1
-        best_tag      = None
-        for tag in self._timeline_data[i_start:i_end]:
-            p = _PRIORITY.get(tag, 0)
-            if p > best_priority:
-                best_priority = p
-                best_tag      = tag
-
-        if best_tag is None:
+        n = len(self._timeline_stamps)
+        start = self._timeline_stamp_from(first, last)
+        if not start:
+            return None
+        end = self._timeline_stamp_from(last, n) or self._timeline_stamp_before(last, first)
+        return (last - first) * 1000.0 / max(1, end - start)
+
+    def _timeline_row_heat(self, y, h):
+        """Heat step of pixel row *y* (0 when its lines carry no timestamp)."""
+        rate = self._timeline_rate(*self._timeline_row_lines(y, h))
+        return 0 if rate is None else _heat_step(rate)
+
+    def _timeline_toggle_heatmap(self, event=None):
+        """Right-click: switch between severity colours and the density heatmap."""
+        self._timeline_heatmap = not self._timeline_heatmap
+        self._tl_row_values = [-1] * len(self._tl_row_items)   # Recolour every row
+        self._tl_dirty_from = 0
+        self._tl_tip_last_idx = -1
+        self._timeline_draw()
+        if event is not None:
+            self._timeline_on_hover(event)
+
+    def _timeline_code_color(self, code):
+        """
+        Return (fill_colour, priority) for the highest severity *code* of a
+        bucket.  Orphan / continuation lines (code 0) count as background.
+        """
+        if not code:
             return COLOR_BG_MAIN, 0                  # blend into background
-        return LOG_COLORS.get(best_tag, COLOR_BG_MAIN), best_priority
+        return LOG_COLORS.get(SEVERITY_TAGS[code], COLOR_BG_MAIN), code
 
     def _timeline_draw_viewport(self, *_):
         """
@@ -311,14 +493,17 @@ class TimelineMixin:
         """
         canvas = self.timeline_canvas
         try:
-            top, bottom = self.txt_area.yview()
+            top, bottom = self.log_yview()
             h = canvas.winfo_height()
             w = canvas.winfo_width()
         except Exception:
             return
 
-        y_top = max(0,     int(top    * h))
-        y_bot = min(h - 1, int(bottom * h))
+        # The strip is laid out for _tl_capacity lines: the view spans
+        # only the part of it filled so far.
+        fill  = self._timeline_fill()
+        y_top = max(0,     int(top    * fill * h))
+        y_bot = min(h - 1, int(bottom * fill * h))
         if y_bot - y_top < 4:                        # minimum visible height
             y_bot = y_top + 4
 
@@ -339,6 +524,21 @@ class TimelineMixin:
             tags="viewport",
         )
 
+    def _timeline_fill(self):
+        """Fraction of the strip height covered by the lines (1.0 before a layout)."""
+        n = len(self._timeline_levels)
+        if not n or self._tl_capacity < n:
+            return 1.0
+        return n / self._tl_capacity
+
+    def _timeline_line_at(self, y_pixel, h):
+        """Index of the line under pixel row *y_pixel*, or None below the last line."""
+        n = len(self._timeline_levels)
+        fraction = max(0.0, min(1.0, y_pixel / h)) / self._timeline_fill()
+        if fraction > 1.0:
+            return None
+        return max(0, min(n - 1, int(fraction * n)))
+
     # ── Interaction ───────────────────────────────────────────────────────
 
     def _timeline_on_click(self, event):
@@ -352,18 +552,15 @@ class TimelineMixin:
         Scroll the log to the line proportional to y_pixel, then activate pause
         so the view stays still.
         """
-        n = len(self._timeline_data)
+        n = len(self._timeline_levels)
         if n == 0:
             return
         try:
             h = self.timeline_canvas.winfo_height()
             if h <= 0:
                 return
-            fraction = max(0.0, min(1.0, y_pixel / h))
-            line_num = max(1, min(n, int(fraction * n) + 1))
-
-            self.txt_area.see(f"{line_num}.0")
-            self.txt_area.mark_set(tk.INSERT, f"{line_num}.0")
+            idx = self._timeline_line_at(y_pixel, h)
+            self.log_see_row(n - 1 if idx is None else idx)
 
             # Activate pause so the view stays at the clicked position
             if not self.is_paused.get():
@@ -384,8 +581,11 @@ class TimelineMixin:
         """
         Wrapper for txt_area's yscrollcommand.
         Forwards to the scrollbar AND refreshes the viewport indicator so the
-        outline rectangle stays in sync as the user scrolls.
+        outline rectangle stays in sync as the user scrolls.  In virtual mode
+        the fractions are converted to positions in the whole view.
         """
+        if self.virt_active():
+            args = self.virt_map_fractions(*args)
         self.v_scroll.set(*args)
         self._timeline_draw_viewport()
 
@@ -394,10 +594,11 @@ class TimelineMixin:
     def _timeline_on_hover(self, event):
         """
         Show a tooltip with the timestamp and elapsed time of the log line
-        under the cursor.  Uses _tl_tip_last_idx to skip re-computation when
-        the mouse stays on the same logical line bucket.
+        under the cursor, then the level counts and line rate of its pixel
+        row.  Uses _tl_tip_last_idx to skip re-computation when the mouse
+        stays on the same logical line bucket.
         """
-        n = len(self._timeline_data)
+        n = len(self._timeline_levels)
         if n == 0:
             self._timeline_hide_tip()
             return
@@ -410,8 +611,10 @@ class TimelineMixin:
             return
 
         # Map pixel y → line index
-        fraction = max(0.0, min(1.0, event.y / h))
-        idx = max(0, min(n - 1, int(fraction * n)))
+        idx = self._timeline_line_at(event.y, h)
+        if idx is None:
+            self._timeline_hide_tip()
+            return
 
         # Avoid re-computing if hovering the same bucket as last time
         if idx == self._tl_tip_last_idx:
@@ -420,51 +623,45 @@ class TimelineMixin:
             return
         self._tl_tip_last_idx = idx
 
-        # Find the nearest line in [idx..n) that has a timestamp
-        ts_str = None
-        for i in range(idx, n):
-            if self._timeline_timestamps[i] is not None:
-                ts_str = self._timeline_timestamps[i]
-                break
-        # If not found forward, try backward
-        if ts_str is None:
-            for i in range(idx - 1, -1, -1):
-                if self._timeline_timestamps[i] is not None:
-                    ts_str = self._timeline_timestamps[i]
-                    break
-
-        if ts_str is None:
+        # Find the nearest line in [idx..n) that has a timestamp, else before
+        stamp = self._timeline_stamp_from(idx, n) or self._timeline_stamp_before(idx)
+
+        if not stamp:
             self._timeline_hide_tip()
             return
 
         # Build tooltip text - level label first, then timestamp, then elapsed
-        tag   = self._timeline_data[idx] if idx < len(self._timeline_data) else None
-        label = None
-        if tag:
-            lang_key = _TAG_TO_LANG_KEY.get(tag)
-            if lang_key:
-                l_ui  = LANGS.get(self.current_lang.get(), LANGS["EN"])
-                label = l_ui.get(lang_key)
+        l_ui  = LANGS.get(self.current_lang.get(), LANGS["EN"])
+        tag   = self._timeline_levels.tag_at(idx)
+        label = l_ui.get(_TAG_TO_LANG_KEY[tag]) if tag else None
         lines = []
         if label:
             lines.append(label)
-        lines.append(ts_str)
+        lines.append(_format_stamp(stamp))
         if self._timeline_first_ts is not None:
-            dt = _parse_ts(ts_str)
-            if dt is not None:
-                delta = dt - self._timeline_first_ts
-                total_seconds = int(delta.total_seconds())
-                if total_seconds < 0:
-                    total_seconds = 0
-                h_val, rem = divmod(total_seconds, 3600)
-                m_val, s_val = divmod(rem, 60)
-                if h_val:
-                    elapsed = f"+{h_val}h {m_val:02d}m {s_val:02d}s"
-                elif m_val:
-                    elapsed = f"+{m_val}m {s_val:02d}s"
-                else:
-                    elapsed = f"+{s_val}s"
-                lines.append(elapsed)
+            total_seconds = max(0, (stamp - self._timeline_first_ts) // 1000)
+            h_val, rem = divmod(total_seconds, 3600)
+            m_val, s_val = divmod(rem, 60)
+            if h_val:
+                elapsed = f"+{h_val}h {m_val:02d}m {s_val:02d}s"
+            elif m_val:
+                elapsed = f"+{m_val}m {s_val:02d}s"
+            else:
+                elapsed = f"+{s_val}s"
+            lines.append(elapsed)
+
+        # Statistics of the lines under this pixel row
+        first, last = self._timeline_row_lines(max(0, min(event.y, h - 1)), h)
+        counts = self._timeline_levels.counts(first, last)
+        lines.append("")
+        for code in range(len(SEVERITY_TAGS) - 1, 0, -1):
+            if counts[code]:
+                lang_key = _TAG_TO_LANG_KEY[SEVERITY_TAGS[code]]
+                lines.append(f"{l_ui.get(lang_key)}: {counts[code]}")
+        rate = self._timeline_rate(first, last)
+        if rate is not None:
+            lines.append(l_ui.get("tl_rate", "≈ {} lines/s").format(f"{rate:.3g}"))
+        lines.append(l_ui.get("tl_heatmap_off" if self._timeline_heatmap else "tl_heatmap_on", ""))
 
         self._tl_tip_label.configure(text="\n".join(lines))
         self._tl_tip_reposition(event)
@@ -689,7 +689,9 @@ class UIBuilderMixin:
             fg_color=LOG_COLORS["warning"] if self.load_full_file.get() else COLOR_BTN_DEFAULT,
             text_color=COLOR_TEXT_ON_ACCENT if self.load_full_file.get() else COLOR_TEXT_BRIGHT,
         ))
-        self.btn_limit_tooltip = ToolTip(self.cde_limit, l_ui["tip_limit_off"], scale=self.scale)
+        # Right-click: load a time window instead of the last 1000 lines
+        self.cde_limit.bind("<Button-3>", self.show_time_window_dialog)
+        self.btn_limit_tooltip = ToolTip(self.cde_limit, self.limit_tooltip_text(l_ui), scale=self.scale)
 
         # Wrap toggle: ➡️ = wrap off (default), ↩ = wrap on
         self.cde_wrap = ctk.CTkButton(
@@ -892,7 +894,7 @@ class UIBuilderMixin:
         self.v_scroll = ctk.CTkScrollbar(
             self.main_container,
             orientation="vertical",
-            command=self.txt_area.yview,
+            command=self.log_yview_command,
             width=12,
             fg_color="transparent",
             button_color=SCROLL_THUMB_DEFAULT,
@@ -1106,6 +1108,8 @@ class UIBuilderMixin:
             footer_inner, text="",
             text_color=COLOR_TEXT_MAIN, **_fs
         )
+        # Search index figures, filled by update_stats() once an index exists
+        self.label_size_tooltip = ToolTip(self.label_size, "", scale=self.scale)
 
         self.sep_duration = tk.Frame(footer_inner, bg=COLOR_SEPARATOR, width=2)
         self.label_duration = ctk.CTkLabel(
@@ -1134,6 +1138,17 @@ class UIBuilderMixin:
             text_color=COLOR_DANGER, **_fs
         )
 
+        # Progress of a streamed full-file search; clicking it stops the search.
+        self.sep_search   = tk.Frame(footer_inner, bg=COLOR_SEPARATOR, width=2)
+        self.label_search = ctk.CTkLabel(
+            footer_inner, text="",
+            text_color=COLOR_ACCENT, cursor="hand2", **_fs
+        )
+        self.label_search.bind("<Button-1>", self.cancel_search, add="+")
+        self.label_search_tooltip = ToolTip(
+            self.label_search, l_ui.get("tip_search_cancel", ""), scale=self.scale
+        )
+
         # --- GitHub / version link in the footer (right-aligned) ---
         current_lang_str = self.current_lang.get()
         l_ui = LANGS.get(current_lang_str, LANGS["EN"])
@@ -1196,6 +1211,7 @@ class UIBuilderMixin:
             l_ui.get("tip_debug_mode", "Debug mode ON — Ctrl+Shift+D to disable"),
             scale=self.scale,
         )
+        self.lbl_debug_mode.bind("<Button-1>", self.show_perf_overlay)
 
         # --- History dropdown listbox (placed on root, shown on demand) ---
         self.history_listbox = tk.Listbox(
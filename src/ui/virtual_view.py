@@ -0,0 +1,340 @@
+# ui/virtual_view.py
+"""
+Virtualized log view.
+
+bulk_insert() used to push every matching line into the tk.Text widget.  On
+a large log that is hundreds of thousands of lines in the widget's B-tree:
+slow to insert, slow to scroll and very heavy in memory.
+
+Above VIRTUAL_VIEW_MIN_LINES the rows are kept in a row list and the
+widget only holds a window of VIRTUAL_WINDOW_LINES rows (the "window").
+Views served from the record store keep that list as line numbers (a
+LineRows, engine/record_store.py): only the rows of the window are read
+back from the file when it is rendered.
+Everything that needs to see the whole view goes through this mixin:
+
+  - the vertical scrollbar and the timeline receive *global* fractions
+    (position in the whole row list), not fractions of the window;
+  - when the visible area comes within VIRTUAL_EDGE_LINES of a window
+    edge, the window is re-rendered around it (selection, cursor and
+    horizontal position are preserved);
+  - jumps (double-click, wrap toggle, pending jump, go to time) locate
+    their row by binary search over the timestamps of the view
+    (engine/timestamps.py) and render a window around it;
+  - the live tail appends to the list and to the window when it shows the
+    end of the view;
+  - export writes every row, not only the window.
+
+Rendering reuses LogDisplayMixin._insert_rows(), so tags and keyword
+highlighting are identical to a non-virtual view.
+
+The virtual state stays attached to the widget content through the
+_ANCHOR_TAG tag on its first character: any other code that replaces the
+widget content (summary screen, "no log loaded" message, clear console...)
+removes the tag, which turns the virtual mode off without having to touch
+those call sites.
+"""
+import tkinter as tk
+
+from config import VIRTUAL_EDGE_LINES, VIRTUAL_WINDOW_LINES
+from engine.record_store import LineRows
+from engine.timestamps import TIMESTAMP_LEN, bisect_time, find_stamped_row, row_timestamp
+
+# Invisible tag marking widget content rendered by this mixin.
+_ANCHOR_TAG = "virt_anchor"
+
+# Characters read from a widget line to find its timestamp (leading blanks allowed).
+_STAMP_PROBE_CHARS = TIMESTAMP_LEN + 8
+
+
+class VirtualViewMixin:
+    """Windowed rendering of large views in txt_area."""
+
+    _virt_rows = None            # (text, tag) rows of the whole view (list or LineRows), None when inactive
+    _virt_start = 0              # Row index shown on widget line 1
+    _virt_count = 0              # Rows currently rendered in the widget
+    _virt_shift_pending = False
+
+    # ── State ─────────────────────────────────────────────────────────────
+
+    def virt_active(self):
+        """True while the text area shows a window of a virtual view."""
+        if self._virt_rows is None:
+            return False
+        if not self.txt_area.tag_ranges(_ANCHOR_TAG):
+            # The widget content was replaced by something else.
+            self.virt_reset()
+            return False
+        return True
+
+    def virt_reset(self):
+        """Leaves virtual mode (the widget content is left untouched)."""
+        self._virt_rows = None
+        self._virt_start = 0
+        self._virt_count = 0
+
+    def virt_load(self, rows, top_row=None):
+        """
+        Starts a virtual view over *rows* ((text, tag) tuples, already
+        filtered) and renders the window at its end, or around *top_row*
+        (scrolled to the top of the viewport) when given.  A pending jump
+        moves it afterwards through virt_reveal().  A list is taken over as
+        is (not copied): the caller must not modify it afterwards; so is a
+        LineRows, whose rows are only decoded for the rendered window.
+        """
+        self._virt_rows = rows if isinstance(rows, (list, LineRows)) else list(rows)
+        if top_row is None:
+            self._virt_render(len(self._virt_rows) - 1, keep_state=False)
+        else:
+            self._virt_render(top_row, top_row=top_row, keep_state=False)
+
+    def virt_text(self):
+        """Full text of the virtual view (for export)."""
+        return "".join(text for text, _ in self._virt_rows)
+
+    # ── Rendering ─────────────────────────────────────────────────────────
+
+    def _virt_render(self, center_row, top_row=None, keep_state=True):
+        """
+        Replaces the widget content with the window centred on *center_row*.
+        *top_row*, when given, is scrolled to the top of the viewport.
+        With *keep_state*, the selection and the cursor are carried over
+        from the previous window.
+        """
+        rows = self._virt_rows
+        total = len(rows)
+        start = max(0, min(total - VIRTUAL_WINDOW_LINES, center_row - VIRTUAL_WINDOW_LINES // 2))
+        end = min(total, start + VIRTUAL_WINDOW_LINES)
+
+        txt = self.txt_area
+        x = txt.xview()[0]
+        sel, cursor = [], None
+        if keep_state:
+            old_start = self._virt_start
+            sel = [self._virt_global_index(i, old_start) for i in txt.tag_ranges("sel")]
+            cursor = self._virt_global_index(txt.index(tk.INSERT), old_start)
+
+        txt.config(state=tk.NORMAL)
+        txt.delete("1.0", tk.END)
+        self._insert_rows(rows[start:end])
+        txt.tag_add(_ANCHOR_TAG, "1.0")
+        self._virt_start = start
+        self._virt_count = end - start
+
+        local = [self._virt_local_index(g) for g in sel]
+        if len(local) == 2 and None not in local:
+            txt.tag_add("sel", *local)
+        local_cursor = self._virt_local_index(cursor) if cursor else None
+        if local_cursor is not None:
+            txt.mark_set(tk.INSERT, local_cursor)
+        if top_row is not None:
+            txt.yview(f"{top_row - start + 1}.0")
+        txt.xview_moveto(x)
+
+    def _virt_global_index(self, index, start):
+        """Widget index "line.col" -> (row, col) in the whole view."""
+        line, col = str(index).split(".")
+        return int(line) - 1 + start, int(col)
+
+    def _virt_local_index(self, position):
+        """(row, col) -> widget index, or None when outside the window."""
+        row, col = position
+        row -= self._virt_start
+        if 0 <= row < self._virt_count:
+            return f"{row + 1}.{col}"
+        return None
+
+    def _virt_top_bottom(self):
+        """Window-relative row indices of the first and last visible lines."""
+        txt = self.txt_area
+        top = int(txt.index("@0,0").split(".")[0]) - 1
+        bottom = int(txt.index(f"@0,{txt.winfo_height()}").split(".")[0]) - 1
+        return top, bottom
+
+    def _virt_shift(self):
+        """Re-renders the window when the viewport is close to one of its edges."""
+        self._virt_shift_pending = False
+        if not self.virt_active():
+            return
+        try:
+            top, bottom = self._virt_top_bottom()
+        except tk.TclError:
+            return
+        start, count = self._virt_start, self._virt_count
+        near_top = top < VIRTUAL_EDGE_LINES and start > 0
+        near_bottom = (bottom >= count - VIRTUAL_EDGE_LINES
+                       and start + count < len(self._virt_rows))
+        if near_top or near_bottom:
+            self._virt_render(start + top, top_row=start + top)
+
+    # ── Scrolling (global coordinates) ────────────────────────────────────
+
+    def virt_map_fractions(self, first, last):
+        """
+        Converts the widget's yscrollcommand fractions (relative to the
+        window) into fractions of the whole view, and schedules a window
+        shift check.
+        """
+        total = len(self._virt_rows) or 1
+        start, count = self._virt_start, self._virt_count
+        if not self._virt_shift_pending:
+            self._virt_shift_pending = True
+            self.root.after_idle(self._virt_shift)
+        return ((start + float(first) * count) / total,
+                (start + float(last) * count) / total)
+
+    def log_yview(self):
+        """(top, bottom) fractions of the whole view currently visible."""
+        first, last = self.txt_area.yview()
+        if not self.virt_active():
+            return first, last
+        total = len(self._virt_rows) or 1
+        start, count = self._virt_start, self._virt_count
+        return (start + first * count) / total, (start + last * count) / total
+
+    def log_yview_command(self, *args):
+        """
+        Scrollbar command.  "moveto" targets a row of the whole view and
+        re-renders the window if needed; other commands scroll the widget
+        (and shift the window through the yscrollcommand callback).
+        """
+        if not self.virt_active() or not args or args[0] != "moveto":
+            return self.txt_area.yview(*args)
+        total = len(self._virt_rows)
+        row = max(0, min(total - 1, int(float(args[1]) * total)))
+        start, count = self._virt_start, self._virt_count
+        inside = ((start == 0 or row >= start + VIRTUAL_EDGE_LINES)
+                  and (start + count == total or row < start + count - VIRTUAL_EDGE_LINES))
+        if not inside:
+            self._virt_render(row)
+        self.txt_area.yview(f"{row - self._virt_start + 1}.0")
+
+    def log_see_row(self, row):
+        """
+        Scrolls to *row* (0-based, whole view) and puts the cursor on it.
+        Returns the widget index of the start of the row.
+        """
+        if self.virt_active():
+            if not self._virt_start <= row < self._virt_start + self._virt_count:
+                self._virt_render(row)
+            row -= self._virt_start
+        self.txt_area.see(f"{row + 1}.0")
+        self.txt_area.mark_set(tk.INSERT, f"{row + 1}.0")
+        return f"{row + 1}.0"
+
+    # ── Jumps ─────────────────────────────────────────────────────────────
+
+    def view_rows(self):
+        """
+        (count, stamp_at, text_at) over the rows of the whole view: the row
+        list in virtual mode, the widget lines otherwise.  stamp_at(i) is the
+        timestamp of row i, or None for a continuation line.
+        """
+        if self.virt_active():
+            rows = self._virt_rows
+            return len(rows), lambda i: row_timestamp(rows[i][0]), lambda i: rows[i][0]
+        get = self.txt_area.get
+        count = int(self.txt_area.index("end-1c").split(".")[0])
+        return (
+            count,
+            lambda i: row_timestamp(get(f"{i + 1}.0", f"{i + 1}.{_STAMP_PROBE_CHARS}")),
+            lambda i: get(f"{i + 1}.0", f"{i + 1}.0 lineend"),
+        )
+
+    def find_time_row(self, target, content=None):
+        """
+        Row (whole view) stamped *target* and containing *content*, when
+        given, or None.  Binary search over the timestamps of the view; a
+        linear scan only when the view is not in time order (rows sorted by
+        level).
+        """
+        count, stamp_at, text_at = self.view_rows()
+        row = find_stamped_row(count, stamp_at, text_at, target, content)
+        if row is None:
+            for i in range(count):
+                text = text_at(i)
+                if target in text and (content is None or content in text):
+                    return i
+        return row
+
+    def time_row_at_or_after(self, target):
+        """
+        Row (whole view) of the first line stamped at or after *target*, the
+        last row when the view ends earlier, or None for an empty view.
+        """
+        count, stamp_at, _ = self.view_rows()
+        if not count:
+            return None
+        return min(bisect_time(count, stamp_at, target), count - 1)
+
+    def virt_find_row(self, target, content=None):
+        """
+        Index of the first row containing *target* (and *content*, when
+        given), or None.  Timestamps are found by binary search.
+        """
+        if row_timestamp(target) == target:
+            return self.find_time_row(target, content)
+        for i, (text, _) in enumerate(self._virt_rows):
+            if target in text and (content is None or content in text):
+                return i
+        return None
+
+    def virt_reveal(self, target, content=None):
+        """
+        Makes sure the row matching *target* / *content* is rendered, so the
+        caller's widget search finds it.  No-op outside virtual mode.
+        """
+        if not self.virt_active():
+            return
+        row = self.virt_find_row(target, content)
+        if row is None:
+            return
+        start, count = self._virt_start, self._virt_count
+        if not (start + VIRTUAL_EDGE_LINES <= row < start + count - VIRTUAL_EDGE_LINES
+                or (start == 0 and row < count)
+                or (start + count == len(self._virt_rows) and row >= start)):
+            self._virt_render(row)
+
+    # ── Live tail ─────────────────────────────────────────────────────────
+
+    def virt_append(self, batch, follow=True):
+        """
+        Appends rows (live tail, streamed search chunks).  With *follow*,
+        when the window shows the end of the view they are inserted in the
+        widget and the oldest window lines beyond VIRTUAL_WINDOW_LINES +
+        VIRTUAL_EDGE_LINES are dropped; otherwise the window is re-rendered
+        at the new end.  Without *follow* (paused, or scrolled up to read
+        earlier rows) the window stays as it is and only the scrollbar and
+        the timeline viewport learn that the view grew.
+        """
+        rows = self._virt_rows
+        at_end = self._virt_start + self._virt_count == len(rows)
+        rows.extend(batch)
+        if not follow:
+            self._timeline_yscroll(*self.txt_area.yview())
+            return
+        if not at_end:
+            self._virt_render(len(rows) - 1)
+            return
+        self._insert_rows(batch)
+        self._virt_count += len(batch)
+        excess = self._virt_count - (VIRTUAL_WINDOW_LINES + VIRTUAL_EDGE_LINES)
+        if excess > 0:
+            self.txt_area.delete("1.0", f"{excess + 1}.0")
+            self.txt_area.tag_add(_ANCHOR_TAG, "1.0")
+            self._virt_start += excess
+            self._virt_count -= excess
+
+    def virt_trim(self, excess):
+        """Drops the *excess* oldest rows of the view (display cap)."""
+        del self._virt_rows[:excess]
+        self._virt_start -= excess
+        if self._virt_start < 0:
+            gone = min(-self._virt_start, self._virt_count)
+            self.txt_area.delete("1.0", f"{gone + 1}.0")
+            self._virt_count -= gone
+            self._virt_start = 0
+            if self._virt_count <= 0:
+                self._virt_render(len(self._virt_rows) - 1)
+            else:
+                self.txt_area.tag_add(_ANCHOR_TAG, "1.0")
@@ -0,0 +1,32 @@
+"""
+Shared pytest setup: the application runs from src/ (``from engine import
+...``), so the tests import its modules the same way.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from benchmarks.kodilog import write_log  # noqa: E402  (needs the path above)
+
+# Size of the synthetic log used by the engine tests: large enough for
+# tracebacks, dumps and NUL padding, small enough to stay fast.
+SYNTHETIC_LOG_BYTES = 400 * 1024
+
+
+@pytest.fixture(scope="session")
+def kodi_log(tmp_path_factory):
+    """Path of a synthetic Kodi log (benchmarks/kodilog.py, fixed seed)."""
+    path = tmp_path_factory.mktemp("logs") / "kodi.log"
+    write_log(str(path), SYNTHETIC_LOG_BYTES, seed=3)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def kodi_lines(kodi_log):
+    """The lines of kodi_log, read like the application reads them."""
+    from engine.line_index import decode_lines
+    with open(kodi_log, "rb") as f:
+        return decode_lines(f.read())
@@ -0,0 +1,109 @@
+"""Tests of the shared line classifier (engine/classifier.py)."""
+import pytest
+
+from engine.classifier import BLANK_CHARS, TS_RE, FilterSnapshot, detect_level, get_classifier
+
+LINES = [
+    "2024-05-01 10:00:00.000 T:1    info <general>: Starting Kodi\n",
+    "2024-05-01 10:00:00.001 T:1    info <general>: --------------------------------\n",
+    "2024-05-01 10:00:01.000 T:2   error <general>: EXCEPTION Thrown (PythonToCppException)\n",
+    "  File \"addon.py\", line 3, in <module>\n",
+    "    ValueError: bad skin\n",
+    "2024-05-01 10:00:02.000 T:3   debug <CCurlFile>: request timeout\n",
+    "\t  dump: cache 12\n",
+    "\x00\x00\x00\n",
+    "  continuation after a blank line\n",
+    "2024-05-01 10:00:03.000 T:4 warning <CAddonMgr>: addon skin failed\n",
+    "2024-05-01 10:00:04.000 T:4 CRITICAL <general>: out of memory\n",
+    "2024-05-01 10:00:05.000 T:4 notice <general>: untagged line\n",
+]
+
+
+def _run(lines=LINES, **filters):
+    rows, _ = get_classifier(FilterSnapshot(**filters)).run(lines)
+    return rows
+
+
+@pytest.mark.parametrize("line, tag", [
+    ("2024-05-01 10:00:00.000 t:1    info <general>: x", "info"),
+    ("2024-05-01 10:00:00.000 t:1 warning <general>: x", "warning"),
+    ("2024-05-01 10:00:00.000 t:1   error <general>: x", "error"),
+    ("2024-05-01 10:00:00.000 t:1 critical <general>: x", "error"),
+    ("2024-05-01 10:00:00.000 t:1   debug <general>: x", "debug"),
+    ("2024-05-01 10:00:00.000 t:1  notice <general>: x", None),
+    ("2024-05-01 10:00:00.000 t:1 <general>: information", None),
+])
+def test_detect_level(line, tag):
+    assert detect_level(line) == tag
+
+
+def test_no_filter_skips_blank_and_dash_lines_only():
+    rows = _run()
+    assert [text for text, _ in rows] == [
+        LINES[0], LINES[2], LINES[3], LINES[4], LINES[5], LINES[6],
+        LINES[9], LINES[10], LINES[11],
+    ]
+    assert [tag for _, tag in rows] == [
+        "info", "error", None, None, "debug", None, "warning", "error", None,
+    ]
+
+
+def test_continuations_follow_their_parent():
+    rows = _run(filter_all=False, active_tags=frozenset({"error"}))
+    assert [text for text, _ in rows] == [LINES[2], LINES[3], LINES[4], LINES[10]]
+
+
+def test_excluded_continuation_is_dropped_alone():
+    rows = _run(excludes=("valueerror",))
+    texts = [text for text, _ in rows]
+    assert LINES[2] in texts and LINES[3] in texts
+    assert LINES[4] not in texts
+
+
+def test_excluded_parent_hides_its_continuations():
+    rows = _run(excludes=("exception",))
+    texts = [text for text, _ in rows]
+    assert not {LINES[2], LINES[3], LINES[4]} & set(texts)
+
+
+def test_query_keywords_and_expression():
+    assert [t for t, _ in _run(query="skin")] == [LINES[9]]
+    assert [t for t, _ in _run(keywords=("curl", "memory"))] == [LINES[5], LINES[6], LINES[10]]
+    assert [t for t, _ in _run(expr="level:warn OR component:ccurlfile")] == [
+        LINES[5], LINES[6], LINES[9]]
+
+
+def test_parent_visible_carries_across_batches():
+    classifier = get_classifier(FilterSnapshot())
+    rows, visible = classifier.run(LINES[:3])
+    assert visible
+    rows, visible = classifier.run(LINES[3:5], visible)
+    assert [t for t, _ in rows] == LINES[3:5]
+    rows, _ = classifier.run(LINES[3:5], parent_visible=False)
+    assert rows == []
+
+
+def test_duplicates_and_stop():
+    seen = set()
+
+    def is_duplicate(line):
+        if line[24:] in seen:
+            return True
+        seen.add(line[24:])
+        return False
+
+    lines = [LINES[0], LINES[0].replace("10:00:00.000", "10:00:09.000")]
+    rows, _ = get_classifier(FilterSnapshot()).run(lines, is_duplicate=is_duplicate)
+    assert rows == [(LINES[0], "info")]
+    assert get_classifier(FilterSnapshot()).run(LINES * 1000, should_stop=lambda: True) is None
+
+
+def test_classify_matches_run_on_timestamped_lines(kodi_lines):
+    snapshot = FilterSnapshot(filter_all=False, active_tags=frozenset({"error", "warning"}),
+                              query="a")
+    classifier = get_classifier(snapshot)
+    rows, _ = classifier.run(kodi_lines)
+    stamped = [row for row in rows if row[1] is not None]
+    classified = [classifier.classify(line) for line in kodi_lines
+                  if TS_RE.match(line.strip(BLANK_CHARS))]
+    assert stamped == [row for row in classified if row is not None and row[1] is not None]
@@ -0,0 +1,123 @@
+"""Tests of the live-tail hand-off buffer (engine/dispatcher.py)."""
+import threading
+
+from engine.dispatcher import BATCH_MAX, BATCH_MIN, TailDispatcher
+
+
+class FakeUI:
+    """Collects scheduled callbacks; run() plays the UI thread."""
+
+    def __init__(self, shown=None):
+        self.callbacks = []
+        self.delivered = []
+        self.shown = shown          # Rows displayed per delivery (None: all)
+
+    def schedule(self, fn):
+        self.callbacks.append(fn)
+
+    def deliver(self, rows):
+        self.delivered.append(list(rows))
+        return len(rows) if self.shown is None else self.shown
+
+    def run(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for fn in callbacks:
+            fn()
+
+
+def test_pushes_are_coalesced_into_one_drain():
+    ui = FakeUI()
+    dispatcher = TailDispatcher(ui.schedule, ui.deliver)
+    dispatcher.push([1, 2])
+    dispatcher.push([])
+    dispatcher.push([3])
+    assert len(ui.callbacks) == 1
+    assert dispatcher.backlog == 3
+    assert not dispatcher.wait_drained(0)
+
+    ui.run()
+    assert ui.delivered == [[1, 2, 3]]
+    assert dispatcher.wait_drained(0)
+    stats = dispatcher.stats()
+    assert (stats["pushes"], stats["coalesced"], stats["drains"]) == (2, 1, 1)
+    assert (stats["rows_delivered"], stats["backlog"], stats["max_backlog"]) == (3, 0, 3)
+
+    dispatcher.push([4])
+    assert len(ui.callbacks) == 1       # A new drain once the previous one ran
+
+
+def test_rows_not_shown_count_as_dropped():
+    ui = FakeUI(shown=0)
+    dispatcher = TailDispatcher(ui.schedule, ui.deliver)
+    dispatcher.push(list(range(10)))
+    ui.run()
+    assert dispatcher.rows_delivered == 0
+    assert dispatcher.rows_dropped == 10
+
+
+def test_discard_and_close():
+    ui = FakeUI()
+    dispatcher = TailDispatcher(ui.schedule, ui.deliver)
+    dispatcher.push([1, 2])
+    dispatcher.discard()
+    ui.run()
+    assert ui.delivered == []
+    assert dispatcher.rows_dropped == 2
+
+    dispatcher.push([3])
+    dispatcher.close()
+    dispatcher.push([4])
+    ui.run()
+    assert ui.delivered == []
+    assert dispatcher.rows_dropped == 4
+    assert dispatcher.wait_drained(0)
+
+
+def test_schedule_failure_closes_the_dispatcher():
+    def schedule(fn):
+        raise RuntimeError("main thread is not in main loop")
+
+    dispatcher = TailDispatcher(schedule, lambda rows: len(rows))
+    dispatcher.push([1])
+    assert dispatcher.wait_drained(0)
+    dispatcher.push([2])
+    assert dispatcher.rows_dropped == 1
+
+
+def test_batch_size_adapts_to_the_drain_cost(monkeypatch):
+    import engine.dispatcher as dispatcher_module
+
+    clock = [0.0]
+    monkeypatch.setattr(dispatcher_module.time, "perf_counter", lambda: clock[0])
+
+    def slow_deliver(rows):
+        clock[0] += 0.01 * len(rows)    # 10 ms per row
+        return len(rows)
+
+    ui = FakeUI()
+    dispatcher = TailDispatcher(ui.schedule, slow_deliver)
+    for _ in range(20):
+        dispatcher.push([0] * 100)
+        ui.run()
+    assert dispatcher.batch_size == BATCH_MIN
+
+    def fast_deliver(rows):
+        clock[0] += 0.000001 * len(rows)
+        return len(rows)
+
+    dispatcher = TailDispatcher(ui.schedule, fast_deliver)
+    for _ in range(20):
+        dispatcher.push([0] * 100)
+        ui.run()
+    assert dispatcher.batch_size == BATCH_MAX
+
+
+def test_wait_drained_releases_the_monitor_thread():
+    ui = FakeUI()
+    dispatcher = TailDispatcher(ui.schedule, ui.deliver)
+    dispatcher.push([1])
+    waiter = threading.Thread(target=dispatcher.wait_drained, args=(5,))
+    waiter.start()
+    ui.run()
+    waiter.join(5)
+    assert not waiter.is_alive()
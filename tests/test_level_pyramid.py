@@ -0,0 +1,112 @@
+"""Tests of the timeline severity pyramid (engine/level_pyramid.py)."""
+import random
+
+from engine.level_pyramid import SEVERITY, SEVERITY_TAGS, LevelPyramid
+
+TAGS = ("debug", "info", "warning", "error", None, "debug", "info", "debug")
+
+
+def _codes(tags):
+    return [SEVERITY.get(tag, 0) for tag in tags]
+
+
+def _check_ranges(pyramid, codes, rnd, probes=200):
+    n = len(codes)
+    assert len(pyramid) == n
+    assert [pyramid.code_at(i) for i in range(n)] == codes
+    for _ in range(probes):
+        first = rnd.randrange(n + 1)
+        last = rnd.randint(first, n)
+        assert pyramid.range_max(first, last) == max(codes[first:last], default=0)
+
+
+def test_empty():
+    pyramid = LevelPyramid()
+    assert len(pyramid) == 0
+    assert pyramid.range_max(0, 0) == 0
+
+
+def test_extend_in_batches_matches_one_build():
+    rnd = random.Random(1)
+    tags = [rnd.choice(TAGS) for _ in range(3000)]
+    pyramid = LevelPyramid()
+    i = 0
+    while i < len(tags):
+        step = rnd.randint(1, 300)
+        pyramid.extend(tags[i:i + step])
+        i += step
+    _check_ranges(pyramid, _codes(tags), rnd)
+    assert [pyramid.tag_at(i) for i in range(10)] == [
+        tag if tag in SEVERITY else None for tag in tags[:10]]
+    assert SEVERITY_TAGS[pyramid.code_at(0)] == pyramid.tag_at(0)
+
+
+def test_trim_then_extend():
+    rnd = random.Random(2)
+    pyramid = LevelPyramid()
+    codes = []
+    for _ in range(60):
+        tags = [rnd.choice(TAGS) for _ in range(rnd.randint(0, 400))]
+        pyramid.extend(tags)
+        codes.extend(_codes(tags))
+        count = rnd.randint(0, len(codes) // 2 + 10)
+        pyramid.trim(count)
+        del codes[:count]
+        _check_ranges(pyramid, codes, rnd, probes=20)
+
+
+def test_trim_everything_and_clear():
+    pyramid = LevelPyramid(["error", "info"])
+    pyramid.trim(10)
+    assert len(pyramid) == 0
+    pyramid.extend(["warning"])
+    assert pyramid.range_max(0, 1) == SEVERITY["warning"]
+    pyramid.clear()
+    assert len(pyramid) == 0
+    pyramid.extend(["debug"])
+    assert pyramid.tag_at(0) == "debug"
+
+
+def _counts(codes):
+    return tuple(codes.count(c) for c in range(len(SEVERITY_TAGS)))
+
+
+def test_counts_across_blocks_and_trims():
+    rnd = random.Random(3)
+    pyramid = LevelPyramid()
+    codes = []
+    for _ in range(30):
+        tags = [rnd.choice(TAGS) for _ in range(rnd.randint(0, 700))]
+        pyramid.extend(tags)
+        codes.extend(_codes(tags))
+        if rnd.random() < 0.3:
+            count = rnd.randint(0, len(codes))
+            pyramid.trim(count)
+            del codes[:count]
+        n = len(codes)
+        for _ in range(20):
+            first = rnd.randrange(n + 1)
+            last = rnd.randint(first, n)
+            assert pyramid.counts(first, last) == _counts(codes[first:last])
+
+
+def test_bucket_max(monkeypatch):
+    import engine.level_pyramid as level_pyramid
+
+    monkeypatch.setattr(level_pyramid, "_np", None)     # Pure-Python path
+    rnd = random.Random(4)
+    tags = [rnd.choice(TAGS) for _ in range(1000)]
+    codes = _codes(tags)
+    pyramid = LevelPyramid(tags)
+    pyramid.trim(37)
+    del codes[:37]
+    n = len(codes)
+    starts = [y * n // 150 for y in range(150)]
+    ends = starts[1:] + [n]
+    assert pyramid.bucket_max(starts) == [
+        max(codes[s:e]) if e > s else codes[s] for s, e in zip(starts, ends)]
+    # More buckets than lines: repeated starts hold one line each.
+    starts = [y * 10 // 25 for y in range(25)]
+    assert pyramid.bucket_max(starts)[:3] == [codes[0], codes[0], codes[0]]
+    assert pyramid.bucket_max([]) == []
+    assert LevelPyramid().bucket_max([0]) == []
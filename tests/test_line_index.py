@@ -0,0 +1,105 @@
+"""Tests of the byte-offset line index (engine/line_index.py)."""
+import os
+
+import pytest
+
+from engine.line_index import LineIndex, decode_lines, read_tail_lines
+
+
+def _write(path, data, mode="wb"):
+    with open(path, mode) as f:
+        f.write(data)
+
+
+def _index(path):
+    index = LineIndex(str(path))
+    index.sync()
+    return index
+
+
+def test_decode_lines_folds_crlf_and_ignores_bad_bytes():
+    block = b"a\r\nb\xff\nc\rd\n"
+    assert decode_lines(block) == ["a\n", "b\n", "c\rd\n"]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "kodi.log"
+    _write(path, b"")
+    index = _index(path)
+    assert len(index) == 0
+    assert index.line_count(0) == 0
+    assert index.read_lines(0) == []
+    assert index.read_rows([]) == []
+    assert index.offset_of(0) == 0
+    assert read_tail_lines(str(path), 10) == ([], 0)
+
+
+def test_partial_last_line_is_indexed_once_complete(tmp_path):
+    path = tmp_path / "kodi.log"
+    _write(path, b"one\ntwo\nthr")
+    index = _index(path)
+    assert len(index) == 2
+    assert index.indexed_bytes == 8
+    assert index.line_count(os.path.getsize(path)) == 3
+    assert index.read_lines(0) == ["one\n", "two\n"]
+
+    _write(path, b"ee\nfour\n", "ab")
+    assert index.sync(collect=True) == ["three\n", "four\n"]
+    assert len(index) == 4
+    assert index.line_count(os.path.getsize(path)) == 4
+    assert index.offset_of(2) == 8
+    assert index.offset_of(4) == index.indexed_bytes == os.path.getsize(path)
+    assert index.line_at_offset(9) == 3
+
+
+def test_truncation_and_replacement_reset_the_index(tmp_path):
+    path = tmp_path / "kodi.log"
+    _write(path, b"one\ntwo\nthree\n")
+    index = _index(path)
+    generation = index.generation
+
+    _write(path, b"new\n")                       # Truncated below the indexed size
+    assert index.sync(collect=True) == ["new\n"]
+    assert index.generation == generation + 1
+    assert index.read_lines(0) == ["new\n"]
+
+    other = tmp_path / "kodi.new"
+    _write(other, b"new\nlonger file\n")
+    os.replace(other, path)                      # Same size or larger, other inode
+    index.sync()
+    assert index.generation == generation + 2
+    assert index.read_lines(0) == ["new\n", "longer file\n"]
+
+
+def test_collect_matches_the_whole_file(kodi_log, kodi_lines):
+    index = LineIndex(kodi_log)
+    assert index.sync(collect=True) == kodi_lines
+    assert len(index) == len(kodi_lines)
+
+
+def test_read_lines_and_rows_match_the_file(kodi_log, kodi_lines):
+    index = _index(kodi_log)
+    n = len(kodi_lines)
+    assert index.read_lines(0) == kodi_lines
+    assert index.read_lines(n - 5, n + 10) == kodi_lines[n - 5:]
+    assert index.read_lines(10, 10) == []
+
+    wanted = [0, 1, 2, n // 4, n // 4 + 1, n // 2, n - 1]
+    assert index.read_rows(wanted) == [kodi_lines[i] for i in wanted]
+    every_third = list(range(0, n, 3))
+    assert index.read_rows(every_third) == kodi_lines[::3]
+
+
+@pytest.mark.parametrize("count", [1, 7, 1000, 10**9])
+def test_read_tail_lines(kodi_log, kodi_lines, count):
+    lines, end = read_tail_lines(kodi_log, count)
+    assert lines == kodi_lines[-count:]
+    assert end == os.path.getsize(kodi_log)
+
+
+def test_read_tail_lines_stops_before_a_partial_line(tmp_path):
+    path = tmp_path / "kodi.log"
+    _write(path, b"one\ntwo\npartial")
+    assert read_tail_lines(str(path), 5) == (["one\n", "two\n"], 8)
+    _write(path, b"no newline yet")
+    assert read_tail_lines(str(path), 5) == ([], 0)
@@ -0,0 +1,42 @@
+"""Tests of the keyword / exclusion list matcher (engine/matcher.py)."""
+import random
+import re
+
+import pytest
+
+from engine.matcher import _LINEAR_MAX, KeywordMatcher, get_matcher, trie_pattern
+
+
+def test_trie_pattern_factors_prefixes():
+    assert trie_pattern(["abc", "abd", "ab"]) == "ab(?:c|d)?"
+    assert re.fullmatch(trie_pattern(["a.b", "a+"]), "a.b")
+    assert not re.fullmatch(trie_pattern(["a.b"]), "axb")
+
+
+def test_empty_and_duplicate_patterns():
+    matcher = KeywordMatcher(["", "skin", "skin"])
+    assert len(matcher) == 1 and matcher
+    assert not KeywordMatcher([])
+    assert not KeywordMatcher([]).matches("anything")
+    assert list(KeywordMatcher([]).finditer("anything")) == []
+
+
+@pytest.mark.parametrize("size", [3, _LINEAR_MAX + 1, 500])
+def test_matches_like_a_substring_loop(kodi_lines, size):
+    rnd = random.Random(size)
+    words = sorted({w for line in kodi_lines[:2000] for w in line.lower().split()
+                    if 3 <= len(w) <= 12})
+    patterns = rnd.sample(words, min(size, len(words))) + ["no such keyword"]
+    matcher = get_matcher(tuple(patterns))
+    for line in kodi_lines[:3000]:
+        low = line.lower()
+        assert matcher.matches(low) == any(p in low for p in patterns)
+
+
+def test_finditer_prefers_the_longest_pattern():
+    matcher = KeywordMatcher(["curl", "ccurlfile", "ccurl"])
+    assert [m.group() for m in matcher.finditer("<ccurlfile>: curl")] == ["ccurlfile", "curl"]
+
+
+def test_get_matcher_is_cached():
+    assert get_matcher(("a", "b")) is get_matcher(("a", "b"))
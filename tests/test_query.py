@@ -0,0 +1,84 @@
+"""Tests of the search bar query language (engine/query.py)."""
+import pytest
+
+from engine.query import QueryError, get_query, is_query_syntax, split_search_text
+
+LINE = "2024-05-01 10:15:42.123 t:1234   error <ccurlfile>: ccurlfile::stat - failed: timeout was reached(28)\n"
+
+
+@pytest.mark.parametrize("text", [
+    "/addons/",                          # a path
+    "special://home/addons/",
+    "/timeout \\d+/",                    # regex without the re: prefix
+    "time:",                             # field without a value
+    "level:",
+    'component:""',
+    "http://paste.kodi.tv/abc",
+    "curl e",
+    "-1",
+    "",
+    "   ",
+])
+def test_plain_text_stays_a_substring(text):
+    assert not is_query_syntax(text)
+    assert split_search_text(text) == (text.strip().lower(), "")
+
+
+@pytest.mark.parametrize("text", [
+    "level:error",
+    "LEVEL:warn",
+    "component:curl",
+    "time:10:00..10:30",
+    'time:"2024-05-01 10:00.."',
+    "re:/timeout \\d+/",
+    "RE:/x/",
+    "curl OR video",
+    "curl | video",
+    "NOT debug",
+])
+def test_query_syntax_is_detected(text):
+    assert is_query_syntax(text)
+
+
+def test_syntax_error_falls_back_to_plain_text():
+    assert split_search_text("level:nosuchlevel") == ("level:nosuchlevel", "")
+    with pytest.raises(QueryError):
+        get_query("level:nosuchlevel")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("level:error", True),
+    ("level:warning", False),
+    ("level:error,warning", True),
+    ("component:curl", True),
+    ("component:video", False),
+    ("time:10:15", True),
+    ("time:10:00..10:15", True),
+    ("time:10:16..", False),
+    ('time:"2024-05-01 10:00..2024-05-01 11:00"', True),
+    ("re:/reached\\(\\d+\\)/", True),
+    ("re:/^debug/", False),
+    ("timeout AND curl", True),
+    ("timeout missing", False),
+    ("missing OR timeout", True),
+    ("NOT timeout", False),
+    ("-timeout", False),
+    ('"was reached"', True),
+    ("(missing OR stat) level:error", True),
+])
+def test_match(text, expected):
+    assert get_query(text).match(LINE) is expected
+
+
+def test_required_literals():
+    assert get_query("curl timeout").required == ("curl", "timeout")
+    # A literal is only required by an OR when every branch requires it.
+    assert get_query("curl OR video").required == ()
+    assert get_query("(curl stat) OR (curl open)").required == ("curl",)
+    assert get_query("NOT curl").required == ()
+
+
+@pytest.mark.parametrize("text", ["(curl", "curl)", "OR curl", "re:/[/", "time:xx"])
+def test_invalid_queries(text):
+    with pytest.raises(QueryError):
+        get_query(text)
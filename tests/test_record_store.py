@@ -0,0 +1,144 @@
+"""Tests of the columnar record store (engine/record_store.py)."""
+import os
+
+import pytest
+
+from engine.classifier import CODE_CONT, CODE_SKIP, FilterSnapshot, get_classifier
+from engine.line_index import LineIndex
+from engine.record_store import LineRows, RecordStore, parse_stamp
+
+SNAPSHOTS = [
+    FilterSnapshot(),
+    FilterSnapshot(filter_all=False, active_tags=frozenset({"error"})),
+    FilterSnapshot(filter_all=False, active_tags=frozenset({"info", "warning"})),
+    FilterSnapshot(query="timeout"),
+    FilterSnapshot(keywords=("skin", "json")),
+    FilterSnapshot(excludes=("debug", "cache")),
+    FilterSnapshot(expr="level:error OR re:/buffer \\w+/"),
+]
+
+
+@pytest.fixture()
+def store(kodi_log, kodi_lines):
+    index = LineIndex(kodi_log)
+    index.sync()
+    store = RecordStore(index)
+    store.ingest(kodi_lines, 0)
+    return store
+
+
+def test_parse_stamp():
+    assert parse_stamp("1970-01-01 00:00:00.000") == 0
+    assert parse_stamp("1970-01-02 01:02:03.004 T:1 info") == 86_400_000 + 3_723_004
+    assert parse_stamp("2024-05-01 garbage") == 0
+
+
+@pytest.mark.parametrize("snapshot", SNAPSHOTS)
+def test_select_equals_run(store, kodi_lines, snapshot):
+    classifier = get_classifier(snapshot)
+    n = len(kodi_lines)
+    assert store.select(classifier, 0, n) == classifier.run(kodi_lines)[0]
+    # A range starting on a continuation line: its parent is outside.
+    first = next(i for i in range(n // 2, n) if store.level[i] == CODE_CONT)
+    assert store.select(classifier, first, n) == classifier.run(kodi_lines[first:])[0]
+
+
+@pytest.mark.parametrize("snapshot", SNAPSHOTS)
+def test_numbered_select_decodes_to_the_same_rows(store, kodi_lines, snapshot):
+    classifier = get_classifier(snapshot)
+    first, n = 7, len(kodi_lines)
+    rows = store.select(classifier, first, n)
+    numbered = store.select(classifier, first, n, numbered=True)
+    assert isinstance(numbered, LineRows)
+    assert len(numbered) == len(rows)
+    assert list(numbered) == rows
+    assert numbered.tags() == [tag for _, tag in rows]
+    assert list(numbered.timestamps()) == [store.stamp[n] for n in numbered.lines]
+
+
+def test_line_rows_from_run(store, kodi_lines):
+    classifier = get_classifier(FilterSnapshot(filter_all=False,
+                                               active_tags=frozenset({"warning", "error"})))
+    rows = classifier.run(kodi_lines)[0]
+    numbered = LineRows.from_run(store.index, 0, kodi_lines, rows)
+    selected = store.select(classifier, 0, len(kodi_lines), numbered=True)
+    assert list(numbered.lines) == list(selected.lines)
+    assert numbered.codes == selected.codes
+    assert numbered.stamps == selected.stamps
+
+
+def test_line_rows_sequence(store, kodi_lines):
+    rows = store.select(get_classifier(FilterSnapshot()), 0, len(kodi_lines))
+    numbered = store.select(get_classifier(FilterSnapshot()), 0, len(kodi_lines),
+                            numbered=True)
+    tail = [("2099-01-01 00:00:00.000 T:1 info <general>: late\n", "info"),
+            ("   continued\n", None)]
+    numbered.extend(tail)
+    rows = rows + tail
+    n = len(rows)
+    assert len(numbered) == n
+    assert numbered[0] == rows[0] and numbered[-1] == rows[-1] and numbered[n - 3] == rows[n - 3]
+    for first, last in ((0, 10), (n - 5, n), (n - 2, n + 4), (100, 100), (-4, -1)):
+        assert numbered[first:last] == rows[first:last]
+    with pytest.raises(IndexError):
+        numbered[n]
+
+    del numbered[:n - 3]
+    del rows[:n - 3]
+    assert list(numbered) == rows
+    del numbered[:2]
+    assert list(numbered) == rows[2:]
+    with pytest.raises(ValueError):
+        del numbered[1:]
+
+
+def test_columns(tmp_path):
+    path = tmp_path / "kodi.log"
+    lines = [
+        "2024-05-01 10:00:00.000 T:1   error <general>: EXCEPTION\n",
+        "  Traceback line\n",
+        "\n",
+        "  orphan\n",
+        "2024-05-01 10:00:01.500 T:1 notice <general>: untagged\n",
+    ]
+    path.write_text("".join(lines))
+    index = LineIndex(str(path))
+    index.sync()
+    store = RecordStore(index)
+    store.ingest(lines[:2], 0)
+    store.ingest(lines[2:], 2)          # Continuation state carried over
+    assert list(store.level) == [3, CODE_CONT, CODE_SKIP, CODE_CONT, 0]
+    assert list(store.parent) == [-1, 0, -1, -1, -1]
+    assert store.stamp[1] == 0 and store.stamp[4] - store.stamp[0] == 1500
+    assert store.covers(0, 5) and not store.covers(0, 6)
+
+
+def test_gap_restarts_the_store(store, kodi_lines):
+    n = len(kodi_lines)
+    store.ingest(kodi_lines[-3:], n + 10)
+    assert (store.base, store.end) == (n + 10, n + 13)
+
+
+def test_span_ms(store, kodi_lines):
+    stamps = [s for s in store.stamp if s]
+    assert store.first_stamp == stamps[0]
+    assert store.last_stamp == stamps[-1]
+    assert store.span_ms() == stamps[-1] - stamps[0]
+
+
+def test_span_ms_is_unknown_after_a_reset(tmp_path):
+    path = tmp_path / "kodi.log"
+    path.write_text("2024-05-01 10:00:00.000 T:1 info <general>: a\n"
+                    "2024-05-01 10:00:02.000 T:1 info <general>: b\n")
+    index = LineIndex(str(path))
+    lines = index.sync(collect=True)
+    store = RecordStore(index)
+    store.ingest(lines[1:], 1)                       # Window not starting at line 0
+    assert store.span_ms() is None
+    store.set_first_stamp(lines[0][:23])
+    assert store.span_ms() == 2000
+
+    os.remove(path)
+    path.write_text("2024-05-01 11:00:00.000 T:1 info <general>: c\n")
+    index.sync()                                     # New file: new generation
+    assert store.span_ms() is None
@@ -0,0 +1,173 @@
+"""Tests of the raw-bytes full-file search (engine/search.py)."""
+import mmap
+
+import pytest
+
+import engine.search as search
+from engine.classifier import FilterSnapshot, get_classifier
+from engine.search import scan_bytes, scan_file, shutdown_pool, split_chunks
+
+SNAPSHOTS = [
+    FilterSnapshot(),
+    FilterSnapshot(query="timeout"),
+    FilterSnapshot(query="nonetype"),                   # Only on traceback continuations
+    FilterSnapshot(query="e", filter_all=False, active_tags=frozenset({"debug"})),
+    FilterSnapshot(query="stream", excludes=("player",)),
+    FilterSnapshot(query="zzz not there"),
+    FilterSnapshot(query="rpc", keywords=("json", "skin")),
+    FilterSnapshot(expr="component:ccurlfile AND re:/timeout \\w+/"),
+]
+
+
+@pytest.fixture()
+def small_chunks(monkeypatch):
+    """Chunks of a few KB, so the synthetic log spans many of them."""
+    monkeypatch.setattr(search, "_CHUNK_BYTES", 16 * 1024)
+    monkeypatch.setattr(search, "_FIRST_CHUNK_BYTES", 1024)
+
+
+def _expected(kodi_lines, snapshot):
+    return get_classifier(snapshot).run(kodi_lines)[0]
+
+
+def test_split_chunks_start_on_timestamped_lines(kodi_log):
+    with open(kodi_log, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        chunks = split_chunks(buf, 0, len(buf), 8192, first_bytes=512)
+        assert chunks[0][0] == 0 and chunks[-1][1] == len(buf)
+        assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+        assert chunks[0][1] - chunks[0][0] < 8192
+        for first, _ in chunks[1:]:
+            assert buf[first - 1:first] == b"\n"
+            assert buf[first:first + 4].isdigit() or buf[first:first + 1] in b" \t\r\x00"
+    assert split_chunks(b"", 0, 0) == [(0, 0)]
+
+
+@pytest.mark.parametrize("snapshot", SNAPSHOTS)
+def test_scan_bytes_equals_run(kodi_log, kodi_lines, snapshot):
+    with open(kodi_log, "rb") as f:
+        raw = f.read()
+    assert scan_bytes(raw, snapshot) == get_classifier(snapshot).run(kodi_lines)
+
+
+def test_scan_bytes_continues_a_message_from_the_previous_chunk():
+    raw = (b"  File \"addon.py\", line 3, in timeout\n"
+           b"2024-05-01 10:00:00.000 T:1   error <general>: timeout\n"
+           b"  more timeout\n")
+    snapshot = FilterSnapshot(query="timeout")
+    rows, visible = scan_bytes(raw, snapshot, parent_visible=True)
+    assert [tag for _, tag in rows] == [None, "error", None]
+    assert visible
+    rows, _ = scan_bytes(raw, snapshot, parent_visible=False)
+    assert len(rows) == 2
+
+
+@pytest.mark.parametrize("snapshot", SNAPSHOTS)
+def test_scan_file_equals_run(kodi_log, kodi_lines, snapshot, small_chunks):
+    chunks = []
+    result = scan_file(kodi_log, snapshot,
+                       on_chunk=lambda rows, done, total: chunks.append((rows, done, total)))
+    expected = _expected(kodi_lines, snapshot)
+    assert result.rows == expected
+    assert [row for rows, _, _ in chunks for row in rows] == expected
+    assert len(chunks) > 1
+    assert chunks[-1][1] == chunks[-1][2] == result.end
+
+
+def test_scan_file_from_an_offset(kodi_log, kodi_lines, small_chunks):
+    snapshot = FilterSnapshot(query="e")
+    whole = scan_file(kodi_log, snapshot)
+    half = len(kodi_lines) // 2
+    offset = sum(len(line.encode("utf-8")) for line in kodi_lines[:half])
+    head = get_classifier(snapshot).run(kodi_lines[:half])
+    tail = scan_file(kodi_log, snapshot, start=offset, parent_visible=head[1])
+    assert head[0] + tail.rows == whole.rows
+    assert scan_file(kodi_log, snapshot, start=whole.end).rows == []
+
+
+def test_scan_file_leaves_a_partial_line(tmp_path):
+    path = tmp_path / "kodi.log"
+    path.write_bytes(b"2024-05-01 10:00:00.000 T:1 info <general>: a\n"
+                     b"2024-05-01 10:00:01.000 T:1 info <general>: a partial")
+    result = scan_file(str(path), FilterSnapshot(query="a"))
+    assert len(result.rows) == 1
+    assert result.end == path.read_bytes().index(b"\n") + 1
+
+
+def test_scan_file_stops(kodi_log, small_chunks):
+    assert scan_file(kodi_log, FilterSnapshot(query="e"), should_stop=lambda: True) is None
+
+
+def test_scan_file_in_the_process_pool(kodi_log, kodi_lines, small_chunks, monkeypatch):
+    monkeypatch.setattr(search, "PARALLEL_MIN_BYTES", 0)
+    snapshot = FilterSnapshot(query="timeout")
+    try:
+        if search.get_pool() is None:
+            pytest.skip("no process pool on this machine")
+        assert scan_file(kodi_log, snapshot).rows == _expected(kodi_lines, snapshot)
+    finally:
+        shutdown_pool()
+
+
+# ── Refinement of the previous result ────────────────────────────────────
+
+@pytest.mark.parametrize("previous, query", [
+    ("e", "er"),
+    ("t", "timeout"),
+    ("timeout", "timeout was"),
+    ("a", "zzz"),
+])
+def test_refine_rows_equals_a_new_scan(kodi_lines, previous, query):
+    rows, visible = get_classifier(FilterSnapshot(query=previous)).run(kodi_lines)
+    refined = search.refine_rows(rows, query, visible)
+    assert refined == get_classifier(FilterSnapshot(query=query)).run(kodi_lines)
+
+
+def test_refine_rows_stops():
+    rows = [("2024-05-01 10:00:00.000 T:1 info <general>: a\n", "info")] * 5000
+    assert search.refine_rows(rows, "a", should_stop=lambda: True) is None
+
+
+def test_incremental_search_refines_and_follows_appends(tmp_path, kodi_lines):
+    path = tmp_path / "kodi.log"
+    half = len(kodi_lines) // 2
+    path.write_text("".join(kodi_lines[:half]), encoding="utf-8")
+    inc = search.IncrementalSearch()
+
+    assert inc.run(str(path), FilterSnapshot(query="time")) == _expected(
+        kodi_lines[:half], FilterSnapshot(query="time"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(kodi_lines[half:]))
+
+    chunks = []
+    rows = inc.run(str(path), FilterSnapshot(query="timeout"),
+                   on_chunk=lambda kept, done, total: chunks.append(kept))
+    assert rows == _expected(kodi_lines, FilterSnapshot(query="timeout"))
+    assert [row for kept in chunks for row in kept] == rows
+    assert (inc.refined, inc.full_scans) == (1, 1)
+
+    # Other filters, a shorter query or the query syntax scan the file again.
+    inc.run(str(path), FilterSnapshot(query="timeout", excludes=("curl",)))
+    inc.run(str(path), FilterSnapshot(query="time"))
+    inc.run(str(path), FilterSnapshot(expr="level:error"))
+    assert (inc.refined, inc.full_scans) == (1, 4)
+
+
+def test_incremental_search_clear(kodi_log):
+    inc = search.IncrementalSearch()
+    inc.run(kodi_log, FilterSnapshot(query="e"))
+    inc.clear()
+    inc.run(kodi_log, FilterSnapshot(query="er"))
+    assert (inc.refined, inc.full_scans) == (0, 2)
+
+
+def test_incremental_search_rescans_a_replaced_file(tmp_path, kodi_lines):
+    path = tmp_path / "kodi.log"
+    path.write_text("".join(kodi_lines), encoding="utf-8")
+    inc = search.IncrementalSearch()
+    inc.run(str(path), FilterSnapshot(query="e"))
+    other = tmp_path / "kodi.new"
+    other.write_text("".join(kodi_lines[:100]), encoding="utf-8")
+    other.replace(path)
+    assert inc.run(str(path), FilterSnapshot(query="er")) == _expected(
+        kodi_lines[:100], FilterSnapshot(query="er"))
+    assert inc.refined == 0
@@ -0,0 +1,168 @@
+"""Tests of the timestamp lookups (engine/timestamps.py)."""
+import pytest
+
+import engine.timestamps as timestamps
+from engine.timestamps import (
+    bisect_time, find_stamped_row, find_time_offset, first_timestamp, last_timestamp,
+    parse_time_input, read_time_window, row_timestamp, shift_timestamp,
+)
+
+ROWS = [
+    "  continuation before the first stamp\n",
+    "2024-05-01 10:00:00.000 T:1 info <general>: a\n",
+    "  continuation\n",
+    "2024-05-01 10:00:00.000 T:1 info <general>: b\n",
+    "2024-05-01 10:00:05.500 T:1 info <general>: c\n",
+    "  continuation\n",
+    "  continuation\n",
+    "\x00\x002024-05-01 10:01:00.000 T:1 info <general>: d\n",
+    "2024-05-02 00:00:00.000 T:1 info <general>: e\n",
+    "  trailing continuation\n",
+]
+
+
+def _stamp_at(rows):
+    return lambda i: row_timestamp(rows[i])
+
+
+@pytest.mark.parametrize("text, stamp", [
+    ("2024-05-01 10:00:00.000 T:1 info", "2024-05-01 10:00:00.000"),
+    ("\x00 2024-05-01 10:00:00.000 T:1", "2024-05-01 10:00:00.000"),
+    ("2024-05-01 10:00:00 T:1 info", None),
+    ("  File \"addon.py\"", None),
+    ("", None),
+])
+def test_row_timestamp(text, stamp):
+    assert row_timestamp(text) == stamp
+
+
+@pytest.mark.parametrize("text, end, expected", [
+    ("10:30", False, "2024-05-01 10:30:00.000"),
+    ("10:30", True, "2024-05-01 10:30:59.999"),
+    ("9:05:07", False, "2024-05-01 09:05:07.000"),
+    ("10:30:15.5", True, "2024-05-01 10:30:15.599"),
+    ("10:30:15,250", False, "2024-05-01 10:30:15.250"),
+    ("2024-04-30 23:59", False, "2024-04-30 23:59:00.000"),
+    ("2024-04-30T23:59", True, "2024-04-30 23:59:59.999"),
+    (" 10:30 ", False, "2024-05-01 10:30:00.000"),
+    ("24:00", False, None),
+    ("10:60", False, None),
+    ("10:30:60", False, None),
+    ("10", False, None),
+    ("yesterday", False, None),
+    ("", False, None),
+])
+def test_parse_time_input(text, end, expected):
+    assert parse_time_input(text, "2024-05-01", end) == expected
+
+
+def test_shift_timestamp():
+    assert shift_timestamp("2024-05-01 23:59:30.250", 1) == "2024-05-02 00:00:30.250"
+    assert shift_timestamp("2024-05-01 00:00:00.000", -30) == "2024-04-30 23:30:00.000"
+
+
+@pytest.mark.parametrize("target, row", [
+    ("2000-01-01 00:00:00.000", 1),     # Before the first timestamp
+    ("2024-05-01 10:00:00.000", 1),     # First of two equal stamps
+    ("2024-05-01 10:00:00.001", 4),
+    ("2024-05-01 10:00:05.500", 4),
+    ("2024-05-01 10:00:30.000", 7),     # Stamp behind NUL padding
+    ("2024-05-02 00:00:00.000", 8),
+    ("2024-05-03 00:00:00.000", 10),    # After the last timestamp
+])
+def test_bisect_time(target, row):
+    assert bisect_time(len(ROWS), _stamp_at(ROWS), target) == row
+
+
+def test_bisect_time_matches_a_linear_search(kodi_lines):
+    stamps = [row_timestamp(line) for line in kodi_lines]
+    known = sorted({s for s in stamps if s})
+    targets = known[::97] + [known[-1], "2024-05-01 08:00:00.000", "2099-01-01 00:00:00.000"]
+    for target in targets:
+        linear = next((i for i, s in enumerate(stamps) if s and s >= target), len(stamps))
+        assert bisect_time(len(stamps), stamps.__getitem__, target) == linear
+
+
+def test_bisect_time_without_timestamps():
+    assert bisect_time(0, lambda i: None, "2024") == 0
+    rows = ["  a\n", "  b\n", "  c\n"]
+    assert bisect_time(len(rows), _stamp_at(rows), "2024") == 3
+
+
+def test_find_stamped_row():
+    count, stamp_at, text_at = len(ROWS), _stamp_at(ROWS), ROWS.__getitem__
+    assert find_stamped_row(count, stamp_at, text_at, "2024-05-01 10:00:00.000") == 1
+    assert find_stamped_row(count, stamp_at, text_at, "2024-05-01 10:00:00.000", ": b") == 3
+    assert find_stamped_row(count, stamp_at, text_at, "2024-05-01 10:00:00.000", ": c") is None
+    assert find_stamped_row(count, stamp_at, text_at, "2024-05-01 10:00:01.000") is None
+    assert find_stamped_row(count, stamp_at, text_at, "2024-05-03 00:00:00.000") is None
+
+
+# ── Time windows of the file ─────────────────────────────────────────────
+
+def _window(lines, start, end):
+    """Lines of the window [start, end] computed line by line."""
+    stamps = [row_timestamp(line) for line in lines]
+    first = next((i for i, s in enumerate(stamps) if s and s >= start), len(lines))
+    last = len(lines) if end is None else next(
+        (i for i, s in enumerate(stamps) if s and s > end), len(lines))
+    return lines[first:max(first, last)]
+
+
+@pytest.fixture(params=["bisect", "scan"])
+def scan_bytes_limit(request, monkeypatch):
+    """Runs a test with bisection over byte offsets, then with a line scan only."""
+    if request.param == "bisect":
+        monkeypatch.setattr(timestamps, "_SCAN_BYTES", 512)
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2000-01-01 00:00:00.000", "2000-01-01 00:00:01.000"),    # Before the first timestamp
+    ("2000-01-01 00:00:00.000", "2024-05-01 08:00:30.000"),
+    ("2024-05-01 08:00:10.000", "2024-05-01 08:00:40.000"),
+    ("2024-05-01 08:00:40.000", None),
+    ("2024-05-01 08:00:40.000", "2024-05-01 08:00:40.000"),
+    ("2099-01-01 00:00:00.000", None),                          # After the last one
+])
+def test_read_time_window(kodi_log, kodi_lines, scan_bytes_limit, start, end):
+    lines, first, last = read_time_window(kodi_log, start, end)
+    assert lines == _window(kodi_lines, start, end)
+    with open(kodi_log, "rb") as f:
+        f.seek(first)
+        assert f.read(last - first).decode("utf-8", "ignore") == "".join(lines)
+
+
+def test_find_time_offset_of_each_line(kodi_log, kodi_lines, scan_bytes_limit):
+    offsets = [0]
+    for line in kodi_lines:
+        offsets.append(offsets[-1] + len(line.encode("utf-8")))
+    stamps = [row_timestamp(line) for line in kodi_lines]
+    with open(kodi_log, "rb") as f:
+        for i in range(0, len(kodi_lines), 41):
+            if stamps[i] is None:
+                continue
+            first = stamps.index(stamps[i])
+            assert find_time_offset(f, stamps[i]) == offsets[first]
+            after = next((j for j in range(i, len(stamps))
+                          if stamps[j] and stamps[j] > stamps[i]), len(stamps))
+            assert find_time_offset(f, stamps[i], after=True) == offsets[after]
+
+
+def test_empty_and_partial_files(tmp_path):
+    path = tmp_path / "kodi.log"
+    path.write_bytes(b"")
+    assert read_time_window(str(path), "2024-05-01 10:00:00.000") == ([], 0, 0)
+    assert first_timestamp(str(path)) is None
+    assert last_timestamp(str(path)) is None
+
+    path.write_bytes(b"  orphan\n2024-05-01 10:00:00.000 T:1 info <general>: a\n"
+                     b"2024-05-01 10:00:01.000 T:1 info <general>: partial")
+    lines, first, last = read_time_window(str(path), "2024-05-01 09:00:00.000")
+    assert lines == ["2024-05-01 10:00:00.000 T:1 info <general>: a\n"]
+    assert (first, last) == (9, 9 + len(lines[0]))
+
+
+def test_first_and_last_timestamp(kodi_log, kodi_lines):
+    stamps = [s for s in map(row_timestamp, kodi_lines) if s]
+    assert first_timestamp(kodi_log) == stamps[0]
+    assert last_timestamp(kodi_log) == stamps[-1]
@@ -0,0 +1,104 @@
+"""Tests of the trigram search index (engine/trigram.py)."""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import engine.trigram as trigram
+from engine.classifier import FilterSnapshot
+from engine.search import scan_file
+from engine.trigram import TrigramIndex, block_trigrams
+
+NEEDLES = [b"timeout", b"plugin.video.youtube", b"ccurlfile::open", b"nonetype",
+           b"data['items']", b"texture cache", b"zzzz"]
+
+
+@pytest.fixture()
+def index(kodi_log, monkeypatch):
+    """A TrigramIndex of the synthetic log, built with small blocks in threads."""
+    monkeypatch.setattr(trigram, "_BLOCK_BYTES", 8 * 1024)
+    monkeypatch.setattr(trigram, "_RANGE_BYTES", 64 * 1024)
+    pool = ThreadPoolExecutor(2)
+    monkeypatch.setattr(trigram, "get_pool", lambda: pool)
+    index = TrigramIndex(kodi_log, 1)
+    index.update()
+    yield index
+    pool.shutdown()
+
+
+def _identity(path):
+    st = os.stat(path)
+    return st.st_dev, st.st_ino
+
+
+def test_block_trigrams():
+    assert block_trigrams(b"Kodi t:12 a_bc") == {b"kod", b"odi", b"a_b", b"_bc"}
+    assert block_trigrams(b"ab .. cd") == set()
+
+
+def test_index_covers_all_but_the_last_range(index, kodi_log):
+    size = os.path.getsize(kodi_log)
+    stats = index.stats()
+    assert 0 < index.end < size
+    assert size - index.end < 2 * trigram._RANGE_BYTES
+    assert stats["blocks"] > 10 and stats["trigrams"] > 0
+
+
+@pytest.mark.parametrize("needle", NEEDLES)
+def test_candidates_never_miss_a_match(index, kodi_log, needle):
+    with open(kodi_log, "rb") as f:
+        low = f.read().lower()
+    ranges, end = index.candidates(needle, _identity(kodi_log))
+    assert end == index.end
+    assert all(a[1] < b[0] for a, b in zip(ranges, ranges[1:]))
+    pos = low.find(needle)
+    while 0 <= pos < end:
+        assert any(first <= pos and pos + len(needle) <= last for first, last in ranges)
+        pos = low.find(needle, pos + 1)
+    if needle == b"zzzz":
+        assert ranges == []
+
+
+def test_candidates_without_narrowing(index, kodi_log):
+    identity = _identity(kodi_log)
+    assert index.candidates(b"rl e", identity) is None          # No trigram
+    assert index.candidates(b"timeout", (0, 0)) is None           # Other file
+    assert TrigramIndex(kodi_log, 1).candidates(b"timeout", identity) is None
+
+
+@pytest.mark.parametrize("query", ["timeout", "youtube", "nonetype", "zzzz"])
+def test_narrowed_scan_equals_a_full_scan(index, kodi_log, query):
+    snapshot = FilterSnapshot(query=query)
+    assert scan_file(kodi_log, snapshot, index=index) == scan_file(kodi_log, snapshot)
+
+
+def test_truncated_file_resets_the_index(tmp_path, kodi_lines, monkeypatch):
+    monkeypatch.setattr(trigram, "_RANGE_BYTES", 16 * 1024)
+    pool = ThreadPoolExecutor(1)
+    monkeypatch.setattr(trigram, "get_pool", lambda: pool)
+    path = tmp_path / "kodi.log"
+    path.write_text("".join(kodi_lines), encoding="utf-8")
+    index = TrigramIndex(str(path), 1)
+    index.update()
+    full = index.end
+    path.write_text("".join(kodi_lines[:len(kodi_lines) // 4]), encoding="utf-8")
+    index.update()
+    assert 0 < index.end < full
+    pool.shutdown()
+
+
+def test_extend_async_thresholds(kodi_log):
+    assert not TrigramIndex(kodi_log, 0).extend_async(10**9)      # Disabled
+    assert not TrigramIndex(kodi_log, 10**9).extend_async(10**6)  # File too small
+    index = TrigramIndex(kodi_log, 1)
+    index.close()
+    assert not index.extend_async(10**9)
+
+
+def test_stats_memory_is_kept_up_to_date(index):
+    postings = index._postings
+    expected = (sys.getsizeof(postings)
+                + sum(sys.getsizeof(g) + sys.getsizeof(b) for g, b in postings.items())
+                + index._starts.itemsize * len(index._starts))
+    assert index.stats()["memory_bytes"] == expected
@@ -0,0 +1,66 @@
+"""Tests of the live-tail file watchers (engine/watcher.py)."""
+import sys
+
+import pytest
+
+from engine import watcher
+from engine.watcher import PollingWatcher, create_watcher, is_network_fs
+
+MOUNTS = """\
+/dev/sda1 / ext4 rw,relatime 0 0
+proc /proc proc rw,nosuid 0 0
+//nas/kodi /mnt/kodi cifs rw,vers=3.0 0 0
+nas:/export /mnt/nfs nfs4 rw 0 0
+user@box:/home/kodi /mnt/My\\040Box fuse.sshfs rw 0 0
+/dev/sdb1 /mnt/kodi/local ext4 rw 0 0
+"""
+
+
+@pytest.fixture()
+def mounts(tmp_path):
+    path = tmp_path / "mounts"
+    path.write_text(MOUNTS)
+    return str(path)
+
+
+@pytest.mark.parametrize("path, network", [
+    ("/home/user/.kodi/temp/kodi.log", False),
+    ("/mnt/kodi/temp/kodi.log", True),
+    ("/mnt/kodi", True),
+    ("/mnt/kodi/local/kodi.log", False),      # Local disk mounted inside the share
+    ("/mnt/kodiX/kodi.log", False),
+    ("/mnt/nfs/kodi.log", True),
+    ("/mnt/My Box/kodi.log", True),            # Escaped space in the mount point
+])
+def test_is_network_fs(mounts, path, network):
+    assert is_network_fs(path, mounts) is network
+
+
+def test_unreadable_mount_table(tmp_path):
+    assert not is_network_fs("/mnt/kodi/kodi.log", str(tmp_path / "missing"))
+
+
+def test_network_logs_are_polled(tmp_path, monkeypatch):
+    log = tmp_path / "kodi.log"
+    log.write_text("")
+    monkeypatch.setattr(watcher, "is_network_fs", lambda path: True)
+    assert isinstance(create_watcher(str(log)), PollingWatcher)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_local_logs_use_inotify(tmp_path, monkeypatch):
+    log = tmp_path / "kodi.log"
+    log.write_text("")
+    monkeypatch.setattr(watcher, "is_network_fs", lambda path: False)
+    w = create_watcher(str(log))
+    try:
+        if w.kind != "inotify":
+            pytest.skip("inotify cannot watch the temporary directory")
+        assert not w.wait(0.01)
+        with open(log, "a") as f:
+            f.write("line\n")
+        assert w.wait(1)
+        w.interrupt()
+        assert w.wait(1)
+    finally:
+        w.close()